@@ -0,0 +1,58 @@
+"""
+Compares the C and pyarrow pandas engines used by submission_processor.read_submission_csv on synthetic SBLAR-shaped
+files (81 string fields per record, like the 2024 SBLAR layout), reporting parse time and the size of the frame.
+
+    python benchmarks/csv_engines.py --rows 100000 250000 500000 1000000
+"""
+
+import argparse
+import io
+import random
+import time
+
+import pandas as pd
+
+FIELDS = 81
+
+
+def synthetic_sblar(rows: int) -> bytes:
+    random.seed(rows)
+    header = ",".join(["uid"] + [f"field_{i}" for i in range(1, FIELDS)])
+    values = ["", "1", "977", "900", "NA", "2024-01-15", "00100", "free form, text", "123456789TESTBANK123"]
+    lines = [header]
+    for row in range(rows):
+        fields = [f"123456789TESTBANK123{row:025d}"] + [random.choice(values) for _ in range(1, FIELDS)]
+        lines.append(",".join(f'"{f}"' if "," in f else f for f in fields))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def parse(content: bytes, engine: str) -> tuple[pd.DataFrame, float]:
+    start = time.perf_counter()
+    if engine == "pyarrow":
+        df = pd.read_csv(io.BytesIO(content), dtype=str, engine="pyarrow", keep_default_na=False)
+    else:
+        df = pd.read_csv(io.BytesIO(content), dtype=str, na_filter=False)
+    return df, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 250000, 500000, 1000000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        content = synthetic_sblar(rows)
+        frames = {}
+        for engine in ("c", "pyarrow"):
+            df, secs = parse(content, engine)
+            frames[engine] = df
+            size = df.memory_usage(deep=True).sum() / 1024**2
+            print(
+                f"{rows:>9} rows, {len(content) / 1024**2:7.1f} MiB file, {engine:>7}: {secs:6.2f} s, frame {size:8.1f} MiB"
+            )
+        pd.testing.assert_frame_equal(frames["c"], frames["pyarrow"])
+        del frames
+
+
+if __name__ == "__main__":
+    main()
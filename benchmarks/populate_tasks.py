@@ -0,0 +1,115 @@
+"""
+Compares submission_repo.populate_missing_tasks, which sets the defaulted NOT_STARTED tasks as the committed value of
+each filing's tasks collection, with the deepcopy of the loaded filings it replaced.  Filings are loaded from an
+in-memory SQLite database, so they carry real instance state and relationships, like the ones get_period_filings
+returns.  Needs the usual DB_* / KC_* settings in the environment (or src/.env), they are not connected to.
+
+    python benchmarks/populate_tasks.py --filings 1000 10000
+"""
+
+import argparse
+import asyncio
+import time
+
+from copy import deepcopy
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from sbl_filing_api.entities.models.dao import (
+    Base,
+    ContactInfoDAO,
+    FilingDAO,
+    FilingPeriodDAO,
+    FilingTaskDAO,
+    FilingTaskProgressDAO,
+    FilingTaskState,
+    FilingType,
+    UserActionDAO,
+)
+from sbl_filing_api.entities.models.model_enums import UserActionType
+from sbl_filing_api.entities.repos import submission_repo as repo
+
+
+async def deepcopy_populate_missing_tasks(session, filings):
+    filing_tasks = await repo.get_filing_tasks(session)
+    filings_copy = deepcopy(filings)
+    for f in filings_copy:
+        tasks = [t.task.name for t in f.tasks]
+        for mt in [t for t in filing_tasks if t.name not in tasks]:
+            f.tasks.append(
+                FilingTaskProgressDAO(
+                    filing=f.id, task_name=mt.name, task=mt, state=FilingTaskState.NOT_STARTED, user=""
+                )
+            )
+    return filings_copy
+
+
+async def seed(session_maker, filings: int) -> None:
+    async with session_maker() as session:
+        now = datetime.now()
+        creator = UserActionDAO(
+            id=1, user_id="1", user_name="creator", user_email="c@local.host", action_type=UserActionType.CREATE
+        )
+        session.add(creator)
+        session.add(
+            FilingPeriodDAO(
+                code="2024",
+                description="2024",
+                start_period=now,
+                end_period=now,
+                due=now,
+                filing_type=FilingType.ANNUAL,
+            )
+        )
+        session.add_all([FilingTaskDAO(name=f"Task-{i}", task_order=i) for i in range(1, 4)])
+        for i in range(1, filings + 1):
+            filing = FilingDAO(id=i, lei=f"LEI{i:017d}", filing_period="2024", creator=creator)
+            filing.tasks = [FilingTaskProgressDAO(task_name="Task-1", state=FilingTaskState.COMPLETED, user="user")]
+            filing.contact_info = ContactInfoDAO(
+                first_name="first",
+                last_name="last",
+                hq_address_street_1="street",
+                hq_address_city="city",
+                hq_address_state="TS",
+                hq_address_zip="12345",
+                phone_number="212-345-6789",
+                email="contact@local.host",
+            )
+            session.add(filing)
+        await session.commit()
+
+
+async def time_populate(session_maker, populate) -> float:
+    async with session_maker() as session:
+        filings = await repo.query_helper(session, FilingDAO, filing_period="2024")
+        start = time.perf_counter()
+        filings = await populate(session, filings)
+        secs = time.perf_counter() - start
+        assert all(len(f.tasks) == 3 for f in filings)
+        return secs
+
+
+async def run(filings: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    await seed(session_maker, filings)
+
+    for name, populate in (("deepcopy", deepcopy_populate_missing_tasks), ("committed", repo.populate_missing_tasks)):
+        secs = await time_populate(session_maker, populate)
+        print(f"{filings:>7} filings, {name:>9}: {secs:7.3f} s, {secs / filings * 1e6:7.1f} us / filing")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filings", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+    for filings in args.filings:
+        asyncio.run(run(filings))
+
+
+if __name__ == "__main__":
+    main()
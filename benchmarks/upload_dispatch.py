@@ -0,0 +1,65 @@
+"""
+Compares the cost of handing submissions off to the validation process pool the way upload_file used to, creating a
+multiprocessing.Manager() per upload for the exec_check flag, with handing them off directly now that expiry is tracked
+by the submission state in the database.
+
+Each upload is dispatched without waiting for its (simulated) validation, as upload_file does, and the number of extra
+processes alive while those validations are in flight is reported; every Manager() is a server process of its own.
+
+    python benchmarks/upload_dispatch.py --uploads 50 --validation-secs 1
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+def validate(validation_secs: float, *args) -> None:
+    time.sleep(validation_secs)
+
+
+def dispatch_with_manager(executor: ProcessPoolExecutor, validation_secs: float) -> asyncio.Future:
+    exec_check = multiprocessing.Manager().dict()
+    exec_check["continue"] = True
+    return asyncio.get_running_loop().run_in_executor(executor, validate, validation_secs, exec_check)
+
+
+def dispatch(executor: ProcessPoolExecutor, validation_secs: float) -> asyncio.Future:
+    return asyncio.get_running_loop().run_in_executor(executor, validate, validation_secs)
+
+
+async def run(name: str, dispatcher, uploads: int, validation_secs: float) -> None:
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        # warm up the pool so its worker processes are not counted against the uploads
+        await asyncio.gather(*[dispatch(executor, 0) for _ in range(4)])
+        baseline = len(multiprocessing.active_children())
+        timings = []
+        futures = []
+        for _ in range(uploads):
+            start = time.perf_counter()
+            futures.append(dispatcher(executor, validation_secs))
+            timings.append((time.perf_counter() - start) * 1000)
+        in_flight_processes = len(multiprocessing.active_children()) - baseline
+        await asyncio.gather(*futures)
+    timings.sort()
+    print(
+        f"{name:>16}: mean {statistics.mean(timings):7.2f} ms, p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms"
+        f" per upload, extra processes with {uploads} validations in flight: {in_flight_processes}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--validation-secs", type=float, default=1)
+    args = parser.parse_args()
+    asyncio.run(run("Manager().dict()", dispatch_with_manager, args.uploads, args.validation_secs))
+    asyncio.run(run("no manager", dispatch, args.uploads, args.validation_secs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""add filing and submission version
+
+Revision ID: 3d9a6c1f4b28
+Revises: f41d7b2c8e90
+Create Date: 2024-06-03 10:12:41.502913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d9a6c1f4b28"
+down_revision: Union[str, None] = "f41d7b2c8e90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("filing", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+    with op.batch_alter_table("submission", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission", schema=None) as batch_op:
+        batch_op.drop_column("version")
+    with op.batch_alter_table("filing", schema=None) as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,48 @@
+"""create submission_progress table
+
+Revision ID: 5b1c9e7d2a64
+Revises: e2f4c81b9d35
+Create Date: 2024-05-24 14:02:51.730418
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1c9e7d2a64"
+down_revision: Union[str, None] = "e2f4c81b9d35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+phase = postgresql.ENUM(
+    "VALIDATING",
+    "GENERATING_REPORT",
+    "COMPLETED",
+    name="submissionprogressphase",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    phase.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "submission_progress",
+        sa.Column("submission", sa.Integer, nullable=False),
+        sa.Column("phase", phase, nullable=False),
+        sa.Column("rows_processed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("total_rows", sa.Integer, nullable=True),
+        sa.Column("change_timestamp", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("submission", name="submission_progress_pkey"),
+        sa.ForeignKeyConstraint(["submission"], ["submission.id"], name="submission_progress_submission_fkey"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("submission_progress")
+    phase.drop(op.get_bind(), checkfirst=False)
@@ -0,0 +1,28 @@
+"""add validation cache hit to submission
+
+Revision ID: 6d2e4b8a1f35
+Revises: 3d9a6c1f4b28
+Create Date: 2024-06-03 10:12:44.218905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6d2e4b8a1f35"
+down_revision: Union[str, None] = "3d9a6c1f4b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("submission") as batch_op:
+        batch_op.add_column(sa.Column("validation_cache_hit", sa.Boolean, nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission") as batch_op:
+        batch_op.drop_column("validation_cache_hit")
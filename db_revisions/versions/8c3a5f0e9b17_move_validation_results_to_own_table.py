@@ -0,0 +1,45 @@
+"""move validation results to their own table
+
+Revision ID: 8c3a5f0e9b17
+Revises: 5b1c9e7d2a64
+Create Date: 2024-05-28 10:17:42.904125
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3a5f0e9b17"
+down_revision: Union[str, None] = "5b1c9e7d2a64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "validation_results",
+        sa.Column("submission", sa.Integer, nullable=False),
+        sa.Column("results", sa.JSON, nullable=False),
+        sa.PrimaryKeyConstraint("submission", name="validation_results_pkey"),
+        sa.ForeignKeyConstraint(["submission"], ["submission.id"], name="validation_results_submission_fkey"),
+    )
+    op.execute(
+        "INSERT INTO validation_results (submission, results) "
+        "SELECT id, validation_results FROM submission WHERE validation_results IS NOT NULL"
+    )
+    with op.batch_alter_table("submission") as batch_op:
+        batch_op.drop_column("validation_results")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission") as batch_op:
+        batch_op.add_column(sa.Column("validation_results", sa.JSON, nullable=True))
+    op.execute(
+        "UPDATE submission SET validation_results = "
+        "(SELECT results FROM validation_results WHERE validation_results.submission = submission.id)"
+    )
+    op.drop_table("validation_results")
@@ -0,0 +1,58 @@
+"""create validation_job table
+
+Revision ID: a3d6e8f21c47
+Revises: 7356a7d7036d
+Create Date: 2024-05-20 10:14:32.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d6e8f21c47"
+down_revision: Union[str, None] = "7356a7d7036d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+state = postgresql.ENUM(
+    "QUEUED",
+    "RUNNING",
+    "COMPLETED",
+    "FAILED",
+    name="validationjobstate",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    state.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "validation_job",
+        sa.Column("id", sa.INTEGER, autoincrement=True),
+        sa.Column("submission", sa.Integer, nullable=False),
+        sa.Column("lei", sa.String, nullable=False),
+        sa.Column("filing_period", sa.String, nullable=False),
+        sa.Column("file_path", sa.String, nullable=False),
+        sa.Column("state", state, nullable=False),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("worker_id", sa.String, nullable=True),
+        sa.Column("lease_expiration", sa.DateTime(), nullable=True),
+        sa.Column("heartbeat_timestamp", sa.DateTime(), nullable=True),
+        sa.Column("created_timestamp", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name="validation_job_pkey"),
+        sa.ForeignKeyConstraint(["submission"], ["submission.id"], name="validation_job_submission_fkey"),
+        sa.UniqueConstraint("submission", name="validation_job_submission_key"),
+    )
+    op.create_index("ix_validation_job_state", "validation_job", ["state"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_validation_job_state", table_name="validation_job")
+    op.drop_table("validation_job")
+    state.drop(op.get_bind(), checkfirst=False)
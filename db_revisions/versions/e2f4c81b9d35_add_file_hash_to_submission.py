@@ -0,0 +1,30 @@
+"""add file hash to submission
+
+Revision ID: e2f4c81b9d35
+Revises: a3d6e8f21c47
+Create Date: 2024-05-22 09:41:07.552310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2f4c81b9d35"
+down_revision: Union[str, None] = "a3d6e8f21c47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("submission") as batch_op:
+        batch_op.add_column(sa.Column("file_hash", sa.String, nullable=True))
+        batch_op.create_index("ix_submission_file_hash", ["file_hash"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("submission") as batch_op:
+        batch_op.drop_index("ix_submission_file_hash")
+        batch_op.drop_column("file_hash")
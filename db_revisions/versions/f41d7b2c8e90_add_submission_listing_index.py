@@ -0,0 +1,26 @@
+"""add submission listing index
+
+Revision ID: f41d7b2c8e90
+Revises: 8c3a5f0e9b17
+Create Date: 2024-05-30 15:26:09.118734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f41d7b2c8e90"
+down_revision: Union[str, None] = "8c3a5f0e9b17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_submission_filing_submission_time", "submission", ["filing", "submission_time", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_submission_filing_submission_time", table_name="submission")
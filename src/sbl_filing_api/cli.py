@@ -0,0 +1,23 @@
+import argparse
+import asyncio
+import logging
+
+from sbl_filing_api import migrations, validation_worker
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="sbl-filing-api")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="upgrade the database schema to the latest revision")
+    commands.add_parser("worker", help="run the validation worker, see ValidationQueueConfig")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "migrate":
+        migrations.run_migrations()
+    elif args.command == "worker":
+        asyncio.run(validation_worker.main())
+
+
+if __name__ == "__main__":
+    main()
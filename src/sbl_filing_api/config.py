@@ -1,9 +1,10 @@
 from enum import StrEnum
+import importlib.util
 import os
 from urllib import parse
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import field_validator, ValidationInfo, BaseModel
+from pydantic import field_validator, Field, ValidationInfo, BaseModel
 from pydantic.networks import PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,9 +22,84 @@ class FsProtocol(StrEnum):
     S3 = "s3"
 
 
+class CsvEngine(StrEnum):
+    C = "c"
+    PYARROW = "pyarrow"
+
+
 class FsUploadConfig(BaseModel):
     protocol: str = FsProtocol.FILE.value
     root: str
+    """
+    "multipart" switches S3 transfers between multipart upload / ranged download and a single put / get of the object.
+    "part_size" is used for both, and S3 rejects multipart parts (other than the last) smaller than 5 MiB.
+    "max_concurrency" is the number of parts transferred in parallel, which also bounds the parts held in memory.
+    """
+    multipart: bool = True
+    part_size: int = Field(8 * (1024**2), ge=5 * (1024**2))
+    max_concurrency: int = Field(4, ge=1)
+    """
+    "max_pool_connections" sizes the HTTP connection pool of the shared S3 client, keep it at or above max_concurrency.
+    """
+    max_pool_connections: int = Field(10, ge=1)
+
+
+class ValidationQueueConfig(BaseModel):
+    """
+    When "enabled", uploads only enqueue a validation_job row, and validations are run by the separate worker
+    (`sbl-filing-api worker`) instead of a process pool inside the API.
+    A worker holds a job for "lease_secs" and renews the lease every "heartbeat_secs"; jobs whose lease expired
+    (e.g. the worker was restarted) are claimed again, up to "max_attempts" times before the submission is errored out.
+    "concurrency" is the number of validations each worker runs in parallel.
+    """
+
+    enabled: bool = False
+    lease_secs: int = Field(300, ge=1)
+    heartbeat_secs: int = Field(30, ge=1)
+    poll_secs: float = Field(5, gt=0)
+    max_attempts: int = Field(3, ge=1)
+    concurrency: int = Field(2, ge=1)
+
+
+class ValidationPoolConfig(BaseModel):
+    """
+    The process pool validations run in, in the API, or in the validation worker which sizes it by its own
+    "concurrency" instead of "max_workers" (the number of CPUs when unset).  Processes are started with
+    "start_method", warmed up before their first validation, and replaced after "max_tasks_per_child" validations to
+    contain memory growth, 0 keeps them for good.  With "prestart", all of them are started along with the API or
+    worker instead of by the first submissions; every API process starts its own pool, so mind max_workers times
+    server_config.workers when turning it on.  The pool counts the no-op task that starts each process, so the limit
+    is raised by one for it, and the processes later replacing recycled ones run max_tasks_per_child + 1 validations.
+    """
+
+    max_workers: int | None = Field(None, ge=1)
+    max_tasks_per_child: int = Field(50, ge=0)
+    start_method: Literal["spawn", "forkserver"] = "spawn"
+    prestart: bool = False
+
+
+class SubmissionEventsConfig(BaseModel):
+    """
+    The submission events stream sends a comment every "keepalive_secs" so proxies do not drop an idle connection,
+    and closes the stream after "timeout_secs", after which clients are expected to reconnect.
+    """
+
+    keepalive_secs: float = Field(15, gt=0)
+    timeout_secs: float = Field(300, gt=0)
+
+
+class LeiRelationCacheConfig(BaseModel):
+    """
+    Whether a user may act on an LEI is cached in each process, per user id and LEI: for "ttl_secs" when allowed and
+    "negative_ttl_secs" when forbidden, 0 disables either.  With "bypass_writes", every request other than a GET, HEAD
+    or OPTIONS is checked against the user / FI API, whatever is cached.  Once "maxsize" pairs are held, the oldest one
+    is evicted.
+    """
+
+    ttl_secs: float = Field(60, ge=0)
+    negative_ttl_secs: float = Field(10, ge=0)
+    bypass_writes: bool = False
+    maxsize: int = Field(10000, ge=1)
 
 
 class ServerConfig(BaseModel):
@@ -46,8 +122,24 @@ class Settings(BaseSettings):
     db_host: str
     db_scheme: str = "postgresql+asyncpg"
     db_logging: bool = False
+    """
+    When "db_pool_enabled" is false, a new connection is opened for every session (NullPool).  Otherwise each process
+    keeps up to db_pool_size + db_max_overflow connections open for reuse.
+    """
+    db_pool_enabled: bool = True
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
     conn: PostgresDsn | None = None
 
+    """
+    With "run_migrations_on_startup" off, migrations are left to `sbl-filing-api migrate`, run once per deploy, and
+    each API process only checks the schema is at the latest revision, refusing to start otherwise.
+    """
+    run_migrations_on_startup: bool = True
+
     fs_upload_config: FsUploadConfig
     server_config: ServerConfig = ServerConfig()
 
@@ -55,10 +147,58 @@ class Settings(BaseSettings):
     submission_file_extension: str = "csv"
     submission_file_size: int = 2 * (1024**3)
 
-    expired_submission_check_secs: int = 120
+    """
+    A validation still running "expired_submission_check_secs" after it started is cancelled and its submission set to
+    VALIDATION_EXPIRED; leave room for the largest files (up to submission_file_size) to be validated.  The time spent
+    waiting for a free validation process does not count, whether a validation started is checked every
+    "expired_submission_start_poll_secs".
+    """
+    expired_submission_check_secs: int = Field(3600, ge=1)
+    expired_submission_start_poll_secs: float = Field(5, gt=0)
+    validation_queue_config: ValidationQueueConfig = ValidationQueueConfig()
+    validation_pool_config: ValidationPoolConfig = ValidationPoolConfig()
+    submission_events_config: SubmissionEventsConfig = SubmissionEventsConfig()
+    lei_relation_cache_config: LeiRelationCacheConfig = LeiRelationCacheConfig()
 
     user_fi_api_url: str = "http://sbl-project-user_fi-1:8888/v1/institutions/"
+    """
+    Token roles a user needs, all of them, to call the admin endpoints, like the period-wide filings export.
+    """
+    admin_scopes: list[str] = ["query-groups", "manage-users"]
 
+    """
+    Filing periods and filing tasks are cached in each process for "reference_data_cache_ttl_secs"; 0 disables the cache.
+    A change made through the API clears the cache of the process that served it only, other API processes and replicas
+    keep serving what they cached for up to the TTL.
+    """
+    reference_data_cache_ttl_secs: float = Field(300, ge=0)
+    """
+    How long clients may reuse reference data responses, like the filing periods, before revalidating them with their
+    ETag.
+    """
+    reference_data_max_age_secs: int = Field(60, ge=0)
+    """
+    When "validation_cache_enabled", a submission whose file is byte-identical (same SHA-256) to an already validated
+    submission of the same LEI, under the same validator version, reuses its results and report instead of validating.
+    """
+    validation_cache_enabled: bool = True
+    """
+    When "validation_chunk_size" is above 0, submissions are read and validated that many records at a time, keeping
+    memory flat as files grow; 0 reads and validates the whole file at once.  Chunking first reads the uid column and
+    holds every uid in memory, and a file with a uid repeated across chunks is still read and validated whole, as
+    without chunking, to report its duplicates.
+    """
+    validation_chunk_size: int = Field(0, ge=0)
+    """
+    "csv_engine" is the pandas parser used for submissions; "pyarrow" is multithreaded and needs the pyarrow extra
+    installed.  Chunked validation always uses the C parser, which is the only one that can read in chunks.
+    """
+    csv_engine: CsvEngine = CsvEngine.C
+    """
+    "validation_progress_interval_secs" throttles how often row progress of a running validation is written, and is
+    the Retry-After hint given to clients polling that progress.
+    """
+    validation_progress_interval_secs: float = Field(2, ge=0)
     max_validation_errors: int = 1000000
     max_json_records: int = 10000
     max_json_group_size: int = 0
@@ -78,6 +218,13 @@ class Settings(BaseSettings):
         )
         return str(postgres_dsn)
 
+    @field_validator("csv_engine")
+    @classmethod
+    def check_csv_engine_installed(cls, csv_engine: CsvEngine) -> CsvEngine:
+        if csv_engine == CsvEngine.PYARROW and importlib.util.find_spec("pyarrow") is None:
+            raise ValueError("csv_engine pyarrow requires pyarrow, install the pyarrow extra.")
+        return csv_engine
+
     model_config = SettingsConfigDict(env_file=env_files_to_load, extra="allow", env_nested_delimiter="__")
 
 
@@ -1,3 +1,5 @@
+import os
+
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
@@ -7,12 +9,33 @@ from sqlalchemy.pool import NullPool
 from asyncio import current_task
 from sbl_filing_api.config import settings
 
-engine = create_async_engine(
-    settings.conn.unicode_string(), echo=settings.db_logging, poolclass=NullPool
-).execution_options(schema_translate_map={None: settings.db_schema})
+
+def get_pool_options() -> dict:
+    if not settings.db_pool_enabled:
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+base_engine = create_async_engine(settings.conn.unicode_string(), echo=settings.db_logging, **get_pool_options())
+engine = base_engine.execution_options(schema_translate_map={None: settings.db_schema})
 SessionLocal = async_scoped_session(async_sessionmaker(engine, expire_on_commit=False), current_task)
 
 
+def reset_pool_after_fork() -> None:
+    # a forked child (e.g. a ProcessPoolExecutor worker) must not share the parent's pooled connections, so it starts
+    # with an empty pool of its own; close=False leaves the parent's connections untouched.
+    base_engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=reset_pool_after_fork)
+
+
 async def get_session():
     session = SessionLocal()
     try:
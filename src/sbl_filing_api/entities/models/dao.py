@@ -1,8 +1,15 @@
-from sbl_filing_api.entities.models.model_enums import FilingType, FilingTaskState, SubmissionState, UserActionType
+from sbl_filing_api.entities.models.model_enums import (
+    FilingType,
+    FilingTaskState,
+    SubmissionProgressPhase,
+    SubmissionState,
+    UserActionType,
+    ValidationJobState,
+)
 from datetime import datetime
 from typing import Any, List
 from sqlalchemy import Enum as SAEnum, String
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, relationship
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.types import JSON
@@ -24,6 +31,7 @@ class UserActionDAO(Base):
 
 class SubmissionDAO(Base):
     __tablename__ = "submission"
+    __table_args__ = (Index("ix_submission_filing_submission_time", "filing", "submission_time", "id"),)
     id: Mapped[int] = mapped_column(index=True, primary_key=True, autoincrement=True)
     filing: Mapped[int] = mapped_column(ForeignKey("filing.id"))
     submitter_id: Mapped[int] = mapped_column(ForeignKey("user_action.id"))
@@ -32,15 +40,39 @@ class SubmissionDAO(Base):
     accepter: Mapped[UserActionDAO] = relationship(lazy="selectin", foreign_keys=[accepter_id])
     state: Mapped[SubmissionState] = mapped_column(SAEnum(SubmissionState))
     validation_ruleset_version: Mapped[str] = mapped_column(nullable=True)
-    validation_results: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=True)
     submission_time: Mapped[datetime] = mapped_column(server_default=func.now())
     filename: Mapped[str]
     total_records: Mapped[int] = mapped_column(nullable=True)
+    file_hash: Mapped[str] = mapped_column(nullable=True, index=True)
+    # whether validation reused the results of an identical submission, None when the validation cache was not consulted
+    validation_cache_hit: Mapped[bool] = mapped_column(nullable=True)
+    # bumped by the repo on every change, the submission endpoints derive their ETags from it
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+    # not a column, the results live in ValidationResultsDAO; loaded only on request, saved by update_submission when set
+    validation_results = None
 
     def __str__(self):
         return f"Submission ID: {self.id}, State: {self.state}, Ruleset: {self.validation_ruleset_version}, Filing Period: {self.filing}, Submission: {self.submission_time}"
 
 
+class ValidationResultsDAO(Base):
+    __tablename__ = "validation_results"
+    submission: Mapped[int] = mapped_column(ForeignKey("submission.id"), primary_key=True)
+    results: Mapped[dict[str, Any]] = mapped_column(JSON)
+
+
+class SubmissionProgressDAO(Base):
+    __tablename__ = "submission_progress"
+    submission: Mapped[int] = mapped_column(ForeignKey("submission.id"), primary_key=True)
+    phase: Mapped[SubmissionProgressPhase] = mapped_column(SAEnum(SubmissionProgressPhase))
+    rows_processed: Mapped[int] = mapped_column(default=0)
+    total_rows: Mapped[int] = mapped_column(nullable=True)
+    change_timestamp: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+    def __str__(self):
+        return f"Submission ID: {self.submission}, Phase: {self.phase}, Rows Processed: {self.rows_processed}, Total Rows: {self.total_rows}, Timestamp: {self.change_timestamp}"
+
+
 class FilingPeriodDAO(Base):
     __tablename__ = "filing_period"
     code: Mapped[str] = mapped_column(primary_key=True)
@@ -117,11 +149,32 @@ class FilingDAO(Base):
     confirmation_id: Mapped[str] = mapped_column(nullable=True)
     creator_id: Mapped[int] = mapped_column(ForeignKey("user_action.id"))
     creator: Mapped[UserActionDAO] = relationship(lazy="selectin", foreign_keys=[creator_id])
+    # bumped by the repo on every change to the filing or its tasks, contact info and signatures, the filing endpoints
+    # derive their ETags from it
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
 
     def __str__(self):
         return f"ID: {self.id}, Filing Period: {self.filing_period}, LEI: {self.lei}, Tasks: {self.tasks}, Institution Snapshot ID: {self.institution_snapshot_id}, Contact Info: {self.contact_info}"
 
 
+class ValidationJobDAO(Base):
+    __tablename__ = "validation_job"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    submission: Mapped[int] = mapped_column(ForeignKey("submission.id"), unique=True)
+    lei: Mapped[str]
+    filing_period: Mapped[str]
+    file_path: Mapped[str]
+    state: Mapped[ValidationJobState] = mapped_column(SAEnum(ValidationJobState), index=True)
+    attempts: Mapped[int] = mapped_column(default=0)
+    worker_id: Mapped[str] = mapped_column(nullable=True)
+    lease_expiration: Mapped[datetime] = mapped_column(nullable=True)
+    heartbeat_timestamp: Mapped[datetime] = mapped_column(nullable=True)
+    created_timestamp: Mapped[datetime] = mapped_column(server_default=func.now())
+
+    def __str__(self):
+        return f"Validation Job ID: {self.id}, Submission ID: {self.submission}, State: {self.state}, Attempts: {self.attempts}, Worker: {self.worker_id}, Lease Expiration: {self.lease_expiration}"
+
+
 # Commenting out for now since we're just storing the results from the data-validator as JSON.
 # If we determine building the data structure for results as tables is needed, we can add these
 # back in.
@@ -2,7 +2,13 @@ from sbl_filing_api.config import regex_configs
 from datetime import datetime
 from typing import Dict, Any, List
 from pydantic import BaseModel, ConfigDict, Field, model_validator
-from sbl_filing_api.entities.models.model_enums import FilingType, FilingTaskState, SubmissionState, UserActionType
+from sbl_filing_api.entities.models.model_enums import (
+    FilingType,
+    FilingTaskState,
+    SubmissionProgressPhase,
+    SubmissionState,
+    UserActionType,
+)
 
 
 class UserActionDTO(BaseModel):
@@ -24,10 +30,21 @@ class SubmissionDTO(BaseModel):
     submission_time: datetime | None = None
     filename: str
     total_records: int | None = None
+    validation_cache_hit: bool | None = None
     submitter: UserActionDTO
     accepter: UserActionDTO | None = None
 
 
+class SubmissionProgressDTO(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    submission: int
+    phase: SubmissionProgressPhase
+    rows_processed: int
+    total_rows: int | None = None
+    change_timestamp: datetime | None = None
+
+
 class FilingTaskDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -109,3 +126,26 @@ class StateUpdateDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     state: FilingTaskState
+
+
+class FilingStatusRequestDTO(BaseModel):
+    leis: List[str] = Field(min_length=1, max_length=1000)
+
+
+class ValidationCacheStatsDTO(BaseModel):
+    filing_period: str
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+
+
+class FilingStatusDTO(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    lei: str
+    filing_id: int | None = None
+    signed: bool = False
+    confirmation_id: str | None = None
+    latest_submission_id: int | None = None
+    latest_submission_state: SubmissionState | None = None
+    latest_submission_time: datetime | None = None
@@ -22,6 +22,12 @@ class SubmissionState(str, Enum):
     VALIDATION_WITH_WARNINGS = "VALIDATION_WITH_WARNINGS"
 
 
+class SubmissionProgressPhase(str, Enum):
+    VALIDATING = "VALIDATING"
+    GENERATING_REPORT = "GENERATING_REPORT"
+    COMPLETED = "COMPLETED"
+
+
 class FilingTaskState(str, Enum):
     NOT_STARTED = "NOT_STARTED"
     IN_PROGRESS = "IN_PROGRESS"
@@ -30,3 +36,15 @@ class FilingTaskState(str, Enum):
 
 class FilingType(str, Enum):
     ANNUAL = "ANNUAL"
+
+
+class ValidationJobState(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
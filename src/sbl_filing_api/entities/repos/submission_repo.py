@@ -1,20 +1,26 @@
+import json
 import logging
 
-from sqlalchemy import select, desc
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Any, List, TypeVar
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import exists, func, select, desc, tuple_, update
+from sqlalchemy.orm import aliased, joinedload, load_only, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from typing import Any, Iterable, List, Set, TypeVar
+from sbl_filing_api.config import settings
 from sbl_filing_api.entities.engine.engine import SessionLocal
+from sbl_filing_api.services.caching import TtlCache
 
 from regtech_api_commons.models.auth import AuthenticatedUser
 
-from copy import deepcopy
-
-from async_lru import alru_cache
-
 from sbl_filing_api.entities.models.dao import (
     SubmissionDAO,
+    SubmissionProgressDAO,
+    ValidationResultsDAO,
     FilingPeriodDAO,
     FilingDAO,
+    FilingSignatureDAO,
     FilingTaskDAO,
     FilingTaskProgressDAO,
     FilingTaskState,
@@ -22,40 +28,169 @@ from sbl_filing_api.entities.models.dao import (
     UserActionDAO,
 )
 from sbl_filing_api.entities.models.dto import FilingPeriodDTO, FilingDTO, ContactInfoDTO
-from sbl_filing_api.entities.models.model_enums import SubmissionState
+from sbl_filing_api.entities.models.model_enums import SubmissionProgressPhase, SubmissionState
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# an accepted submission was validated too, and is the one a byte-identical resubmission most often repeats
+VALIDATED_STATES = [
+    SubmissionState.VALIDATION_SUCCESSFUL,
+    SubmissionState.VALIDATION_WITH_ERRORS,
+    SubmissionState.VALIDATION_WITH_WARNINGS,
+    SubmissionState.SUBMISSION_ACCEPTED,
+]
+
+SUBMISSION_STATE_CHANNEL = "submission_state"
+
+# filing periods and filing tasks, shared by every request of the process
+reference_data_cache = TtlCache("reference_data", settings.reference_data_cache_ttl_secs)
+
 
 class NoFilingPeriodException(Exception):
     pass
 
 
-async def get_submissions(session: AsyncSession, lei: str = None, filing_period: str = None) -> List[SubmissionDAO]:
-    filing_id = None
+async def get_submissions(
+    session: AsyncSession,
+    lei: str = None,
+    filing_period: str = None,
+    limit: int = None,
+    after: tuple[datetime, int] = None,
+    fields: Iterable[str] = None,
+) -> List[SubmissionDAO]:
+    """
+    Returns submissions in (submission_time, id) order, starting after the "after" key if given, at most "limit" of them.
+    If "fields" is given, only those SubmissionDTO fields are loaded, everything else is left out of the query.
+    """
+    stmt = select(SubmissionDAO).order_by(SubmissionDAO.submission_time, SubmissionDAO.id)
     if lei and filing_period:
         filing = await get_filing(session, lei=lei, filing_period=filing_period)
-        filing_id = filing.id
-    return await query_helper(session, SubmissionDAO, filing=filing_id)
-
-
-async def get_latest_submission(session: AsyncSession, lei: str, filing_period: str) -> SubmissionDAO | None:
-    filing = await get_filing(session, lei=lei, filing_period=filing_period)
-    stmt = select(SubmissionDAO).filter_by(filing=filing.id).order_by(desc(SubmissionDAO.submission_time)).limit(1)
-    return await session.scalar(stmt)
+        stmt = stmt.filter_by(filing=filing.id)
+    if after:
+        stmt = stmt.where(tuple_(SubmissionDAO.submission_time, SubmissionDAO.id) > after)
+    if limit:
+        stmt = stmt.limit(limit)
+    if fields is not None:
+        stmt = stmt.options(*_submission_load_options(set(fields)))
+    submissions = (await session.scalars(stmt)).all()
+    if fields is not None and "validation_results" in fields and submissions:
+        results_stmt = select(ValidationResultsDAO).where(
+            ValidationResultsDAO.submission.in_([s.id for s in submissions])
+        )
+        results = {r.submission: r.results for r in await session.scalars(results_stmt)}
+        for submission in submissions:
+            submission.validation_results = results.get(submission.id)
+    return submissions
+
+
+def _submission_load_options(fields: Set[str]) -> list:
+    # submission_time is needed for the next page's cursor
+    columns = {"id", "filing", "submission_time"} | (fields & {c.key for c in SubmissionDAO.__table__.columns})
+    options = []
+    for relationship, fk in [("submitter", "submitter_id"), ("accepter", "accepter_id")]:
+        if relationship in fields:
+            columns.add(fk)
+        else:
+            options.append(noload(getattr(SubmissionDAO, relationship)))
+    return [load_only(*[getattr(SubmissionDAO, c) for c in columns])] + options
+
+
+async def get_latest_submission(
+    session: AsyncSession, lei: str, filing_period: str, load_results: bool = False
+) -> SubmissionDAO | None:
+    # a single round trip: no filing lookup first, and the submitter / accepter joined in instead of selectin loaded
+    stmt = (
+        select(SubmissionDAO)
+        .join(FilingDAO, SubmissionDAO.filing == FilingDAO.id)
+        .where(FilingDAO.lei == lei, FilingDAO.filing_period == filing_period)
+        .options(joinedload(SubmissionDAO.submitter), joinedload(SubmissionDAO.accepter))
+        .order_by(desc(SubmissionDAO.submission_time), desc(SubmissionDAO.id))
+        .limit(1)
+    )
+    result = await session.scalar(stmt)
+    if result and load_results:
+        result.validation_results = await get_validation_results(session, result.id)
+    return result
 
 
 async def get_filing_periods(session: AsyncSession) -> List[FilingPeriodDAO]:
-    return await query_helper(session, FilingPeriodDAO)
+    return await reference_data_cache.get_or_load(
+        FilingPeriodDAO, lambda: load_reference_data(session, FilingPeriodDAO)
+    )
 
 
-async def get_submission(session: AsyncSession, submission_id: int) -> SubmissionDAO:
+async def get_submission(session: AsyncSession, submission_id: int, load_results: bool = False) -> SubmissionDAO:
     result = await query_helper(session, SubmissionDAO, id=submission_id)
+    if result and load_results:
+        result[0].validation_results = await get_validation_results(session, submission_id)
     return result[0] if result else None
 
 
+async def get_validation_results(session: AsyncSession, submission_id: int) -> dict[str, Any] | None:
+    return await session.scalar(select(ValidationResultsDAO.results).filter_by(submission=submission_id))
+
+
+async def get_submission_version(session: AsyncSession, submission_id: int) -> int | None:
+    return await session.scalar(select(SubmissionDAO.version).filter_by(id=submission_id))
+
+
+async def get_submission_state(session: AsyncSession, submission_id: int) -> SubmissionState | None:
+    return await session.scalar(select(SubmissionDAO.state).filter_by(id=submission_id))
+
+
+async def get_validated_submission_by_hash(
+    session: AsyncSession, lei: str, file_hash: str, validation_ruleset_version: str, exclude_id: int = None
+) -> tuple[SubmissionDAO, str] | None:
+    """
+    Returns the most recent submission, and its filing period, of the LEI with the given file hash that completed
+    validation under the given validator version, accepted or not.
+    """
+    stmt = (
+        select(SubmissionDAO, FilingDAO.filing_period)
+        .join(FilingDAO, SubmissionDAO.filing == FilingDAO.id)
+        .where(
+            FilingDAO.lei == lei,
+            SubmissionDAO.file_hash == file_hash,
+            SubmissionDAO.validation_ruleset_version == validation_ruleset_version,
+            SubmissionDAO.state.in_(VALIDATED_STATES),
+        )
+        .order_by(desc(SubmissionDAO.submission_time))
+        .limit(1)
+    )
+    if exclude_id is not None:
+        stmt = stmt.where(SubmissionDAO.id != exclude_id)
+    result = (await session.execute(stmt)).first()
+    return tuple(result) if result else None
+
+
+async def get_validation_cache_stats(session: AsyncSession, filing_period: str) -> dict[str, Any]:
+    """
+    Counts the period's submissions that reused the validation results of an identical submission (hits) and those that
+    looked one up and had to be validated (misses), as recorded on each submission by the validation processes.
+    """
+    stmt = (
+        select(SubmissionDAO.validation_cache_hit, func.count())
+        .join(FilingDAO, SubmissionDAO.filing == FilingDAO.id)
+        .where(FilingDAO.filing_period == filing_period, SubmissionDAO.validation_cache_hit.is_not(None))
+        .group_by(SubmissionDAO.validation_cache_hit)
+    )
+    counts = dict((await session.execute(stmt)).tuples().all())
+    hits, misses = counts.get(True, 0), counts.get(False, 0)
+    return {
+        "filing_period": filing_period,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
+
+
+async def filing_exists(session: AsyncSession, lei: str, filing_period: str) -> bool:
+    stmt = select(exists().where(FilingDAO.lei == lei, FilingDAO.filing_period == filing_period))
+    return await session.scalar(stmt)
+
+
 async def get_filing(session: AsyncSession, lei: str, filing_period: str) -> FilingDAO:
     result = await query_helper(session, FilingDAO, lei=lei, filing_period=filing_period)
     if result:
@@ -63,6 +198,88 @@ async def get_filing(session: AsyncSession, lei: str, filing_period: str) -> Fil
     return result[0] if result else None
 
 
+def period_filings_query(
+    filing_period: str,
+    leis: List[str] | None = None,
+    signed: bool | None = None,
+    latest_submission_states: List[SubmissionState] | None = None,
+):
+    """
+    One flat row per filing of the period, with whether it is signed and its latest submission, optionally limited to
+    the given LEIs and filtered on both.
+    """
+    submission = aliased(SubmissionDAO)
+    latest_submission_id = (
+        select(submission.id)
+        .where(submission.filing == FilingDAO.id)
+        .order_by(desc(submission.submission_time), desc(submission.id))
+        .limit(1)
+        .correlate(FilingDAO)
+        .scalar_subquery()
+    )
+    is_signed = exists().where(FilingSignatureDAO.filing == FilingDAO.id)
+    stmt = (
+        select(
+            FilingDAO.id,
+            FilingDAO.lei,
+            FilingDAO.filing_period,
+            FilingDAO.institution_snapshot_id,
+            FilingDAO.confirmation_id,
+            is_signed.label("signed"),
+            SubmissionDAO.id.label("latest_submission_id"),
+            SubmissionDAO.state.label("latest_submission_state"),
+            SubmissionDAO.submission_time.label("latest_submission_time"),
+        )
+        .outerjoin(SubmissionDAO, SubmissionDAO.id == latest_submission_id)
+        .where(FilingDAO.filing_period == filing_period)
+        .order_by(FilingDAO.id)
+    )
+    if leis:
+        stmt = stmt.where(FilingDAO.lei.in_(leis))
+    if signed is not None:
+        stmt = stmt.where(is_signed if signed else ~is_signed)
+    if latest_submission_states:
+        stmt = stmt.where(SubmissionDAO.state.in_(latest_submission_states))
+    return stmt
+
+
+async def stream_period_filings(
+    session: AsyncSession,
+    filing_period: str,
+    signed: bool | None = None,
+    latest_submission_states: List[SubmissionState] | None = None,
+    yield_per: int = 1000,
+) -> AsyncResult:
+    """
+    The period_filings_query rows, read through a server-side cursor "yield_per" at a time instead of loaded at once.
+    """
+    stmt = period_filings_query(filing_period, signed=signed, latest_submission_states=latest_submission_states)
+    return await session.stream(stmt.execution_options(yield_per=yield_per))
+
+
+async def get_filings_status(session: AsyncSession, filing_period: str, leis: List[str]) -> List[dict[str, Any]]:
+    """
+    The period_filings_query row of each given LEI, in the order given, all from a single query.  An LEI without a
+    filing in the period gets a row of its own with no filing id.
+    """
+    rows = (await session.execute(period_filings_query(filing_period, leis=leis))).mappings()
+    by_lei = {row["lei"]: row for row in rows}
+    return [
+        {**by_lei[lei], "filing_id": by_lei[lei]["id"]} if lei in by_lei else {"lei": lei}
+        for lei in dict.fromkeys(leis)
+    ]
+
+
+async def get_filing_version(session: AsyncSession, lei: str, filing_period: str) -> tuple[int, int] | None:
+    """
+    The filing's id and version, without loading the filing itself.
+    """
+    result = await session.execute(
+        select(FilingDAO.id, FilingDAO.version).filter_by(lei=lei, filing_period=filing_period)
+    )
+    return result.tuples().first()
+
+
 async def get_period_filings(session: AsyncSession, filing_period: str) -> List[FilingDAO]:
     filings = await query_helper(session, FilingDAO, filing_period=filing_period)
     if filings:
@@ -71,13 +288,20 @@ async def get_period_filings(session: AsyncSession, filing_period: str) -> List[
 
 
 async def get_filing_period(session: AsyncSession, filing_period: str) -> FilingPeriodDAO:
-    result = await query_helper(session, FilingPeriodDAO, code=filing_period)
-    return result[0] if result else None
+    return next((p for p in await get_filing_periods(session) if p.code == filing_period), None)
 
 
-@alru_cache(maxsize=128)
 async def get_filing_tasks(session: AsyncSession) -> List[FilingTaskDAO]:
-    return await query_helper(session, FilingTaskDAO)
+    return await reference_data_cache.get_or_load(FilingTaskDAO, lambda: load_reference_data(session, FilingTaskDAO))
+
+
+async def load_reference_data(session: AsyncSession, table_obj: T) -> List[T]:
+    """
+    Loads every row of the table as transient instances that belong to no session, so they can be cached and shared
+    between requests; the session's own instances would be expired, refreshed or flushed along with it.
+    """
+    columns = [c.key for c in table_obj.__table__.columns]
+    return [table_obj(**{c: getattr(r, c) for c in columns}) for r in await query_helper(session, table_obj)]
 
 
 async def get_user_action(session: AsyncSession, id: int) -> UserActionDAO:
@@ -100,28 +324,71 @@ async def add_submission(session: AsyncSession, filing_id: int, filename: str, s
 
 
 async def update_submission(session: AsyncSession, submission: SubmissionDAO) -> SubmissionDAO:
-    return await upsert_helper(session, submission, SubmissionDAO)
+    await notify_submission_state(session, submission.id, submission.state)
+    # results are only written when set, a submission loaded without them leaves the stored results alone
+    validation_results = submission.validation_results
+    await bump_version(session, SubmissionDAO, submission.id)
+    if validation_results is not None:
+        await session.merge(ValidationResultsDAO(submission=submission.id, results=validation_results))
+    updated = await upsert_helper(session, submission, SubmissionDAO)
+    if validation_results is not None:
+        updated.validation_results = validation_results
+    return updated
+
+
+async def notify_submission_state(session: AsyncSession, submission_id: int, state: SubmissionState) -> None:
+    """
+    Publishes the submission's new state on the SUBMISSION_STATE_CHANNEL.  NOTIFY is transactional, so listeners only
+    hear about the change once the caller commits it, and never about one that was rolled back.
+    Only Postgres supports LISTEN/NOTIFY, on any other database this is a no-op.
+    """
+    if submission_id is None or session.get_bind().dialect.name != "postgresql":
+        return
+    payload = json.dumps({"id": submission_id, "state": state})
+    await session.execute(select(func.pg_notify(SUBMISSION_STATE_CHANNEL, payload)))
+
+
+async def get_submission_progress(session: AsyncSession, submission_id: int) -> SubmissionProgressDAO | None:
+    result = await query_helper(session, SubmissionProgressDAO, submission=submission_id)
+    return result[0] if result else None
+
+
+async def update_submission_progress(
+    session: AsyncSession,
+    submission_id: int,
+    phase: SubmissionProgressPhase,
+    rows_processed: int,
+    total_rows: int = None,
+) -> SubmissionProgressDAO:
+    progress = SubmissionProgressDAO(
+        submission=submission_id, phase=phase, rows_processed=rows_processed, total_rows=total_rows
+    )
+    return await upsert_helper(session, progress, SubmissionProgressDAO)
 
 
 async def expire_submission(submission_id: int):
     async with SessionLocal() as session:
         submission = await get_submission(session, submission_id)
         submission.state = SubmissionState.VALIDATION_EXPIRED
-        await upsert_helper(session, submission, SubmissionDAO)
+        await update_submission(session, submission)
 
 
 async def error_out_submission(submission_id: int):
     async with SessionLocal() as session:
         submission = await get_submission(session, submission_id)
         submission.state = SubmissionState.VALIDATION_ERROR
-        await upsert_helper(session, submission, SubmissionDAO)
+        await update_submission(session, submission)
 
 
 async def upsert_filing_period(session: AsyncSession, filing_period: FilingPeriodDTO) -> FilingPeriodDAO:
-    return await upsert_helper(session, filing_period, FilingPeriodDAO)
+    result = await upsert_helper(session, filing_period, FilingPeriodDAO)
+    # only this process' cache, the others catch up once their cached periods reach reference_data_cache_ttl_secs
+    reference_data_cache.invalidate(FilingPeriodDAO, FilingPeriodDTO)
+    return result
 
 
 async def upsert_filing(session: AsyncSession, filing: FilingDTO) -> FilingDAO:
+    await bump_version(session, FilingDAO, filing.id)
     return await upsert_helper(session, filing, FilingDAO)
 
 
@@ -143,6 +410,7 @@ async def update_task_state(
         task.user = user.username
     else:
         task = FilingTaskProgressDAO(filing=filing.id, state=state, task_name=task_name, user=user.username)
+    await bump_version(session, FilingDAO, filing.id)
     await upsert_helper(session, task, FilingTaskProgressDAO)
 
 
@@ -150,8 +418,12 @@ async def update_contact_info(
     session: AsyncSession, lei: str, filing_period: str, new_contact_info: ContactInfoDTO
 ) -> FilingDAO:
     filing = await get_filing(session, lei=lei, filing_period=filing_period)
-    filing.contact_info = ContactInfoDAO(**new_contact_info.__dict__.copy(), filing=filing.id)
-    return await upsert_helper(session, filing, FilingDAO)
+    # the change goes on a copy of the filing's attributes: assigned to the session's filing itself, the new contact
+    # info would be inserted next to the current one instead of being merged into it
+    filing_update = SimpleNamespace(**filing.__dict__)
+    filing_update.contact_info = ContactInfoDAO(**new_contact_info.__dict__.copy(), filing=filing.id)
+    await bump_version(session, FilingDAO, filing.id)
+    return await upsert_helper(session, filing_update, FilingDAO)
 
 
 async def add_user_action(
@@ -170,12 +442,28 @@ async def add_user_action(
     return await upsert_helper(session, new_user_Action, UserActionDAO)
 
 
+async def bump_version(session: AsyncSession, table_obj: T, id: int | None) -> None:
+    """
+    Increments the version of the filing or submission being changed, in the caller's transaction.  The increment is
+    done in the database, so concurrent changes each get their own version whatever copy of the row they were made on.
+    """
+    if id is not None:
+        await session.execute(
+            update(table_obj)
+            .where(table_obj.id == id)
+            .values(version=table_obj.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
 async def upsert_helper(session: AsyncSession, original_data: Any, table_obj: T) -> T:
     copy_data = original_data.__dict__.copy()
     # this is only for if a DAO is passed in
     # Should be DTOs, but hey, it's python
     if "_sa_instance_state" in copy_data:
         del copy_data["_sa_instance_state"]
+    # versions only move through bump_version, never back to the one of a stale copy
+    copy_data.pop("version", None)
     new_dao = table_obj(**copy_data)
     new_dao = await session.merge(new_dao)
     await session.commit()
@@ -193,20 +481,20 @@ async def query_helper(session: AsyncSession, table_obj: T, **filter_args) -> Li
 
 
 async def populate_missing_tasks(session: AsyncSession, filings: List[FilingDAO]):
+    """
+    Fills in a NOT_STARTED task for every filing task a filing has no progress for yet.  The defaults are set as the
+    committed value of the tasks collection, so they are neither tracked as changes nor cascaded into the session,
+    which is what used to require deep copying every filing.
+    """
     filing_tasks = await get_filing_tasks(session)
-    filings_copy = deepcopy(filings)
-    for f in filings_copy:
-        tasks = [t.task.name for t in f.tasks]
-        missing_tasks = [t for t in filing_tasks if t.name not in tasks]
-        for mt in missing_tasks:
-            f.tasks.append(
-                FilingTaskProgressDAO(
-                    filing=f.id,
-                    task_name=mt.name,
-                    task=mt,
-                    state=FilingTaskState.NOT_STARTED,
-                    user="",
-                )
-            )
-
-    return filings_copy
+    for f in filings:
+        tasks = {t.task_name for t in f.tasks}
+        missing_tasks = [
+            FilingTaskProgressDAO(filing=f.id, task_name=t.name, task=t, state=FilingTaskState.NOT_STARTED, user="")
+            for t in filing_tasks
+            if t.name not in tasks
+        ]
+        if missing_tasks:
+            set_committed_value(f, "tasks", list(f.tasks) + missing_tasks)
+
+    return filings
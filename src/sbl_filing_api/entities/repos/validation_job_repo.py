@@ -0,0 +1,159 @@
+import logging
+
+from datetime import timedelta
+from sqlalchemy import DateTime, Interval, and_, func, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.models.dao import SubmissionDAO, ValidationJobDAO
+from sbl_filing_api.entities.models.model_enums import SubmissionState, ValidationJobState
+from sbl_filing_api.entities.repos.submission_repo import notify_submission_state
+
+logger = logging.getLogger(__name__)
+
+
+class lease_expiration_from_now(FunctionElement):
+    """
+    The database's current time plus lease_secs.  Leases are set and compared against the database's clock only, so
+    workers whose clocks disagree never judge a live lease expired.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+    def __init__(self, lease_secs: float):
+        self.lease_secs = lease_secs
+        super().__init__()
+
+
+@compiles(lease_expiration_from_now)
+def _compile_lease_expiration(element: lease_expiration_from_now, compiler, **kw) -> str:
+    return compiler.process(func.now() + literal(timedelta(seconds=element.lease_secs), Interval()), **kw)
+
+
+@compiles(lease_expiration_from_now, "sqlite")
+def _compile_lease_expiration_sqlite(element: lease_expiration_from_now, compiler, **kw) -> str:
+    return compiler.process(func.datetime("now", f"+{element.lease_secs} seconds"), **kw)
+
+
+async def enqueue_validation_job(
+    session: AsyncSession, submission_id: int, lei: str, filing_period: str, file_path: str
+) -> ValidationJobDAO:
+    job = ValidationJobDAO(
+        submission=submission_id,
+        lei=lei,
+        filing_period=filing_period,
+        file_path=file_path,
+        state=ValidationJobState.QUEUED,
+        attempts=0,
+    )
+    session.add(job)
+    await session.commit()
+    await session.refresh(job)
+    return job
+
+
+async def claim_validation_job(session: AsyncSession, worker_id: str) -> ValidationJobDAO | None:
+    """
+    Claims the oldest job that is either queued, or running with an expired lease (its worker died or was restarted).
+    The row is locked with FOR UPDATE SKIP LOCKED, so concurrent workers never claim the same job and never wait on
+    each other.  Jobs that already used up max_attempts are failed, and their submission errored out, instead.
+    """
+    config = settings.validation_queue_config
+    while True:
+        stmt = (
+            select(ValidationJobDAO)
+            .where(
+                or_(
+                    ValidationJobDAO.state == ValidationJobState.QUEUED,
+                    and_(
+                        ValidationJobDAO.state == ValidationJobState.RUNNING,
+                        ValidationJobDAO.lease_expiration < func.now(),
+                    ),
+                )
+            )
+            .order_by(ValidationJobDAO.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = await session.scalar(stmt)
+        if not job:
+            await session.commit()
+            return None
+
+        if job.attempts >= config.max_attempts:
+            logger.warning(f"Validation job {job.id} exceeded {config.max_attempts} attempts, failing submission.")
+            job.state = ValidationJobState.FAILED
+            job.worker_id = None
+            job.lease_expiration = None
+            await session.execute(
+                update(SubmissionDAO)
+                .where(SubmissionDAO.id == job.submission)
+                .values(state=SubmissionState.VALIDATION_ERROR, version=SubmissionDAO.version + 1)
+            )
+            await notify_submission_state(session, job.submission, SubmissionState.VALIDATION_ERROR)
+            await session.commit()
+            continue
+
+        job.state = ValidationJobState.RUNNING
+        job.attempts += 1
+        job.worker_id = worker_id
+        job.heartbeat_timestamp = func.now()
+        job.lease_expiration = lease_expiration_from_now(config.lease_secs)
+        await session.commit()
+        await session.refresh(job)
+        return job
+
+
+async def heartbeat_validation_job(session: AsyncSession, job_id: int, worker_id: str) -> bool:
+    """
+    Extends the lease of a running job.  Returns False if the job is no longer held by this worker, i.e. the lease
+    expired and another worker claimed it.
+    """
+    result = await session.execute(
+        update(ValidationJobDAO)
+        .where(
+            ValidationJobDAO.id == job_id,
+            ValidationJobDAO.worker_id == worker_id,
+            ValidationJobDAO.state == ValidationJobState.RUNNING,
+        )
+        .values(
+            heartbeat_timestamp=func.now(),
+            lease_expiration=lease_expiration_from_now(settings.validation_queue_config.lease_secs),
+        )
+    )
+    await session.commit()
+    return result.rowcount == 1
+
+
+async def holds_validation_job(session: AsyncSession, job_id: int, worker_id: str) -> bool:
+    """
+    Whether the job is still running under this worker, i.e. its lease was not lost to another worker.
+    """
+    held = await session.scalar(
+        select(ValidationJobDAO.id).where(
+            ValidationJobDAO.id == job_id,
+            ValidationJobDAO.worker_id == worker_id,
+            ValidationJobDAO.state == ValidationJobState.RUNNING,
+        )
+    )
+    return held is not None
+
+
+async def release_validation_job(session: AsyncSession, job_id: int, worker_id: str, state: ValidationJobState) -> bool:
+    """
+    Moves a job held by this worker to its final state, or back to QUEUED so it is retried.
+    """
+    result = await session.execute(
+        update(ValidationJobDAO)
+        .where(ValidationJobDAO.id == job_id, ValidationJobDAO.worker_id == worker_id)
+        .values(
+            state=state,
+            worker_id=None,
+            lease_expiration=None,
+        )
+    )
+    await session.commit()
+    return result.rowcount == 1
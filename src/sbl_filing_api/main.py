@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import os
 
 from contextlib import asynccontextmanager
 
@@ -20,12 +20,13 @@ from regtech_api_commons.api.exception_handlers import (
     general_exception_handler,
 )
 
-from sbl_filing_api.routers.filing import router as filing_router
+from sbl_filing_api.routers.filing import executor as validation_executor, router as filing_router
+from sbl_filing_api.services.submission_events import broker as submission_events_broker
+from sbl_filing_api.services.validation_pool import prestart_validation_executor, validation_pool_size
 
-from alembic.config import Config
-from alembic import command
-
-from sbl_filing_api.config import kc_settings
+from sbl_filing_api.config import kc_settings, settings
+from sbl_filing_api.entities.engine.engine import engine
+from sbl_filing_api.migrations import run_migrations, verify_schema_current
 
 log = logging.getLogger()
 
@@ -33,19 +34,18 @@ log = logging.getLogger()
 @asynccontextmanager
 async def lifespan(app_: FastAPI):
     log.info("Starting up filing-api server.")
-    log.info("Running alembic migrations...")
-    run_migrations()
-    log.info("Migrations complete, API is ready to start serving requests.")
+    if settings.run_migrations_on_startup:
+        log.info("Running alembic migrations...")
+        # off the event loop, alembic's upgrade is synchronous
+        await asyncio.to_thread(run_migrations)
+        log.info("Migrations complete, API is ready to start serving requests.")
+    else:
+        await verify_schema_current(engine)
+    if settings.validation_pool_config.prestart and not settings.validation_queue_config.enabled:
+        prestart_validation_executor(validation_executor, validation_pool_size())
     yield
     log.info("Shutting down filing-api server...")
-
-
-def run_migrations():
-    file_dir = os.path.dirname(os.path.realpath(__file__))
-    alembic_cfg = Config(f"{file_dir}/../../alembic.ini")
-    alembic_cfg.set_main_option("script_location", f"{file_dir}/../../db_revisions")
-    alembic_cfg.set_main_option("prepend_sys_path", f"{file_dir}/../../")
-    command.upgrade(alembic_cfg, "head")
+    await submission_events_broker.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -0,0 +1,51 @@
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from sbl_filing_api.config import settings
+
+log = logging.getLogger(__name__)
+
+
+def alembic_config() -> Config:
+    file_dir = os.path.dirname(os.path.realpath(__file__))
+    alembic_cfg = Config(f"{file_dir}/../../alembic.ini")
+    alembic_cfg.set_main_option("script_location", f"{file_dir}/../../db_revisions")
+    alembic_cfg.set_main_option("prepend_sys_path", f"{file_dir}/../../")
+    return alembic_cfg
+
+
+def run_migrations() -> None:
+    command.upgrade(alembic_config(), "head")
+
+
+def get_head_revisions() -> set[str]:
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+async def get_schema_revisions(engine: AsyncEngine) -> set[str]:
+    def current_heads(connection) -> tuple[str, ...]:
+        context = MigrationContext.configure(connection, opts={"version_table_schema": settings.db_schema})
+        return context.get_current_heads()
+
+    async with engine.connect() as conn:
+        return set(await conn.run_sync(current_heads))
+
+
+async def verify_schema_current(engine: AsyncEngine) -> None:
+    """
+    Refuses to serve on a database whose schema is not at the latest revision, which only takes reading the
+    alembic_version table, instead of running the migrations.
+    """
+    schema_revisions, head_revisions = await get_schema_revisions(engine), get_head_revisions()
+    if schema_revisions != head_revisions:
+        raise RuntimeError(
+            f"Database schema is at revision {', '.join(sorted(schema_revisions)) or 'none'}, expected "
+            f"{', '.join(sorted(head_revisions))}; run `sbl-filing-api migrate` first."
+        )
+    log.info(f"Database schema is at the latest revision {', '.join(sorted(head_revisions))}.")
@@ -0,0 +1,58 @@
+import asyncio
+
+from fastapi import Request
+from regtech_api_commons.api import dependencies
+from regtech_api_commons.api.exceptions import RegTechHttpException
+from starlette.concurrency import run_in_threadpool
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.services.caching import TtlCache
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+lei_relation_cache = TtlCache(
+    "lei_relation",
+    settings.lei_relation_cache_config.ttl_secs,
+    maxsize=settings.lei_relation_cache_config.maxsize,
+)
+
+
+async def verify_user_lei_relation(request: Request, lei: str = None) -> None:
+    """
+    regtech_api_commons' verify_user_lei_relation, with its decision cached per user and LEI, see
+    LeiRelationCacheConfig.  Only a 403 is cached as a denial, any other error is raised and checked again next time.
+    """
+    config = settings.lei_relation_cache_config
+    if not lei or not request.user.is_authenticated or (config.bypass_writes and request.method not in SAFE_METHODS):
+        await check_user_lei_relation(request, lei)
+        return
+    denial = await lei_relation_cache.get_or_load(
+        (request.user.id, lei),
+        lambda: load_user_lei_relation(request, lei),
+        ttl_of=lambda denied: config.negative_ttl_secs if denied else config.ttl_secs,
+    )
+    if denial:
+        # a new exception each time, re-raising a cached one would keep growing its traceback
+        raise RegTechHttpException(status_code=403, name=denial[0], detail=denial[1])
+
+
+async def load_user_lei_relation(request: Request, lei: str) -> tuple[str, str] | None:
+    """
+    None if the user may act on the LEI, otherwise the name and detail of the 403 it was denied with.
+    """
+    try:
+        await check_user_lei_relation(request, lei)
+    except RegTechHttpException as e:
+        if e.status_code != 403:
+            raise
+        return e.name, e.detail
+    return None
+
+
+async def check_user_lei_relation(request: Request, lei: str | None) -> None:
+    # looked up at call time so the check can be patched, and run in a thread when it is a blocking one
+    check = dependencies.verify_user_lei_relation
+    if asyncio.iscoroutinefunction(check):
+        await check(request, lei)
+    else:
+        await run_in_threadpool(check, request, lei)
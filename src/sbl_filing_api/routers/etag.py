@@ -0,0 +1,47 @@
+import hashlib
+
+from fastapi import Request, Response
+
+
+def make_etag(content: bytes) -> str:
+    """
+    Weak ETag of a response body, the same in every process serving the same data.
+    """
+    return f'W/"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def version_etag(*key: object) -> str:
+    """
+    Weak ETag of a versioned resource, from its kind, identity and row version.
+    """
+    return f'W/"{"-".join(str(k) for k in key)}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header lists the given ETag, compared weakly as RFC 9110 requires for
+    conditional GETs.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def conditional_response(
+    request: Request, content: bytes, etag: str, cache_control: str, media_type: str = "application/json"
+) -> Response:
+    """
+    304 Not Modified if the client already holds the given ETag, otherwise the content itself; both carry the ETag and
+    Cache-Control headers.
+    """
+    if etag_matches(request, etag):
+        return not_modified_response(etag, cache_control)
+    return Response(content=content, media_type=media_type, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
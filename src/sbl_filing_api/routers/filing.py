@@ -1,36 +1,56 @@
 import asyncio
+import base64
+import json
 import logging
+import math
 
-from concurrent.futures import ProcessPoolExecutor
-from fastapi import Depends, Request, UploadFile, status
-from fastapi.responses import Response, StreamingResponse
-from multiprocessing import Manager
+from datetime import datetime
+from fastapi import Depends, Query, Request, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from regtech_api_commons.api.router_wrapper import Router
 from regtech_api_commons.api.exceptions import RegTechHttpException
-from sbl_filing_api.entities.models.model_enums import UserActionType
-from sbl_filing_api.services import submission_processor
-from sbl_filing_api.services.multithread_handler import handle_submission
-from typing import Annotated, List
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.models.model_enums import ExportFormat, SubmissionProgressPhase, UserActionType
+from sbl_filing_api.services import filing_export, submission_events, submission_storage
+from sbl_filing_api.services.multithread_handler import check_future, handle_submission
+from sbl_filing_api.services.validation_pool import create_validation_executor
+from typing import Annotated, Any, Dict, List, Set
 
 from sbl_filing_api.entities.engine.engine import get_session
 from sbl_filing_api.entities.models.dto import (
     FilingPeriodDTO,
+    FilingStatusDTO,
+    FilingStatusRequestDTO,
     SubmissionDTO,
     FilingDTO,
     SnapshotUpdateDTO,
     StateUpdateDTO,
     ContactInfoDTO,
+    SubmissionProgressDTO,
     SubmissionState,
+    UserActionDTO,
+    ValidationCacheStatsDTO,
 )
+from sbl_filing_api.entities.models.dao import SubmissionDAO, UserActionDAO
 
 from sbl_filing_api.entities.repos import submission_repo as repo
+from sbl_filing_api.entities.repos import validation_job_repo as job_repo
+from sbl_filing_api.routers.etag import (
+    conditional_response,
+    etag_matches,
+    make_etag,
+    not_modified_response,
+    version_etag,
+)
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from starlette.authentication import requires
+from starlette.concurrency import run_in_threadpool
 
-from regtech_api_commons.api.dependencies import verify_user_lei_relation
+from sbl_filing_api.routers.dependencies import verify_user_lei_relation
 
 logger = logging.getLogger(__name__)
 
@@ -39,21 +59,90 @@ async def set_db(request: Request, session: Annotated[AsyncSession, Depends(get_
     request.state.db_session = session
 
 
-executor = ProcessPoolExecutor()
+executor = create_validation_executor()
+# the event loop only keeps weak references to tasks, so the pending expiry checks are held here
+expiry_checks: Set[asyncio.Task] = set()
+MAX_SUBMISSIONS_PAGE_SIZE = 1000
+# filings and submissions change at any time, clients always revalidate them with their ETag
+REVALIDATE = "private, no-cache"
 router = Router(dependencies=[Depends(set_db), Depends(verify_user_lei_relation)])
 
 
 @router.get("/periods", response_model=List[FilingPeriodDTO])
 @requires("authenticated")
 async def get_filing_periods(request: Request):
-    return await repo.get_filing_periods(request.state.db_session)
+    # the serialized periods and their ETag are cached next to the periods themselves, so a revalidation while they
+    # are cached neither queries nor serializes anything
+    content, etag = await repo.reference_data_cache.get_or_load(
+        FilingPeriodDTO, lambda: _serialize_filing_periods(request.state.db_session)
+    )
+    return conditional_response(
+        request, content, etag, f"private, max-age={settings.reference_data_max_age_secs}, must-revalidate"
+    )
+
+
+async def _serialize_filing_periods(session: AsyncSession) -> tuple[bytes, str]:
+    periods = await repo.get_filing_periods(session)
+    content = JSONResponse(jsonable_encoder([FilingPeriodDTO.model_validate(p) for p in periods])).body
+    return content, make_etag(content)
+
+
+@router.get("/periods/{period_code}/filings")
+@requires(settings.admin_scopes)
+async def export_period_filings(
+    request: Request,
+    period_code: str,
+    format: ExportFormat = ExportFormat.NDJSON,
+    signed: bool | None = None,
+    latest_submission_state: Annotated[List[SubmissionState] | None, Query()] = None,
+):
+    if not await repo.get_filing_period(request.state.db_session, period_code):
+        raise RegTechHttpException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            name="Filing Period Not Found",
+            detail=f"There is no Filing Period {period_code}, unable to export its filings.",
+        )
+    return StreamingResponse(
+        filing_export.export_period_filings(period_code, format, signed, latest_submission_state),
+        media_type=filing_export.EXPORT_MEDIA_TYPES[format],
+    )
+
+
+@router.post("/periods/{period_code}/filings/status", response_model=List[FilingStatusDTO])
+@requires(settings.admin_scopes)
+async def get_filings_status(request: Request, period_code: str, status_request: FilingStatusRequestDTO):
+    if not await repo.get_filing_period(request.state.db_session, period_code):
+        raise RegTechHttpException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            name="Filing Period Not Found",
+            detail=f"There is no Filing Period {period_code}, unable to get the status of its filings.",
+        )
+    return await repo.get_filings_status(request.state.db_session, period_code, status_request.leis)
+
+
+@router.get("/periods/{period_code}/validation_cache_stats", response_model=ValidationCacheStatsDTO)
+@requires(settings.admin_scopes)
+async def get_validation_cache_stats(request: Request, period_code: str):
+    if not await repo.get_filing_period(request.state.db_session, period_code):
+        raise RegTechHttpException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            name="Filing Period Not Found",
+            detail=f"There is no Filing Period {period_code}, unable to get its validation cache stats.",
+        )
+    return await repo.get_validation_cache_stats(request.state.db_session, period_code)
 
 
 @router.get("/institutions/{lei}/filings/{period_code}", response_model=FilingDTO | None)
 @requires("authenticated")
 async def get_filing(request: Request, response: Response, lei: str, period_code: str):
+    # a revalidation only needs the filing's version, the filing itself is only loaded once it has changed
+    if "if-none-match" in request.headers:
+        version = await repo.get_filing_version(request.state.db_session, lei, period_code)
+        if version and etag_matches(request, etag := version_etag("filing", *version)):
+            return not_modified_response(etag, REVALIDATE)
     res = await repo.get_filing(request.state.db_session, lei, period_code)
     if res:
+        response.headers.update({"ETag": version_etag("filing", res.id, res.version), "Cache-Control": REVALIDATE})
         return res
     response.status_code = status.HTTP_204_NO_CONTENT
 
@@ -144,8 +233,7 @@ async def sign_filing(request: Request, lei: str, period_code: str):
 @router.post("/institutions/{lei}/filings/{period_code}/submissions", response_model=SubmissionDTO)
 @requires("authenticated")
 async def upload_file(request: Request, lei: str, period_code: str, file: UploadFile):
-    submission_processor.validate_file_processable(file)
-    content = await file.read()
+    submission_storage.validate_file_processable(file)
 
     filing = await repo.get_filing(request.state.db_session, lei, period_code)
     if not filing:
@@ -164,9 +252,12 @@ async def upload_file(request: Request, lei: str, period_code: str, file: Upload
             action_type=UserActionType.SUBMIT,
         )
         submission = await repo.add_submission(request.state.db_session, filing.id, file.filename, submitter.id)
+        extension = file.filename.split(".")[-1]
         try:
-            submission_processor.upload_to_storage(
-                period_code, lei, submission.id, content, file.filename.split(".")[-1]
+            # stream the spooled upload into storage instead of reading the whole file into memory, in the threadpool
+            # since the upload is blocking I/O for the whole size of the file
+            submission.file_hash = await run_in_threadpool(
+                submission_storage.upload_to_storage, period_code, lei, submission.id, file.file, extension
             )
 
             submission.state = SubmissionState.SUBMISSION_UPLOADED
@@ -180,10 +271,17 @@ async def upload_file(request: Request, lei: str, period_code: str, file: Upload
                 detail=f"Error while trying to process Submission {submission.id}",
             ) from e
 
-        exec_check = Manager().dict()
-        exec_check["continue"] = True
-        loop = asyncio.get_event_loop()
-        loop.run_in_executor(executor, handle_submission, period_code, lei, submission, content, exec_check)
+        file_path = submission_storage.get_storage_path(period_code, lei, submission.id, extension)
+        if settings.validation_queue_config.enabled:
+            # the validation worker picks the job up, so the validation outlives this API process
+            await job_repo.enqueue_validation_job(request.state.db_session, submission.id, lei, period_code, file_path)
+        else:
+            loop = asyncio.get_event_loop()
+            future = loop.run_in_executor(executor, handle_submission, period_code, lei, submission, file_path)
+            # expires the submission if its validation is still running expired_submission_check_secs after it started
+            expiry_check = loop.create_task(check_future(future, submission.id))
+            expiry_checks.add(expiry_check)
+            expiry_check.add_done_callback(expiry_checks.discard)
 
         return submission
 
@@ -211,35 +309,167 @@ async def upload_file(request: Request, lei: str, period_code: str, file: Upload
 
 @router.get("/institutions/{lei}/filings/{period_code}/submissions", response_model=List[SubmissionDTO])
 @requires("authenticated")
-async def get_submissions(request: Request, lei: str, period_code: str):
-    return await repo.get_submissions(request.state.db_session, lei, period_code)
+async def get_submissions(
+    request: Request,
+    response: Response,
+    lei: str,
+    period_code: str,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_SUBMISSIONS_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+):
+    """
+    Lists the filing's submissions oldest first.  With "limit", a page is returned, and the X-Next-Cursor header, if
+    present, is the "cursor" to pass for the next page.  "fields" is a comma separated list of SubmissionDTO fields to
+    return, only those are read from the database; "id" is always included.
+    """
+    field_set = _parse_submission_fields(fields) if fields else None
+    submissions = await repo.get_submissions(
+        request.state.db_session,
+        lei,
+        period_code,
+        # one extra row tells whether there is a next page
+        limit=limit + 1 if limit else None,
+        after=_decode_submissions_cursor(cursor) if cursor else None,
+        fields=field_set,
+    )
+    headers = {}
+    if limit and len(submissions) > limit:
+        submissions = submissions[:limit]
+        headers["X-Next-Cursor"] = _encode_submissions_cursor(submissions[-1])
+    if field_set:
+        # a projection is not a valid SubmissionDTO, so it bypasses the response_model
+        content = jsonable_encoder([_project_submission(s, field_set) for s in submissions])
+        return JSONResponse(content=content, headers=headers)
+    response.headers.update(headers)
+    return submissions
+
+
+def _parse_submission_fields(fields: str) -> Set[str]:
+    field_set = {f.strip() for f in fields.split(",") if f.strip()} | {"id"}
+    if unknown := field_set - set(SubmissionDTO.model_fields):
+        raise RegTechHttpException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            name="Invalid Fields",
+            detail=f"Unknown submission fields {sorted(unknown)}, valid fields are {list(SubmissionDTO.model_fields)}.",
+        )
+    return field_set
+
+
+def _project_submission(submission: SubmissionDAO, fields: Set[str]) -> Dict[str, Any]:
+    projected = {}
+    for field in fields:
+        value = getattr(submission, field)
+        if isinstance(value, UserActionDAO):
+            value = UserActionDTO.model_validate(value, from_attributes=True)
+        projected[field] = value
+    return projected
+
+
+def _encode_submissions_cursor(submission: SubmissionDAO) -> str:
+    key = json.dumps([submission.submission_time.isoformat(), submission.id])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def _decode_submissions_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        submission_time, submission_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(submission_time), int(submission_id)
+    except Exception:
+        raise RegTechHttpException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            name="Invalid Cursor",
+            detail=f"{cursor} is not a valid submissions cursor.",
+        )
 
 
 @router.get("/institutions/{lei}/filings/{period_code}/submissions/latest", response_model=SubmissionDTO)
 @requires("authenticated")
 async def get_submission_latest(request: Request, lei: str, period_code: str):
-    filing = await repo.get_filing(request.state.db_session, lei, period_code)
-    if not filing:
+    result = await repo.get_latest_submission(request.state.db_session, lei, period_code, load_results=True)
+    if result:
+        return result
+    # only without a submission does it matter whether the filing exists at all
+    if not await repo.filing_exists(request.state.db_session, lei, period_code):
         raise RegTechHttpException(
             status_code=status.HTTP_404_NOT_FOUND,
             name="Filing Not Found",
             detail=f"There is no Filing for LEI {lei} in period {period_code}, unable to get latest submission for it.",
         )
-    result = await repo.get_latest_submission(request.state.db_session, lei, period_code)
-    if result:
-        return result
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/institutions/{lei}/filings/{period_code}/submissions/{id}", response_model=SubmissionDTO | None)
 @requires("authenticated")
 async def get_submission(request: Request, response: Response, id: int):
-    result = await repo.get_submission(request.state.db_session, id)
+    if "if-none-match" in request.headers:
+        version = await repo.get_submission_version(request.state.db_session, id)
+        if version and etag_matches(request, etag := version_etag("submission", id, version)):
+            return not_modified_response(etag, REVALIDATE)
+    result = await repo.get_submission(request.state.db_session, id, load_results=True)
     if result:
+        response.headers.update({"ETag": version_etag("submission", id, result.version), "Cache-Control": REVALIDATE})
         return result
     response.status_code = status.HTTP_404_NOT_FOUND
 
 
+@router.get(
+    "/institutions/{lei}/filings/{period_code}/submissions/{id}/validation-results", response_model=Dict[str, Any]
+)
+@requires("authenticated")
+async def get_submission_validation_results(request: Request, id: int):
+    results = await repo.get_validation_results(request.state.db_session, id)
+    if results is None:
+        raise RegTechHttpException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            name="Validation Results Not Found",
+            detail=f"Submission {id} has no validation results.",
+        )
+    return results
+
+
+@router.get("/institutions/{lei}/filings/{period_code}/submissions/{id}/progress", response_model=SubmissionProgressDTO)
+@requires("authenticated")
+async def get_submission_progress(request: Request, response: Response, id: int):
+    progress = await repo.get_submission_progress(request.state.db_session, id)
+    if not progress:
+        raise RegTechHttpException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            name="Submission Progress Not Found",
+            detail=f"Submission {id} has no validation progress.",
+        )
+    if progress.phase != SubmissionProgressPhase.COMPLETED:
+        # progress is not written more often than this, so polling faster only returns the same answer
+        response.headers["Retry-After"] = str(math.ceil(settings.validation_progress_interval_secs) or 1)
+    return progress
+
+
+@router.get("/institutions/{lei}/filings/{period_code}/submissions/{id}/events")
+@requires("authenticated")
+async def get_submission_events(request: Request, id: int):
+    if not await repo.get_submission_state(request.state.db_session, id):
+        raise RegTechHttpException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            name="Submission Not Found",
+            detail=f"Submission ID {id} does not exist.",
+        )
+    try:
+        # connect up front, once the stream has started there is no way left to report the failure to the client
+        await submission_events.broker.connect()
+    except Exception as e:
+        logger.error("Could not listen for submission state changes.", exc_info=e)
+        raise RegTechHttpException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            name="Submission Events Unavailable",
+            detail="Submission state changes are not available right now, poll the submission instead.",
+        )
+    return StreamingResponse(
+        submission_events.submission_state_events(id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/institutions/{lei}/filings/{period_code}/submissions/{id}/accept", response_model=SubmissionDTO)
 @requires("authenticated")
 async def accept_submission(request: Request, id: int, lei: str, period_code: str):
@@ -322,22 +552,21 @@ async def put_contact_info(request: Request, lei: str, period_code: str, contact
 )
 @requires("authenticated")
 async def get_latest_submission_report(request: Request, lei: str, period_code: str):
-    filing = await repo.get_filing(request.state.db_session, lei, period_code)
-    if not filing:
+    latest_sub = await repo.get_latest_submission(request.state.db_session, lei, period_code)
+    if not latest_sub and not await repo.filing_exists(request.state.db_session, lei, period_code):
         raise RegTechHttpException(
             status_code=status.HTTP_404_NOT_FOUND,
             name="Filing Not Found",
             detail=f"There is no Filing for LEI {lei} in period {period_code}, unable to get latest submission for it.",
         )
-    latest_sub = await repo.get_latest_submission(request.state.db_session, lei, period_code)
     if latest_sub and latest_sub.state in [
         SubmissionState.VALIDATION_SUCCESSFUL,
         SubmissionState.VALIDATION_WITH_ERRORS,
         SubmissionState.VALIDATION_WITH_WARNINGS,
         SubmissionState.SUBMISSION_ACCEPTED,
     ]:
-        file_data = submission_processor.get_from_storage(
-            period_code, lei, str(latest_sub.id) + submission_processor.REPORT_QUALIFIER
+        file_data = submission_storage.get_from_storage(
+            period_code, lei, str(latest_sub.id) + submission_storage.REPORT_QUALIFIER
         )
         return StreamingResponse(
             content=file_data,
@@ -351,7 +580,7 @@ async def get_latest_submission_report(request: Request, lei: str, period_code:
         raise RegTechHttpException(
             status_code=status.HTTP_404_NOT_FOUND,
             name="Report Not Found",
-            detail=f"Report for ({filing.id}) does not exist.",
+            detail=f"Report for the latest submission of LEI {lei} in period {period_code} does not exist.",
         )
 
 
@@ -368,8 +597,8 @@ async def get_submission_report(request: Request, response: Response, lei: str,
         SubmissionState.VALIDATION_WITH_WARNINGS,
         SubmissionState.SUBMISSION_ACCEPTED,
     ]:
-        file_data = submission_processor.get_from_storage(
-            period_code, lei, str(sub.id) + submission_processor.REPORT_QUALIFIER
+        file_data = submission_storage.get_from_storage(
+            period_code, lei, str(sub.id) + submission_storage.REPORT_QUALIFIER
         )
         return StreamingResponse(
             content=file_data,
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class CacheStats:
+    """
+    Thread-safe hit / miss counters for the in-process caches, so their effectiveness can be logged and inspected.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {"name": self.name, "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+    def __str__(self):
+        return f"Cache: {self.name}, Hits: {self.hits}, Misses: {self.misses}, Hit Rate: {self.hit_rate:.2%}"
+
+
+class TtlCache:
+    """
+    Process-wide cache of reference data that rarely changes, independent of any database session.  Entries expire
+    "ttl_secs" after they were loaded, or however long "ttl_of" the loaded value says, and are dropped right away by
+    invalidate() when the data is changed through the API; a ttl of 0 disables caching.  Once "maxsize" entries are
+    held, the oldest one is evicted.
+    """
+
+    def __init__(self, name: str, ttl_secs: float, maxsize: int = 128):
+        self.stats = CacheStats(name)
+        self.ttl_secs = ttl_secs
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl_of: Callable[[Any], float] | None = None
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.stats.hit()
+            return entry[1]
+        self.stats.miss()
+        value = await loader()
+        ttl_secs = ttl_of(value) if ttl_of else self.ttl_secs
+        if ttl_secs > 0:
+            with self._lock:
+                self._entries.pop(key, None)
+                if len(self._entries) >= self.maxsize:
+                    del self._entries[next(iter(self._entries))]
+                self._entries[key] = (time.monotonic() + ttl_secs, value)
+        log.debug(self.stats)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        Drops the given keys, or every entry if no key is given.
+        """
+        with self._lock:
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
@@ -1,19 +1,71 @@
+import hashlib
 import logging
-from typing import Generator
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Generator
 import boto3
+from botocore.config import Config
 from pathlib import Path
 from sbl_filing_api.config import FsProtocol, settings
+from sbl_filing_api.services.caching import CacheStats
 
 log = logging.getLogger(__name__)
 
+_s3_client = None
+_s3_client_lock = threading.Lock()
+s3_client_stats = CacheStats("s3_client")
 
-def upload(path: str, content: bytes) -> None:
+
+def get_s3_client():
+    """
+    Returns the process-wide S3 client, creating it on first use.  boto3 clients are thread safe, so the client and its
+    connection pool are shared by all requests and transfer threads in the process instead of being rebuilt per call.
+    """
+    global _s3_client
+    client = _s3_client
+    if client is not None:
+        s3_client_stats.hit()
+        return client
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client(
+                "s3", config=Config(max_pool_connections=settings.fs_upload_config.max_pool_connections)
+            )
+            s3_client_stats.miss()
+            log.debug("Created S3 client for process %d. %s", os.getpid(), s3_client_stats)
+        else:
+            s3_client_stats.hit()
+        return _s3_client
+
+
+def reset_s3_client() -> None:
+    """
+    Drops the cached S3 client; forked children (e.g. ProcessPoolExecutor workers) must not reuse the parent's
+    connections, so this also runs in every child right after a fork.
+    """
+    global _s3_client, _s3_client_lock
+    _s3_client = None
+    _s3_client_lock = threading.Lock()
+    s3_client_stats.reset()
+
+
+os.register_at_fork(after_in_child=reset_s3_client)
+
+
+def upload(path: str, content: bytes) -> str:
+    """
+    Writes the content to storage, returning its SHA-256 hex digest.
+    """
     if settings.fs_upload_config.protocol == FsProtocol.FILE:
         file = Path(f"{settings.fs_upload_config.root}/{path}")
         file.parent.mkdir(parents=True, exist_ok=True)
         file.write_bytes(content)
     else:
-        s3 = boto3.client("s3")
+        s3 = get_s3_client()
         r = s3.put_object(
             Bucket=settings.fs_upload_config.root,
             Key=path,
@@ -24,6 +76,97 @@ def upload(path: str, content: bytes) -> None:
             path,
             r,
         )
+    return hashlib.sha256(content).hexdigest()
+
+
+def upload_stream(path: str, stream: BinaryIO) -> str:
+    """
+    Uploads the content of a readable binary stream part by part, so memory is bounded by part_size * max_concurrency
+    instead of the file size.  Local files are overwritten, S3 objects are written with a multipart upload.
+    Returns the SHA-256 hex digest of the content, computed as it is streamed.
+    """
+    part_size = settings.fs_upload_config.part_size
+    digest = hashlib.sha256()
+
+    def read_chunk() -> bytes:
+        chunk = stream.read(part_size)
+        digest.update(chunk)
+        return chunk
+
+    if settings.fs_upload_config.protocol == FsProtocol.FILE:
+        file = Path(f"{settings.fs_upload_config.root}/{path}")
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with file.open("wb") as f:
+            while chunk := read_chunk():
+                f.write(chunk)
+    elif not settings.fs_upload_config.multipart:
+        # put_object needs a seekable body anyway, so hash it in a first pass and rewind
+        start = stream.tell()
+        while read_chunk():
+            pass
+        stream.seek(start)
+        s3 = get_s3_client()
+        s3.put_object(Bucket=settings.fs_upload_config.root, Key=path, Body=stream)
+    else:
+        s3 = get_s3_client()
+        chunk = read_chunk()
+        if len(chunk) < part_size:
+            # everything fits in a single part, skip the multipart round trips
+            s3.put_object(Bucket=settings.fs_upload_config.root, Key=path, Body=chunk)
+        else:
+            _multipart_upload(s3, path, chunk, read_chunk)
+    return digest.hexdigest()
+
+
+def copy(source_path: str, destination_path: str) -> None:
+    """
+    Copies a stored file without passing its content through this process when stored in S3.
+    """
+    if settings.fs_upload_config.protocol == FsProtocol.FILE:
+        destination = Path(f"{settings.fs_upload_config.root}/{destination_path}")
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(f"{settings.fs_upload_config.root}/{source_path}", destination)
+    else:
+        s3 = get_s3_client()
+        s3.copy_object(
+            Bucket=settings.fs_upload_config.root,
+            Key=destination_path,
+            CopySource={"Bucket": settings.fs_upload_config.root, "Key": source_path},
+        )
+
+
+def _multipart_upload(s3, path: str, first_chunk: bytes, read_chunk: Callable[[], bytes]) -> None:
+    bucket = settings.fs_upload_config.root
+    max_concurrency = settings.fs_upload_config.max_concurrency
+    mpu = s3.create_multipart_upload(Bucket=bucket, Key=path)
+
+    def upload_part(part_number: int, body: bytes) -> dict:
+        r = s3.upload_part(Bucket=bucket, Key=path, UploadId=mpu["UploadId"], PartNumber=part_number, Body=body)
+        return {"ETag": r["ETag"], "PartNumber": part_number}
+
+    try:
+        parts = []
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            chunk = first_chunk
+            part_number = 1
+            while chunk:
+                if len(in_flight) >= max_concurrency:
+                    # wait on the oldest part before reading the next one, so memory stays at max_concurrency parts
+                    parts.append(in_flight.popleft().result())
+                in_flight.append(pool.submit(upload_part, part_number, chunk))
+                part_number += 1
+                chunk = read_chunk()
+            parts.extend(f.result() for f in in_flight)
+        s3.complete_multipart_upload(
+            Bucket=bucket,
+            Key=path,
+            UploadId=mpu["UploadId"],
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        s3.abort_multipart_upload(Bucket=bucket, Key=path, UploadId=mpu["UploadId"])
+        raise
 
 
 def download(path: str) -> Generator:
@@ -31,10 +174,78 @@ def download(path: str) -> Generator:
         with open(f"{settings.fs_upload_config.root}/{path}") as f:
             yield from f
     else:
-        s3 = boto3.client("s3")
+        s3 = get_s3_client()
+        size = _ranged_download_size(s3, path)
+        if size:
+            yield from _download_ranges(s3, path, size)
+        else:
+            r = s3.get_object(
+                Bucket=settings.fs_upload_config.root,
+                Key=path,
+            )
+            with r["Body"] as f:
+                yield from f
+
+
+def open_file(path: str) -> BinaryIO:
+    """
+    Opens a stored file for binary reading without loading it into memory; the caller is responsible for closing it.
+    Large S3 objects are fetched with parallel ranged GETs into a temporary file that is removed once closed.
+    """
+    if settings.fs_upload_config.protocol == FsProtocol.FILE:
+        return open(f"{settings.fs_upload_config.root}/{path}", "rb")
+    else:
+        s3 = get_s3_client()
+        size = _ranged_download_size(s3, path)
+        if size:
+            tmp = tempfile.TemporaryFile()
+            try:
+                for chunk in _download_ranges(s3, path, size):
+                    tmp.write(chunk)
+                tmp.seek(0)
+            except Exception:
+                tmp.close()
+                raise
+            return tmp
         r = s3.get_object(
             Bucket=settings.fs_upload_config.root,
             Key=path,
         )
+        return r["Body"]
+
+
+def _ranged_download_size(s3, path: str) -> int | None:
+    """
+    Returns the object size if it is large enough to be worth fetching in parallel ranges, otherwise None.
+    """
+    if not settings.fs_upload_config.multipart:
+        return None
+    size = s3.head_object(Bucket=settings.fs_upload_config.root, Key=path)["ContentLength"]
+    return size if size > settings.fs_upload_config.part_size else None
+
+
+def _download_ranges(s3, path: str, size: int) -> Generator[bytes, None, None]:
+    bucket = settings.fs_upload_config.root
+    part_size = settings.fs_upload_config.part_size
+    max_concurrency = settings.fs_upload_config.max_concurrency
+
+    def get_range(start: int) -> bytes:
+        end = min(start + part_size, size) - 1
+        r = s3.get_object(Bucket=bucket, Key=path, Range=f"bytes={start}-{end}")
         with r["Body"] as f:
-            yield from f
+            return f.read()
+
+    starts = iter(range(0, size, part_size))
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for start in starts:
+            in_flight.append(pool.submit(get_range, start))
+            if len(in_flight) >= max_concurrency:
+                break
+        while in_flight:
+            # ranges are yielded in order, prefetching at most max_concurrency ranges ahead of the consumer
+            chunk = in_flight.popleft().result()
+            next_start = next(starts, None)
+            if next_start is not None:
+                in_flight.append(pool.submit(get_range, next_start))
+            yield chunk
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+
+from typing import AsyncIterator, List
+
+from fastapi.encoders import jsonable_encoder
+
+from sbl_filing_api.entities.engine.engine import SessionLocal
+from sbl_filing_api.entities.models.model_enums import ExportFormat, SubmissionState
+from sbl_filing_api.entities.repos import submission_repo as repo
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    "id",
+    "lei",
+    "filing_period",
+    "institution_snapshot_id",
+    "confirmation_id",
+    "signed",
+    "latest_submission_id",
+    "latest_submission_state",
+    "latest_submission_time",
+]
+EXPORT_MEDIA_TYPES = {ExportFormat.NDJSON: "application/x-ndjson", ExportFormat.CSV: "text/csv"}
+
+
+def format_rows(rows: List[dict], export_format: ExportFormat) -> str:
+    if export_format == ExportFormat.NDJSON:
+        return "".join(json.dumps(row) + "\n" for row in rows)
+    out = io.StringIO()
+    csv.DictWriter(out, EXPORT_COLUMNS, lineterminator="\n").writerows(rows)
+    return out.getvalue()
+
+
+async def export_period_filings(
+    filing_period: str,
+    export_format: ExportFormat,
+    signed: bool | None = None,
+    latest_submission_states: List[SubmissionState] | None = None,
+) -> AsyncIterator[str]:
+    """
+    Every filing of the period, as NDJSON or CSV, one chunk per EXPORT_BATCH_SIZE rows read from the database cursor,
+    so memory use does not grow with the number of filings.
+    """
+    if export_format == ExportFormat.CSV:
+        yield ",".join(EXPORT_COLUMNS) + "\n"
+    async with SessionLocal() as session:
+        result = await repo.stream_period_filings(
+            session, filing_period, signed, latest_submission_states, yield_per=EXPORT_BATCH_SIZE
+        )
+        async for rows in result.mappings().partitions():
+            yield format_rows(jsonable_encoder([dict(row) for row in rows]), export_format)
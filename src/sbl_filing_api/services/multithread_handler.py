@@ -2,36 +2,58 @@ import asyncio
 import logging
 
 from sbl_filing_api.config import settings
-from sbl_filing_api.entities.models.dao import SubmissionDAO
+from sbl_filing_api.entities.engine.engine import SessionLocal
+from sbl_filing_api.entities.models.dao import SubmissionDAO, SubmissionState
 from sbl_filing_api.entities.repos import submission_repo as repo
-from sbl_filing_api.services.submission_processor import validate_and_update_submission
 
 
 logger = logging.getLogger(__name__)
 
 
-def handle_submission(period_code: str, lei: str, submission: SubmissionDAO, content: bytes, exec_check):
+def handle_submission(
+    period_code: str,
+    lei: str,
+    submission: SubmissionDAO,
+    file_path: str,
+    job_id: int | None = None,
+    worker_id: str | None = None,
+):
+    # imported here, in the validation process, so the API itself never loads pandas and the validator
+    from sbl_filing_api.services.submission_processor import validate_and_update_submission
+
     loop = asyncio.get_event_loop()
     try:
-        coro = validate_and_update_submission(period_code, lei, submission, content, exec_check)
+        coro = validate_and_update_submission(period_code, lei, submission, file_path, job_id, worker_id)
         loop.run_until_complete(coro)
     except Exception as e:
         logger.error(e, exc_info=True, stack_info=True)
 
 
-async def check_future(future, submission_id, exec_check):
+async def wait_for_validation_start(future, submission_id):
+    """
+    Returns once the validation process has picked the submission up, setting it VALIDATION_IN_PROGRESS, or the
+    validation is done, checking every expired_submission_start_poll_secs.
+    """
+    while not future.done():
+        async with SessionLocal() as session:
+            if await repo.get_submission_state(session, submission_id) != SubmissionState.SUBMISSION_UPLOADED:
+                return
+        await asyncio.sleep(settings.expired_submission_start_poll_secs)
+
+
+async def check_future(future, submission_id):
+    # the time a submission waits for a free validation process does not count against it
+    await wait_for_validation_start(future, submission_id)
     await asyncio.sleep(settings.expired_submission_check_secs)
     try:
         future.result()
     except asyncio.InvalidStateError:
         future.cancel()
-        exec_check["continue"] = False
         await repo.expire_submission(submission_id)
         logger.warning(
             f"Validation for submission {submission_id} did not complete within the expected timeframe, will be set to VALIDATION_EXPIRED."
         )
     except Exception:
-        exec_check["continue"] = False
         await repo.error_out_submission(submission_id)
         logger.error(
             f"Validation for submission {submission_id} did not complete due to an unexpected error.",
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.engine.engine import SessionLocal
+from sbl_filing_api.entities.models.model_enums import SubmissionState
+from sbl_filing_api.entities.repos.submission_repo import SUBMISSION_STATE_CHANNEL, get_submission_state
+
+log = logging.getLogger(__name__)
+
+PENDING_STATES = [
+    SubmissionState.SUBMISSION_STARTED,
+    SubmissionState.SUBMISSION_UPLOADED,
+    SubmissionState.VALIDATION_IN_PROGRESS,
+]
+
+
+class SubmissionEventBroker:
+    """
+    Fans the submission state notifications sent by update_submission out to the event streams waiting on them.
+    Each process holds a single LISTEN connection, opened on first use, no matter how many streams are open.
+    """
+
+    def __init__(self):
+        self._conn: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+
+    async def connect(self) -> None:
+        async with self._lock:
+            if self._conn and not self._conn.is_closed():
+                return
+            # asyncpg takes a plain postgresql:// dsn, without SQLAlchemy's +asyncpg driver suffix
+            dsn = make_url(settings.conn.unicode_string()).set(drivername="postgresql")
+            self._conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+            self._conn.add_termination_listener(self._on_termination)
+            await self._conn.add_listener(SUBMISSION_STATE_CHANNEL, self._on_notification)
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._conn:
+                conn, self._conn = self._conn, None
+                conn.remove_termination_listener(self._on_termination)
+                await conn.close()
+
+    @asynccontextmanager
+    async def subscribe(self, submission_id: int) -> AsyncIterator[asyncio.Queue]:
+        await self.connect()
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(submission_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers[submission_id]
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[submission_id]
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            queues = self._subscribers.get(event["id"], ())
+        except (ValueError, KeyError, TypeError):
+            log.warning(f"Ignoring malformed submission state notification {payload}.")
+            return
+        for queue in queues:
+            queue.put_nowait(event)
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        # anything sent before the next connect would be missed, so end every open stream and let the clients
+        # reconnect, which re-reads the current state
+        log.warning("Lost the submission state listener connection, closing open event streams.")
+        self._conn = None
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(None)
+
+
+broker = SubmissionEventBroker()
+
+
+def format_event(submission_id: int, state: SubmissionState) -> str:
+    return f"event: submission_state\ndata: {json.dumps({'id': submission_id, 'state': state})}\n\n"
+
+
+async def submission_state_events(submission_id: int) -> AsyncIterator[str]:
+    """
+    Server-sent events stream of a submission's state.  Sends the current state, then every change to it until the
+    submission leaves the PENDING_STATES, or the stream hits timeout_secs.  A comment is sent every keepalive_secs in
+    between so the idle connection is not dropped.
+    """
+    config = settings.submission_events_config
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + config.timeout_secs
+    async with broker.subscribe(submission_id) as queue:
+        # read after subscribing, so a change made in between is not missed
+        async with SessionLocal() as session:
+            state = await get_submission_state(session, submission_id)
+        yield format_event(submission_id, state)
+        while state in PENDING_STATES and (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(queue.get(), min(config.keepalive_secs, remaining))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            state = event["state"]
+            yield format_event(submission_id, state)
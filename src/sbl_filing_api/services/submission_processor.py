@@ -1,66 +1,40 @@
-from typing import Generator
+from typing import BinaryIO
 import pandas as pd
 import importlib.metadata as imeta
 import logging
 
-from io import BytesIO
-from fastapi import UploadFile
 from regtech_data_validator.create_schemas import validate_phases
 from regtech_data_validator.data_formatters import df_to_dicts, df_to_download
 from regtech_data_validator.checks import Severity
-from regtech_data_validator.validation_results import ValidationResults, ValidationPhase
+from regtech_data_validator.validation_results import Counts, ValidationResults, ValidationPhase
 from sbl_filing_api.entities.engine.engine import SessionLocal
 from sbl_filing_api.entities.models.dao import SubmissionDAO, SubmissionState
-from sbl_filing_api.entities.repos.submission_repo import update_submission
-from http import HTTPStatus
-from sbl_filing_api.config import settings
+from sbl_filing_api.entities.models.model_enums import SubmissionProgressPhase
+from sbl_filing_api.entities.repos.submission_repo import (
+    get_submission_state,
+    get_validated_submission_by_hash,
+    get_validation_results,
+    update_submission,
+)
+from sbl_filing_api.entities.repos.validation_job_repo import holds_validation_job
+from sbl_filing_api.config import CsvEngine, settings
 from sbl_filing_api.services import file_handler
-from regtech_api_commons.api.exceptions import RegTechHttpException
+from sbl_filing_api.services.submission_storage import REPORT_QUALIFIER, get_storage_path, upload_to_storage
+from sbl_filing_api.services.validation_progress import ProgressReporter
 
 log = logging.getLogger(__name__)
 
-REPORT_QUALIFIER = "_report"
-
-
-def validate_file_processable(file: UploadFile) -> None:
-    extension = file.filename.split(".")[-1].lower()
-    if file.content_type != settings.submission_file_type or extension != settings.submission_file_extension:
-        raise RegTechHttpException(
-            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
-            name="Unsupported File Type",
-            detail=(
-                f"Only {settings.submission_file_type} file type with extension {settings.submission_file_extension} is supported; "
-                f'submitted file is "{file.content_type}" with "{extension}" extension',
-            ),
-        )
-    if file.size > settings.submission_file_size:
-        raise RegTechHttpException(
-            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
-            name="File Too Large",
-            detail=f"Uploaded file size of {file.size} bytes exceeds the limit of {settings.submission_file_size} bytes.",
-        )
-
-
-def upload_to_storage(period_code: str, lei: str, file_identifier: str, content: bytes, extension: str = "csv") -> None:
-    try:
-        file_handler.upload(path=f"upload/{period_code}/{lei}/{file_identifier}.{extension}", content=content)
-    except Exception as e:
-        raise RegTechHttpException(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR, name="Upload Failure", detail="Failed to upload file"
-        ) from e
-
-
-def get_from_storage(period_code: str, lei: str, file_identifier: str, extension: str = "csv") -> Generator:
-    try:
-        return file_handler.download(f"upload/{period_code}/{lei}/{file_identifier}.{extension}")
-    except Exception as e:
-        raise RegTechHttpException(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR, name="Download Failure", detail="Failed to read file."
-        ) from e
+# the columns identifying a finding, which has a row per field it involves
+FINDING_KEY = ["validation_id", "record_no"]
 
 
 async def validate_and_update_submission(
-    period_code: str, lei: str, submission: SubmissionDAO, content: bytes, exec_check: dict
+    period_code: str,
+    lei: str,
+    submission: SubmissionDAO,
+    file_path: str,
+    job_id: int | None = None,
+    worker_id: str | None = None,
 ):
     async with SessionLocal() as session:
         try:
@@ -69,11 +43,23 @@ async def validate_and_update_submission(
             submission.state = SubmissionState.VALIDATION_IN_PROGRESS
             submission = await update_submission(session, submission)
 
-            df = pd.read_csv(BytesIO(content), dtype=str, na_filter=False)
-            submission.total_records = len(df)
+            progress = ProgressReporter(submission.id)
+            if await reuse_cached_validation(session, period_code, lei, submission):
+                await update_submission(session, submission)
+                await progress.report(
+                    SubmissionProgressPhase.COMPLETED, submission.total_records, submission.total_records
+                )
+                return
 
             # Validate Phases
-            results = validate_phases(df, {"lei": lei}, max_errors=settings.max_validation_errors)
+            await progress.report(SubmissionProgressPhase.VALIDATING, 0)
+            if settings.validation_chunk_size > 0:
+                results, submission.total_records = await validate_file_in_chunks(file_path, lei, progress)
+            else:
+                results, submission.total_records = validate_file(file_path, lei)
+            await progress.report(
+                SubmissionProgressPhase.GENERATING_REPORT, submission.total_records, submission.total_records
+            )
 
             submission.validation_results = build_validation_results(results)
 
@@ -97,11 +83,21 @@ async def validate_and_update_submission(
                 period_code, lei, str(submission.id) + REPORT_QUALIFIER, submission_report.encode("utf-8")
             )
 
-            if not exec_check["continue"]:
+            # check_future marks an overdue submission VALIDATION_EXPIRED while this is still running
+            if await get_submission_state(session, submission.id) == SubmissionState.VALIDATION_EXPIRED:
                 log.warning(f"Submission {submission.id} is expired, will not be updating final state with results.")
                 return
 
+            # a validation worker that lost the lease on the job leaves the results to the worker that reclaimed it
+            if job_id is not None and not await holds_validation_job(session, job_id, worker_id):
+                log.warning(
+                    f"Validation job {job_id} was reclaimed by another worker, will not be updating submission "
+                    f"{submission.id} with results."
+                )
+                return
+
             await update_submission(session, submission)
+            await progress.report(SubmissionProgressPhase.COMPLETED, submission.total_records, submission.total_records)
 
         except RuntimeError:
             log.exception("The file is malformed.")
@@ -114,6 +110,175 @@ async def validate_and_update_submission(
             await update_submission(session, submission)
 
 
+def read_submission_csv(f: BinaryIO) -> pd.DataFrame:
+    """
+    Reads every field as a string, with empty fields as empty strings rather than NaN, whichever engine is used.
+    """
+    if settings.csv_engine == CsvEngine.PYARROW:
+        # the pyarrow engine ignores na_filter, not treating any value as NA gives the same frame as the C engine
+        return pd.read_csv(f, dtype=str, engine="pyarrow", keep_default_na=False)
+    return pd.read_csv(f, dtype=str, na_filter=False)
+
+
+def validate_file(file_path: str, lei: str) -> tuple[ValidationResults, int]:
+    with file_handler.open_file(file_path) as f:
+        df = read_submission_csv(f)
+    return validate_phases(df, {"lei": lei}, max_errors=settings.max_validation_errors), len(df)
+
+
+async def validate_file_in_chunks(
+    file_path: str, lei: str, progress: ProgressReporter = None
+) -> tuple[ValidationResults, int]:
+    """
+    Validates the file validation_chunk_size records at a time, so memory holds a single chunk and the merged findings
+    instead of the whole file.  Single-field and multi-field checks only look at one record, and chunks keep the row
+    numbers of the file, so their findings merge as is.  The one register-level check, uid uniqueness, is only seen by
+    the validator within a chunk; a file with a uid repeated across chunks is validated whole instead, so those
+    findings are reported exactly as without chunking.  Which files those are is found out before validating, from
+    their uid column alone.
+    """
+    if has_uids_across_chunks(file_path):
+        log.info(f"{file_path} has uids duplicated across chunks, validating the whole file instead.")
+        return validate_file(file_path, lei)
+    merged = ChunkedValidationResults(settings.max_validation_errors)
+    total_records = 0
+    with file_handler.open_file(file_path) as f:
+        for chunk in pd.read_csv(f, dtype=str, na_filter=False, chunksize=settings.validation_chunk_size):
+            total_records += len(chunk)
+            merged.add(validate_phases(chunk, {"lei": lei}, max_errors=settings.max_validation_errors))
+            if progress:
+                await progress.report(SubmissionProgressPhase.VALIDATING, total_records)
+    return merged.results(), total_records
+
+
+def has_uids_across_chunks(file_path: str) -> bool:
+    """
+    Whether a uid of one chunk of the file is repeated in another, reading the uid column only.
+    """
+    uids = set()
+    with file_handler.open_file(file_path) as f:
+        chunks = pd.read_csv(
+            f, dtype=str, na_filter=False, usecols=lambda c: c == "uid", chunksize=settings.validation_chunk_size
+        )
+        for chunk in chunks:
+            if "uid" not in chunk:
+                return False
+            chunk_uids = set(chunk["uid"])
+            if not uids.isdisjoint(chunk_uids):
+                return True
+            uids.update(chunk_uids)
+    return False
+
+
+class ChunkedValidationResults:
+    """
+    Merges the ValidationResults of chunks into the results of validating the file as a whole: the logical phase is
+    only reached if no chunk has syntactical errors, counts are summed, and findings are capped at max_errors rows,
+    cut between findings so a multi-field finding keeps all of its rows.
+    """
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.phase = ValidationPhase.LOGICAL
+        self._clear()
+
+    def _clear(self) -> None:
+        self.findings = pd.DataFrame()
+        self.error_counts = Counts(single_field_count=0, multi_field_count=0, register_count=0, total_count=0)
+        self.warning_counts = Counts(single_field_count=0, multi_field_count=0, register_count=0, total_count=0)
+
+    def add(self, results: ValidationResults) -> None:
+        if results.phase == ValidationPhase.SYNTACTICAL and self.phase == ValidationPhase.LOGICAL:
+            # the logical checks of earlier chunks would never have run, drop their findings
+            self._clear()
+            self.phase = ValidationPhase.SYNTACTICAL
+        elif results.phase == ValidationPhase.LOGICAL and self.phase == ValidationPhase.SYNTACTICAL:
+            return
+        self.error_counts = self._sum_counts(self.error_counts, results.error_counts)
+        self.warning_counts = self._sum_counts(self.warning_counts, results.warning_counts)
+        if not results.findings.empty and len(self.findings) < self.max_errors:
+            self.findings = self._head_findings(pd.concat([self.findings, results.findings]), self.max_errors)
+
+    def results(self) -> ValidationResults:
+        return ValidationResults(
+            phase=self.phase,
+            error_counts=self.error_counts,
+            warning_counts=self.warning_counts,
+            findings=self.findings,
+            is_valid=self.findings.empty,
+        )
+
+    @staticmethod
+    def _head_findings(findings: pd.DataFrame, max_rows: int) -> pd.DataFrame:
+        if len(findings) <= max_rows:
+            return findings
+        # the rows of a finding are consecutive, a new finding starts wherever its validation or record changes
+        keys = findings[FINDING_KEY].reset_index(drop=True)
+        finding_no = keys.ne(keys.shift()).any(axis=1).cumsum()
+        # up to, not including, the finding of the first row over the cap, and at least the first finding
+        return findings[(finding_no < max(finding_no[max_rows], 2)).to_numpy()]
+
+    @staticmethod
+    def _sum_counts(a: Counts, b: Counts) -> Counts:
+        return Counts(
+            single_field_count=a.single_field_count + b.single_field_count,
+            multi_field_count=a.multi_field_count + b.multi_field_count,
+            register_count=a.register_count + b.register_count,
+            total_count=a.total_count + b.total_count,
+        )
+
+
+async def reuse_cached_validation(session, period_code: str, lei: str, submission: SubmissionDAO) -> bool:
+    """
+    Copies the results, state and report of an already validated, byte-identical submission of the same LEI and
+    validator version onto this submission.  Returns False if there is none, and the file has to be validated.  Either
+    way it is recorded in the submission's validation_cache_hit, which the API aggregates, as the counts of this
+    process would be lost when it is recycled.
+    """
+    if not settings.validation_cache_enabled or not submission.file_hash:
+        return False
+    submission.validation_cache_hit = False
+    cached = await get_validated_submission_by_hash(
+        session, lei, submission.file_hash, submission.validation_ruleset_version, exclude_id=submission.id
+    )
+    if not cached:
+        return False
+    cached_submission, cached_period_code = cached
+    cached_results = await get_validation_results(session, cached_submission.id)
+    if cached_results is None:
+        return False
+    try:
+        file_handler.copy(
+            get_storage_path(cached_period_code, lei, f"{cached_submission.id}{REPORT_QUALIFIER}"),
+            get_storage_path(period_code, lei, f"{submission.id}{REPORT_QUALIFIER}"),
+        )
+    except Exception:
+        log.warning(
+            f"Could not copy the report of submission {cached_submission.id}, validating instead.", exc_info=True
+        )
+        return False
+    submission.validation_results = cached_results
+    submission.total_records = cached_submission.total_records
+    submission.state = validated_state_of(cached_submission, cached_results)
+    submission.validation_cache_hit = True
+    log.info(
+        f"Submission {submission.id} is identical to submission {cached_submission.id}, reusing its validation results."
+    )
+    return True
+
+
+def validated_state_of(submission: SubmissionDAO, validation_results: dict) -> SubmissionState:
+    """
+    The state a submission was left in by its validation.  Only submissions validated successfully or with warnings
+    can be accepted, which of the two it was is told by its warnings.
+    """
+    if submission.state != SubmissionState.SUBMISSION_ACCEPTED:
+        return submission.state
+    if validation_results.get("logic_warnings", {}).get("total_count", 0) > 0:
+        return SubmissionState.VALIDATION_WITH_WARNINGS
+    return SubmissionState.VALIDATION_SUCCESSFUL
+
+
 def build_validation_results(results: ValidationResults):
     val_json = df_to_dicts(results.findings, settings.max_json_records, settings.max_json_group_size)
     if results.phase == ValidationPhase.SYNTACTICAL:
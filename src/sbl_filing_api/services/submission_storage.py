@@ -0,0 +1,60 @@
+from http import HTTPStatus
+from typing import BinaryIO, Generator
+
+from fastapi import UploadFile
+from regtech_api_commons.api.exceptions import RegTechHttpException
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.services import file_handler
+
+REPORT_QUALIFIER = "_report"
+
+
+def validate_file_processable(file: UploadFile) -> None:
+    extension = file.filename.split(".")[-1].lower()
+    if file.content_type != settings.submission_file_type or extension != settings.submission_file_extension:
+        raise RegTechHttpException(
+            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            name="Unsupported File Type",
+            detail=(
+                f"Only {settings.submission_file_type} file type with extension {settings.submission_file_extension} is supported; "
+                f'submitted file is "{file.content_type}" with "{extension}" extension',
+            ),
+        )
+    if file.size > settings.submission_file_size:
+        raise RegTechHttpException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            name="File Too Large",
+            detail=f"Uploaded file size of {file.size} bytes exceeds the limit of {settings.submission_file_size} bytes.",
+        )
+
+
+def get_storage_path(period_code: str, lei: str, file_identifier: str, extension: str = "csv") -> str:
+    return f"upload/{period_code}/{lei}/{file_identifier}.{extension}"
+
+
+def upload_to_storage(
+    period_code: str, lei: str, file_identifier: str, content: bytes | BinaryIO, extension: str = "csv"
+) -> str:
+    """
+    Returns the SHA-256 hex digest of the uploaded content.
+    """
+    path = get_storage_path(period_code, lei, file_identifier, extension)
+    try:
+        if isinstance(content, bytes):
+            return file_handler.upload(path=path, content=content)
+        else:
+            return file_handler.upload_stream(path=path, stream=content)
+    except Exception as e:
+        raise RegTechHttpException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR, name="Upload Failure", detail="Failed to upload file"
+        ) from e
+
+
+def get_from_storage(period_code: str, lei: str, file_identifier: str, extension: str = "csv") -> Generator:
+    try:
+        return file_handler.download(get_storage_path(period_code, lei, file_identifier, extension))
+    except Exception as e:
+        raise RegTechHttpException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR, name="Download Failure", detail="Failed to read file."
+        ) from e
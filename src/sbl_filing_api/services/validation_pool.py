@@ -0,0 +1,59 @@
+import logging
+import multiprocessing
+import os
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from sbl_filing_api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def warm_validation_process(log_level: int) -> None:
+    """
+    Runs once in every new validation process, before its first validation: imports pandas, the validator and its
+    schema modules, so that cost is paid when the process starts instead of by the submission it picks up.  Only the
+    imports are warmed, validate_phases builds the phase schemas for the LEI of every validation itself.
+    """
+    logging.basicConfig(level=log_level)
+    try:
+        from sbl_filing_api.services import submission_processor  # noqa: F401
+    except Exception:
+        # the validation itself reports whatever is broken, against its submission
+        logger.warning("Could not warm up the validation process.", exc_info=True)
+
+
+def validation_pool_size(max_workers: int | None = None) -> int:
+    """
+    "max_workers", or else validation_pool_config.max_workers, or else the number of CPUs.
+    """
+    return max_workers or settings.validation_pool_config.max_workers or os.cpu_count() or 1
+
+
+def create_validation_executor(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """
+    The process pool validations run in, of validation_pool_size(max_workers) processes.  Processes are spawned rather
+    than forked, so they share no connections or clients with the parent, and are replaced after
+    validation_pool_config.max_tasks_per_child validations.  With prestart, the limit is one higher for the no-op task
+    that starts each process, so the processes replacing those run one more validation.
+    """
+    config = settings.validation_pool_config
+    max_tasks_per_child = config.max_tasks_per_child
+    if max_tasks_per_child and config.prestart:
+        max_tasks_per_child += 1
+    return ProcessPoolExecutor(
+        max_workers=validation_pool_size(max_workers),
+        mp_context=multiprocessing.get_context(config.start_method),
+        initializer=warm_validation_process,
+        initargs=(logging.getLogger().getEffectiveLevel(),),
+        max_tasks_per_child=max_tasks_per_child or None,
+    )
+
+
+def prestart_validation_executor(executor: ProcessPoolExecutor, max_workers: int) -> list[Future]:
+    """
+    Starts the "max_workers" processes of the pool without waiting for them, each warming up in its initializer.  A
+    pool only starts a process when a task finds none idle, so it is given one no-op task per process, returning the
+    process id.
+    """
+    return [executor.submit(os.getpid) for _ in range(max_workers)]
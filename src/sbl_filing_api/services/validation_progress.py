@@ -0,0 +1,36 @@
+import logging
+import time
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.engine.engine import SessionLocal
+from sbl_filing_api.entities.models.model_enums import SubmissionProgressPhase
+from sbl_filing_api.entities.repos.submission_repo import update_submission_progress
+
+log = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Records how far the validation of a submission got.  Phase changes are always written, row progress within a
+    phase at most once every validation_progress_interval_secs, so large files do not turn into a stream of writes.
+    Progress is informational, failing to record it never fails the validation: it is written in a short-lived session
+    of its own, so a failed write never rolls back, and expires, what the validation holds in its session.
+    """
+
+    def __init__(self, submission_id: int):
+        self.submission_id = submission_id
+        self.phase = None
+        self._last_write = 0.0
+
+    async def report(self, phase: SubmissionProgressPhase, rows_processed: int, total_rows: int = None) -> None:
+        now = time.monotonic()
+        if phase == self.phase and now - self._last_write < settings.validation_progress_interval_secs:
+            return
+        self.phase = phase
+        self._last_write = now
+        try:
+            # SessionLocal() would be the validation's own session, scoped to the same task
+            async with SessionLocal.session_factory() as session:
+                await update_submission_progress(session, self.submission_id, phase, rows_processed, total_rows)
+        except Exception:
+            log.warning(f"Could not record the progress of submission {self.submission_id}.", exc_info=True)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.engine.engine import SessionLocal
+from sbl_filing_api.entities.models.dao import ValidationJobDAO
+from sbl_filing_api.entities.models.model_enums import ValidationJobState
+from sbl_filing_api.entities.repos import submission_repo as repo
+from sbl_filing_api.entities.repos import validation_job_repo as job_repo
+from sbl_filing_api.services.multithread_handler import check_future, handle_submission
+from sbl_filing_api.services.validation_pool import create_validation_executor, prestart_validation_executor
+
+logger = logging.getLogger(__name__)
+
+worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+
+async def run_job(job: ValidationJobDAO, executor: ProcessPoolExecutor) -> None:
+    """
+    Runs a claimed job in the process pool, renewing its lease every heartbeat_secs until validation finishes, and
+    expires its submission if validation is still running expired_submission_check_secs after it started.  The lease
+    covers a worker that died, the expiry a validation that hangs in a live one.  A job whose lease was lost to another
+    worker is cancelled, and a job whose process pool broke underneath it is put back in the queue to be retried.
+    """
+    config = settings.validation_queue_config
+    async with SessionLocal() as session:
+        submission = await repo.get_submission(session, job.submission)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        executor, handle_submission, job.filing_period, job.lei, submission, job.file_path, job.id, worker_id
+    )
+    expiry_check = asyncio.create_task(check_future(future, job.submission))
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), config.heartbeat_secs)
+                break
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # check_future expired the submission, the job is done with it once that is recorded
+                await expiry_check
+                break
+            except asyncio.TimeoutError:
+                async with SessionLocal() as session:
+                    if not await job_repo.heartbeat_validation_job(session, job.id, worker_id):
+                        # another worker reclaimed the job after our lease expired and owns the submission from now on;
+                        # a validation already running here sees it no longer holds the job and skips its final update
+                        logger.warning(f"Lost the lease on validation job {job.id}, cancelling validation.")
+                        future.cancel()
+                        return
+            except BrokenProcessPool:
+                logger.error(f"Process pool broke while running validation job {job.id}, requeueing.", exc_info=True)
+                async with SessionLocal() as session:
+                    await job_repo.release_validation_job(session, job.id, worker_id, ValidationJobState.QUEUED)
+                raise
+    finally:
+        expiry_check.cancel()
+
+    async with SessionLocal() as session:
+        await job_repo.release_validation_job(session, job.id, worker_id, ValidationJobState.COMPLETED)
+
+
+async def run_worker(stop_event: asyncio.Event) -> None:
+    """
+    Claims and runs up to "concurrency" jobs at a time until stop_event is set, then waits for running jobs to finish.
+    """
+    config = settings.validation_queue_config
+    executor = create_validation_executor(config.concurrency)
+    if settings.validation_pool_config.prestart:
+        prestart_validation_executor(executor, config.concurrency)
+    running = set()
+    logger.info(f"Validation worker {worker_id} started.")
+    try:
+        while not stop_event.is_set():
+            while len(running) < config.concurrency:
+                async with SessionLocal() as session:
+                    job = await job_repo.claim_validation_job(session, worker_id)
+                if not job:
+                    break
+                logger.info(f"Claimed validation job {job.id} for submission {job.submission}.")
+                running.add(asyncio.create_task(run_job(job, executor)))
+
+            if running:
+                done, running = await asyncio.wait(
+                    running, timeout=config.poll_secs, return_when=asyncio.FIRST_COMPLETED
+                )
+                errors = [t.exception() for t in done if t.exception()]
+                for e in errors:
+                    logger.error("Validation job failed unexpectedly.", exc_info=e)
+                if any(isinstance(e, BrokenProcessPool) for e in errors):
+                    executor.shutdown(wait=False)
+                    executor = create_validation_executor(config.concurrency)
+            else:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), config.poll_secs)
+                except asyncio.TimeoutError:
+                    pass
+        if running:
+            logger.info(f"Waiting for {len(running)} running validation jobs to finish.")
+            await asyncio.wait(running)
+    finally:
+        executor.shutdown()
+        logger.info(f"Validation worker {worker_id} stopped.")
+
+
+async def main() -> None:
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    await run_worker(stop_event)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -12,12 +12,15 @@ from regtech_api_commons.models.auth import AuthenticatedUser
 from starlette.authentication import AuthCredentials, UnauthenticatedUser
 
 from sbl_filing_api.entities.models.model_enums import UserActionType
+from sbl_filing_api.entities.repos import submission_repo as repo
 
 
 @pytest.fixture
 def app_fixture(mocker: MockerFixture) -> FastAPI:
     from sbl_filing_api.main import app
+    from sbl_filing_api.routers.dependencies import lei_relation_cache
 
+    lei_relation_cache.invalidate()
     return app
 
 
@@ -50,6 +53,7 @@ def unauthed_user_mock(auth_mock: Mock) -> Mock:
 
 @pytest.fixture
 def get_filing_period_mock(mocker: MockerFixture) -> Mock:
+    repo.reference_data_cache.invalidate()
     mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_filing_periods")
     mock.return_value = [
         FilingPeriodDAO(
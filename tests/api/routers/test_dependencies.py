@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from pytest_mock import MockerFixture
+from regtech_api_commons.api.exceptions import RegTechHttpException
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.routers import dependencies
+from sbl_filing_api.routers.dependencies import verify_user_lei_relation
+
+
+class TestVerifyUserLeiRelation:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        dependencies.lei_relation_cache.invalidate()
+        dependencies.lei_relation_cache.stats.reset()
+
+    @pytest.fixture
+    def check_mock(self, mocker: MockerFixture) -> AsyncMock:
+        return mocker.patch.object(dependencies.dependencies, "verify_user_lei_relation", AsyncMock())
+
+    def request(self, method: str = "GET", user_id: str = "user-1") -> Mock:
+        request = Mock(method=method)
+        request.user.is_authenticated = True
+        request.user.id = user_id
+        return request
+
+    async def test_allowed_is_cached(self, check_mock: AsyncMock):
+        await verify_user_lei_relation(self.request(), "1234567890ABCDEFGH00")
+        await verify_user_lei_relation(self.request(), "1234567890ABCDEFGH00")
+        await verify_user_lei_relation(self.request(user_id="user-2"), "1234567890ABCDEFGH00")
+
+        assert check_mock.call_count == 2
+        assert dependencies.lei_relation_cache.stats.hits == 1
+        assert dependencies.lei_relation_cache.stats.misses == 2
+
+    async def test_denied_is_cached(self, check_mock: AsyncMock):
+        check_mock.side_effect = RegTechHttpException(403, name="Request Forbidden", detail="Not associated.")
+
+        for _ in range(2):
+            with pytest.raises(RegTechHttpException) as e:
+                await verify_user_lei_relation(self.request(), "1234567890ZXWVUTSR00")
+            assert e.value.status_code == 403
+            assert e.value.name == "Request Forbidden"
+            assert e.value.detail == "Not associated."
+        check_mock.assert_called_once()
+
+    async def test_other_errors_are_not_cached(self, check_mock: AsyncMock):
+        check_mock.side_effect = [RegTechHttpException(500, name="Server Error", detail="User FI API down."), None]
+
+        with pytest.raises(RegTechHttpException):
+            await verify_user_lei_relation(self.request(), "1234567890ABCDEFGH00")
+        await verify_user_lei_relation(self.request(), "1234567890ABCDEFGH00")
+        assert check_mock.call_count == 2
+
+    async def test_bypass_writes(self, mocker: MockerFixture, check_mock: AsyncMock):
+        mocker.patch.object(settings.lei_relation_cache_config, "bypass_writes", True)
+
+        await verify_user_lei_relation(self.request(), "1234567890ABCDEFGH00")
+        await verify_user_lei_relation(self.request(method="POST"), "1234567890ABCDEFGH00")
+        await verify_user_lei_relation(self.request(method="POST"), "1234567890ABCDEFGH00")
+        await verify_user_lei_relation(self.request(), "1234567890ABCDEFGH00")
+
+        assert check_mock.call_count == 3
+
+    async def test_blocking_check(self, mocker: MockerFixture):
+        check_mock = mocker.patch.object(dependencies.dependencies, "verify_user_lei_relation", Mock())
+        request = self.request()
+
+        await verify_user_lei_relation(request, "1234567890ABCDEFGH00")
+        check_mock.assert_called_once_with(request, "1234567890ABCDEFGH00")
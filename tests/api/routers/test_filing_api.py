@@ -1,5 +1,6 @@
 import asyncio
 import datetime
+import threading
 from http import HTTPStatus
 import pytest
 
@@ -10,10 +11,13 @@ from unittest.mock import ANY, Mock, AsyncMock
 
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
+from regtech_api_commons.models.auth import AuthenticatedUser
+from starlette.authentication import AuthCredentials
 from pytest_mock import MockerFixture
 
 from sbl_filing_api.entities.models.dao import (
     SubmissionDAO,
+    SubmissionProgressDAO,
     SubmissionState,
     FilingTaskState,
     ContactInfoDAO,
@@ -21,8 +25,9 @@ from sbl_filing_api.entities.models.dao import (
     UserActionDAO,
 )
 from sbl_filing_api.entities.models.dto import ContactInfoDTO
-from sbl_filing_api.entities.models.model_enums import UserActionType
-from sbl_filing_api.services import submission_processor
+from sbl_filing_api.entities.models.model_enums import ExportFormat, SubmissionProgressPhase, UserActionType
+from sbl_filing_api.entities.repos import submission_repo as repo
+from sbl_filing_api.services import submission_storage
 from sbl_filing_api.services.multithread_handler import handle_submission
 
 from sqlalchemy.exc import IntegrityError
@@ -45,6 +50,143 @@ class TestFilingApi:
         assert res.status_code == 200
         assert len(res.json()) == 1
         assert res.json()[0]["code"] == "2024"
+        assert res.headers["Cache-Control"] == "private, max-age=60, must-revalidate"
+        assert res.headers["ETag"].startswith('W/"')
+
+    def test_get_periods_not_modified(
+        self, mocker: MockerFixture, app_fixture: FastAPI, get_filing_period_mock: Mock, authed_user_mock: Mock
+    ):
+        client = TestClient(app_fixture)
+        etag = client.get("/v1/filing/periods").headers["ETag"]
+
+        res = client.get("/v1/filing/periods", headers={"If-None-Match": f'"other", {etag.removeprefix("W/")}'})
+        assert res.status_code == 304
+        assert res.headers["ETag"] == etag
+        assert res.content == b""
+        get_filing_period_mock.assert_called_once()
+
+        res = client.get("/v1/filing/periods", headers={"If-None-Match": '"other"'})
+        assert res.status_code == 200
+        assert res.headers["ETag"] == etag
+
+        repo.reference_data_cache.invalidate()
+        get_filing_period_mock.return_value[0].description = "Updated Filing Period 2024"
+        res = client.get("/v1/filing/periods", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.headers["ETag"] != etag
+        assert res.json()[0]["description"] == "Updated Filing Period 2024"
+
+    def test_export_period_filings(
+        self, mocker: MockerFixture, app_fixture: FastAPI, get_filing_period_mock: Mock, auth_mock: Mock
+    ):
+        export_mock = mocker.patch("sbl_filing_api.services.filing_export.export_period_filings")
+        export_mock.return_value = iter(["id,lei\n", "1,1234567890ABCDEFGH00\n"])
+        claims = {"preferred_username": "admin", "sub": "123456-7890-ABCDEF-GHIJ"}
+        auth_mock.return_value = (AuthCredentials(["authenticated"]), AuthenticatedUser.from_claim(claims))
+        client = TestClient(app_fixture)
+
+        res = client.get("/v1/filing/periods/2024/filings")
+        assert res.status_code == 403
+
+        auth_mock.return_value = (
+            AuthCredentials(["authenticated", "query-groups", "manage-users"]),
+            AuthenticatedUser.from_claim(claims),
+        )
+        res = client.get(
+            "/v1/filing/periods/2024/filings",
+            params={
+                "format": "csv",
+                "signed": "false",
+                "latest_submission_state": ["VALIDATION_SUCCESSFUL", "VALIDATION_WITH_WARNINGS"],
+            },
+        )
+        assert res.status_code == 200
+        assert res.headers["Content-Type"].startswith("text/csv")
+        assert res.text == "id,lei\n1,1234567890ABCDEFGH00\n"
+        export_mock.assert_called_once_with(
+            "2024",
+            ExportFormat.CSV,
+            False,
+            [SubmissionState.VALIDATION_SUCCESSFUL, SubmissionState.VALIDATION_WITH_WARNINGS],
+        )
+
+        res = client.get("/v1/filing/periods/2025/filings")
+        assert res.status_code == 404
+        assert res.json()["error_detail"] == "There is no Filing Period 2025, unable to export its filings."
+
+    def test_get_filings_status(
+        self, mocker: MockerFixture, app_fixture: FastAPI, get_filing_period_mock: Mock, auth_mock: Mock
+    ):
+        status_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_filings_status")
+        status_mock.return_value = [
+            {
+                "lei": "1234567890ABCDEFGH00",
+                "filing_id": 1,
+                "signed": True,
+                "confirmation_id": "1234567890ABCDEFGH00-2024-1-1716900000.0",
+                "latest_submission_id": 1,
+                "latest_submission_state": SubmissionState.SUBMISSION_ACCEPTED,
+                "latest_submission_time": dt(2024, 5, 28, 12, 30),
+            },
+            {"lei": "1234567890ZXWVUTSR00"},
+        ]
+        claims = {"preferred_username": "admin", "sub": "123456-7890-ABCDEF-GHIJ"}
+        auth_mock.return_value = (
+            AuthCredentials(["authenticated", "query-groups", "manage-users"]),
+            AuthenticatedUser.from_claim(claims),
+        )
+        client = TestClient(app_fixture)
+
+        res = client.post(
+            "/v1/filing/periods/2024/filings/status", json={"leis": ["1234567890ABCDEFGH00", "1234567890ZXWVUTSR00"]}
+        )
+        status_mock.assert_called_once_with(ANY, "2024", ["1234567890ABCDEFGH00", "1234567890ZXWVUTSR00"])
+        assert res.status_code == 200
+        assert res.json()[0]["signed"] is True
+        assert res.json()[0]["latest_submission_state"] == "SUBMISSION_ACCEPTED"
+        assert res.json()[1] == {
+            "lei": "1234567890ZXWVUTSR00",
+            "filing_id": None,
+            "signed": False,
+            "confirmation_id": None,
+            "latest_submission_id": None,
+            "latest_submission_state": None,
+            "latest_submission_time": None,
+        }
+
+        res = client.post("/v1/filing/periods/2024/filings/status", json={"leis": []})
+        assert res.status_code == 422
+
+        res = client.post("/v1/filing/periods/2025/filings/status", json={"leis": ["1234567890ABCDEFGH00"]})
+        assert res.status_code == 404
+
+        auth_mock.return_value = (AuthCredentials(["authenticated"]), AuthenticatedUser.from_claim(claims))
+        res = client.post("/v1/filing/periods/2024/filings/status", json={"leis": ["1234567890ABCDEFGH00"]})
+        assert res.status_code == 403
+
+    def test_get_validation_cache_stats(
+        self, mocker: MockerFixture, app_fixture: FastAPI, get_filing_period_mock: Mock, auth_mock: Mock
+    ):
+        stats_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_validation_cache_stats")
+        stats_mock.return_value = {"filing_period": "2024", "hits": 3, "misses": 1, "hit_rate": 0.75}
+        claims = {"preferred_username": "admin", "sub": "123456-7890-ABCDEF-GHIJ"}
+        auth_mock.return_value = (
+            AuthCredentials(["authenticated", "query-groups", "manage-users"]),
+            AuthenticatedUser.from_claim(claims),
+        )
+        client = TestClient(app_fixture)
+
+        res = client.get("/v1/filing/periods/2024/validation_cache_stats")
+        stats_mock.assert_called_once_with(ANY, "2024")
+        assert res.status_code == 200
+        assert res.json() == {"filing_period": "2024", "hits": 3, "misses": 1, "hit_rate": 0.75}
+
+        res = client.get("/v1/filing/periods/2025/validation_cache_stats")
+        assert res.status_code == 404
+
+        auth_mock.return_value = (AuthCredentials(["authenticated"]), AuthenticatedUser.from_claim(claims))
+        res = client.get("/v1/filing/periods/2024/validation_cache_stats")
+        assert res.status_code == 403
 
     def test_unauthed_get_filing(self, app_fixture: FastAPI, get_filing_mock: Mock):
         client = TestClient(app_fixture)
@@ -63,6 +205,38 @@ class TestFilingApi:
         res = client.get("/v1/filing/institutions/1234567890ABCDEFGH00/filings/2024/")
         assert res.status_code == 204
 
+    def test_get_filing_not_modified(
+        self, mocker: MockerFixture, app_fixture: FastAPI, get_filing_mock: Mock, authed_user_mock: Mock
+    ):
+        version_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_filing_version")
+        version_mock.return_value = (1, 3)
+        get_filing_mock.return_value.version = 3
+        client = TestClient(app_fixture)
+
+        res = client.get("/v1/filing/institutions/1234567890ABCDEFGH00/filings/2024/")
+        assert res.status_code == 200
+        assert res.headers["ETag"] == 'W/"filing-1-3"'
+        assert res.headers["Cache-Control"] == "private, no-cache"
+        version_mock.assert_not_called()
+
+        get_filing_mock.reset_mock()
+        res = client.get(
+            "/v1/filing/institutions/1234567890ABCDEFGH00/filings/2024/", headers={"If-None-Match": 'W/"filing-1-3"'}
+        )
+        version_mock.assert_called_with(ANY, "1234567890ABCDEFGH00", "2024")
+        get_filing_mock.assert_not_called()
+        assert res.status_code == 304
+        assert res.headers["ETag"] == 'W/"filing-1-3"'
+
+        version_mock.return_value = (1, 4)
+        get_filing_mock.return_value.version = 4
+        res = client.get(
+            "/v1/filing/institutions/1234567890ABCDEFGH00/filings/2024/", headers={"If-None-Match": 'W/"filing-1-3"'}
+        )
+        assert res.status_code == 200
+        assert res.headers["ETag"] == 'W/"filing-1-4"'
+        assert res.json()["lei"] == "1234567890ABCDEFGH00"
+
     def test_unauthed_post_filing(self, app_fixture: FastAPI):
         client = TestClient(app_fixture)
         res = client.post("/v1/filing/institutions/ZXWVUTSRQP/filings/2024/")
@@ -154,7 +328,7 @@ class TestFilingApi:
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions")
         results = res.json()
-        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024")
+        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024", limit=None, after=None, fields=None)
         assert res.status_code == 200
         assert len(results) == 1
         assert results[0]["state"] == SubmissionState.SUBMISSION_UPLOADED
@@ -164,10 +338,72 @@ class TestFilingApi:
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions")
         results = res.json()
-        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024")
+        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024", limit=None, after=None, fields=None)
         assert res.status_code == 200
         assert len(results) == 0
 
+    async def test_get_submissions_paginated(self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock):
+        submitter = UserActionDAO(
+            id=2,
+            user_id="123456-7890-ABCDEF-GHIJ",
+            user_name="test submitter",
+            user_email="test@local.host",
+            action_type=UserActionType.SUBMIT,
+            timestamp=datetime.datetime.now(),
+        )
+        submissions = [
+            SubmissionDAO(
+                id=i,
+                filing=1,
+                state=SubmissionState.VALIDATION_WITH_ERRORS,
+                submission_time=datetime.datetime(2024, 1, 1, 12, i),
+                filename=f"file{i}.csv",
+                submitter_id=2,
+                submitter=submitter,
+            )
+            for i in range(1, 4)
+        ]
+        mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_submissions")
+        mock.return_value = submissions
+
+        client = TestClient(app_fixture)
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions?limit=2")
+        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024", limit=3, after=None, fields=None)
+        assert res.status_code == 200
+        assert [s["id"] for s in res.json()] == [1, 2]
+        cursor = res.headers["X-Next-Cursor"]
+
+        mock.return_value = submissions[2:]
+        res = client.get(
+            f"/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions?limit=2&cursor={cursor}"
+        )
+        mock.assert_called_with(
+            ANY, "1234567890ZXWVUTSR00", "2024", limit=3, after=(datetime.datetime(2024, 1, 1, 12, 2), 2), fields=None
+        )
+        assert [s["id"] for s in res.json()] == [3]
+        assert "X-Next-Cursor" not in res.headers
+
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions?cursor=bad")
+        assert res.status_code == 400
+        assert res.json()["error_detail"] == "bad is not a valid submissions cursor."
+
+    async def test_get_submissions_fields(self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock):
+        mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_submissions")
+        mock.return_value = [SubmissionDAO(id=1, filing=1, state=SubmissionState.VALIDATION_SUCCESSFUL)]
+
+        client = TestClient(app_fixture)
+        res = client.get(
+            "/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions?fields=state,total_records"
+        )
+        mock.assert_called_with(
+            ANY, "1234567890ZXWVUTSR00", "2024", limit=None, after=None, fields={"id", "state", "total_records"}
+        )
+        assert res.status_code == 200
+        assert res.json() == [{"id": 1, "state": "VALIDATION_SUCCESSFUL", "total_records": None}]
+
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions?fields=state,file_hash")
+        assert res.status_code == 400
+
     def test_unauthed_get_latest_submissions(
         self, mocker: MockerFixture, app_fixture: FastAPI, get_filing_period_mock: Mock
     ):
@@ -187,6 +423,7 @@ class TestFilingApi:
             timestamp=datetime.datetime.now(),
         )
 
+        exists_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.filing_exists", return_value=True)
         mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_latest_submission")
         mock.return_value = SubmissionDAO(
             filing=1,
@@ -201,7 +438,7 @@ class TestFilingApi:
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/latest")
         result = res.json()
-        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024")
+        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024", load_results=True)
         assert res.status_code == 200
         assert result["state"] == SubmissionState.VALIDATION_IN_PROGRESS
 
@@ -209,13 +446,14 @@ class TestFilingApi:
         mock.return_value = []
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/latest")
-        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024")
+        mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024", load_results=True)
         assert res.status_code == 204
 
         # verify Filing Not Found RegTechHttpException returned when filing does not exist
-        get_filing_mock.return_value = None
+        exists_mock.return_value = False
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/latest")
+        exists_mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024")
         assert res.status_code == 404
 
     def test_unauthed_get_submission_by_id(self, mocker: MockerFixture, app_fixture: FastAPI):
@@ -247,12 +485,109 @@ class TestFilingApi:
         client = TestClient(app_fixture)
 
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1")
-        mock.assert_called_with(ANY, 1)
+        mock.assert_called_with(ANY, 1, load_results=True)
         assert res.status_code == 200
 
         mock.return_value = None
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1")
+        mock.assert_called_with(ANY, 1, load_results=True)
+        assert res.status_code == 404
+
+    async def test_get_submission_not_modified(
+        self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock
+    ):
+        mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_submission")
+        version_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_submission_version")
+        version_mock.return_value = 2
+        client = TestClient(app_fixture)
+
+        res = client.get(
+            "/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1",
+            headers={"If-None-Match": 'W/"submission-1-2"'},
+        )
+        version_mock.assert_called_with(ANY, 1)
+        mock.assert_not_called()
+        assert res.status_code == 304
+        assert res.headers["ETag"] == 'W/"submission-1-2"'
+        assert res.headers["Cache-Control"] == "private, no-cache"
+
+        version_mock.return_value = None
+        mock.return_value = None
+        res = client.get(
+            "/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1",
+            headers={"If-None-Match": 'W/"submission-1-2"'},
+        )
+        assert res.status_code == 404
+
+    async def test_get_validation_results(self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock):
+        mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_validation_results")
+        mock.return_value = {"syntax_errors": {"total_count": 0}}
+
+        client = TestClient(app_fixture)
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/validation-results")
         mock.assert_called_with(ANY, 1)
+        assert res.status_code == 200
+        assert res.json() == {"syntax_errors": {"total_count": 0}}
+
+        mock.return_value = None
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/validation-results")
+        assert res.status_code == 404
+
+    async def test_get_submission_progress(self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock):
+        mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_submission_progress")
+        mock.return_value = SubmissionProgressDAO(
+            submission=1,
+            phase=SubmissionProgressPhase.VALIDATING,
+            rows_processed=5000,
+            total_rows=None,
+            change_timestamp=datetime.datetime.now(),
+        )
+
+        client = TestClient(app_fixture)
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/progress")
+        mock.assert_called_with(ANY, 1)
+        assert res.status_code == 200
+        assert res.json()["phase"] == SubmissionProgressPhase.VALIDATING
+        assert res.json()["rows_processed"] == 5000
+        assert res.headers["Retry-After"] == "2"
+
+        mock.return_value.phase = SubmissionProgressPhase.COMPLETED
+        mock.return_value.total_rows = 5000
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/progress")
+        assert res.status_code == 200
+        assert res.json()["total_rows"] == 5000
+        assert "Retry-After" not in res.headers
+
+        mock.return_value = None
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/progress")
+        assert res.status_code == 404
+        assert res.json()["error_detail"] == "Submission 1 has no validation progress."
+
+    def test_get_submission_events(self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock):
+        state_mock = mocker.patch(
+            "sbl_filing_api.entities.repos.submission_repo.get_submission_state",
+            return_value=SubmissionState.VALIDATION_IN_PROGRESS,
+        )
+        connect_mock = mocker.patch("sbl_filing_api.services.submission_events.broker.connect", AsyncMock())
+
+        async def events(submission_id):
+            yield f"event: submission_state\ndata: {submission_id}\n\n"
+
+        mocker.patch("sbl_filing_api.services.submission_events.submission_state_events", side_effect=events)
+
+        client = TestClient(app_fixture)
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/events")
+        state_mock.assert_called_with(ANY, 1)
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/event-stream")
+        assert res.text == "event: submission_state\ndata: 1\n\n"
+
+        connect_mock.side_effect = OSError("Connection refused")
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/events")
+        assert res.status_code == 503
+
+        state_mock.return_value = None
+        res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/1/events")
         assert res.status_code == 404
 
     def test_authed_upload_file(
@@ -281,16 +616,24 @@ class TestFilingApi:
             submitter=user_action_submit,
         )
 
-        mock_validate_file = mocker.patch("sbl_filing_api.services.submission_processor.validate_file_processable")
+        mock_validate_file = mocker.patch("sbl_filing_api.services.submission_storage.validate_file_processable")
         mock_validate_file.return_value = None
 
-        mock_upload = mocker.patch("sbl_filing_api.services.submission_processor.upload_to_storage")
-        mock_upload.return_value = None
+        uploaded_content = []
+        upload_threads = []
+        mock_upload = mocker.patch("sbl_filing_api.services.submission_storage.upload_to_storage")
+
+        def upload(period_code, lei, file_identifier, content, extension):
+            upload_threads.append(threading.current_thread().name)
+            uploaded_content.append(content.read())
+
+        mock_upload.side_effect = upload
 
         mock_get_loop = mocker.patch("asyncio.get_event_loop")
         mock_event_loop = Mock()
         mock_get_loop.return_value = mock_event_loop
         mock_event_loop.run_in_executor.return_value = asyncio.Future()
+        mock_check_future = mocker.patch("sbl_filing_api.routers.filing.check_future", Mock())
 
         async_mock = AsyncMock(return_value=return_sub)
         mock_add_submission = mocker.patch(
@@ -307,10 +650,19 @@ class TestFilingApi:
 
         res = client.post("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions", files=files)
         mock_add_submission.assert_called_with(ANY, 1, "submission.csv", user_action_submit.id)
+        mock_upload.assert_called_with("2024", "1234567890ZXWVUTSR00", 1, ANY, "csv")
+        assert uploaded_content == [open(submission_csv, "rb").read()]
+        assert upload_threads == ["AnyIO worker thread"]
         mock_event_loop.run_in_executor.assert_called_with(
-            ANY, handle_submission, "2024", "1234567890ZXWVUTSR00", return_sub, open(submission_csv, "rb").read(), ANY
+            ANY,
+            handle_submission,
+            "2024",
+            "1234567890ZXWVUTSR00",
+            return_sub,
+            "upload/2024/1234567890ZXWVUTSR00/1.csv",
         )
-        assert mock_event_loop.run_in_executor.call_args.args[6]["continue"]
+        mock_check_future.assert_called_with(mock_event_loop.run_in_executor.return_value, 1)
+        mock_event_loop.create_task.assert_called_with(mock_check_future.return_value)
         assert mock_update_submission.call_args.args[1].state == SubmissionState.SUBMISSION_UPLOADED
         assert res.status_code == 200
         assert res.json()["id"] == 1
@@ -329,6 +681,51 @@ class TestFilingApi:
             == "There is no Filing for LEI 1234567890ABCDEFGH00 in period 2024, unable to submit file."
         )
 
+    def test_upload_file_queued(
+        self,
+        mocker: MockerFixture,
+        app_fixture: FastAPI,
+        authed_user_mock: Mock,
+        submission_csv: str,
+        get_filing_mock: Mock,
+    ):
+        return_sub = SubmissionDAO(
+            id=1,
+            filing=1,
+            state=SubmissionState.SUBMISSION_UPLOADED,
+            filename="submission.csv",
+            submitter_id=1,
+            submitter=UserActionDAO(
+                id=1,
+                user_id="123456-7890-ABCDEF-GHIJ",
+                user_name="test submitter",
+                user_email="test@local.host",
+                action_type=UserActionType.SUBMIT,
+                timestamp=datetime.datetime.now(),
+            ),
+        )
+        mocker.patch("sbl_filing_api.routers.filing.settings.validation_queue_config.enabled", True)
+        mocker.patch("sbl_filing_api.services.submission_storage.validate_file_processable")
+        mocker.patch("sbl_filing_api.services.submission_storage.upload_to_storage", return_value="abc123")
+        mock_get_loop = mocker.patch("asyncio.get_event_loop")
+        mocker.patch("sbl_filing_api.entities.repos.submission_repo.add_submission", return_value=return_sub)
+        mock_update_submission = mocker.patch(
+            "sbl_filing_api.entities.repos.submission_repo.update_submission", return_value=return_sub
+        )
+        mocker.patch("sbl_filing_api.entities.repos.submission_repo.add_user_action", return_value=return_sub.submitter)
+        mock_enqueue = mocker.patch("sbl_filing_api.entities.repos.validation_job_repo.enqueue_validation_job")
+
+        files = {"file": ("submission.csv", open(submission_csv, "rb"))}
+        client = TestClient(app_fixture)
+
+        res = client.post("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions", files=files)
+        assert res.status_code == 200
+        mock_enqueue.assert_called_once_with(
+            ANY, 1, "1234567890ZXWVUTSR00", "2024", "upload/2024/1234567890ZXWVUTSR00/1.csv"
+        )
+        assert not mock_get_loop.return_value.run_in_executor.called
+        assert mock_update_submission.call_args.args[1].file_hash == "abc123"
+
     def test_unauthed_upload_file(self, mocker: MockerFixture, app_fixture: FastAPI, submission_csv: str):
         files = {"file": ("submission.csv", open(submission_csv, "rb"))}
         client = TestClient(app_fixture)
@@ -338,7 +735,7 @@ class TestFilingApi:
     def test_upload_file_invalid_type(
         self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock, submission_csv: str
     ):
-        mock = mocker.patch("sbl_filing_api.services.submission_processor.validate_file_processable")
+        mock = mocker.patch("sbl_filing_api.services.submission_storage.validate_file_processable")
         mock.side_effect = HTTPException(HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
         client = TestClient(app_fixture)
         files = {"file": ("submission.csv", open(submission_csv, "rb"))}
@@ -348,7 +745,7 @@ class TestFilingApi:
     def test_upload_file_invalid_size(
         self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock, submission_csv: str
     ):
-        mock = mocker.patch("sbl_filing_api.services.submission_processor.validate_file_processable")
+        mock = mocker.patch("sbl_filing_api.services.submission_storage.validate_file_processable")
         mock.side_effect = HTTPException(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
         client = TestClient(app_fixture)
         files = {"file": ("submission.csv", open(submission_csv, "rb"))}
@@ -370,13 +767,13 @@ class TestFilingApi:
             filename="submission.csv",
         )
 
-        mock_validate_file = mocker.patch("sbl_filing_api.services.submission_processor.validate_file_processable")
+        mock_validate_file = mocker.patch("sbl_filing_api.services.submission_storage.validate_file_processable")
         mock_validate_file.return_value = None
 
         async_mock = AsyncMock(return_value=return_sub)
         mocker.patch("sbl_filing_api.entities.repos.submission_repo.add_submission", side_effect=async_mock)
 
-        mock_upload = mocker.patch("sbl_filing_api.services.submission_processor.upload_to_storage")
+        mock_upload = mocker.patch("sbl_filing_api.services.submission_storage.upload_to_storage")
         mock_upload.return_value = None
 
         mock_update_submission = mocker.patch(
@@ -428,13 +825,13 @@ class TestFilingApi:
 
         log_mock = mocker.patch("sbl_filing_api.routers.filing.logger.error")
 
-        mock_validate_file = mocker.patch("sbl_filing_api.services.submission_processor.validate_file_processable")
+        mock_validate_file = mocker.patch("sbl_filing_api.services.submission_storage.validate_file_processable")
         mock_validate_file.return_value = None
 
         async_mock = AsyncMock(return_value=return_sub)
         mocker.patch("sbl_filing_api.entities.repos.submission_repo.add_submission", side_effect=async_mock)
 
-        mock_upload = mocker.patch("sbl_filing_api.services.submission_processor.upload_to_storage")
+        mock_upload = mocker.patch("sbl_filing_api.services.submission_storage.upload_to_storage")
         mock_upload.return_value = None
 
         mocker.patch(
@@ -955,6 +1352,7 @@ class TestFilingApi:
     async def test_get_latest_sub_report(
         self, mocker: MockerFixture, app_fixture: FastAPI, get_filing_mock: Mock, authed_user_mock: Mock
     ):
+        exists_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.filing_exists", return_value=True)
         sub_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_latest_submission")
         sub_mock.return_value = SubmissionDAO(
             id=1,
@@ -974,13 +1372,13 @@ class TestFilingApi:
         )
 
         file_content = "Test"
-        file_mock = mocker.patch("sbl_filing_api.services.submission_processor.get_from_storage")
+        file_mock = mocker.patch("sbl_filing_api.services.submission_storage.get_from_storage")
         file_mock.return_value = [c for c in file_content]
 
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/latest/report")
         sub_mock.assert_called_with(ANY, "1234567890ZXWVUTSR00", "2024")
-        file_mock.assert_called_with("2024", "1234567890ZXWVUTSR00", "1" + submission_processor.REPORT_QUALIFIER)
+        file_mock.assert_called_with("2024", "1234567890ZXWVUTSR00", "1" + submission_storage.REPORT_QUALIFIER)
         assert res.status_code == 200
         assert res.text == "Test"
         assert res.headers["content-type"] == "text/csv; charset=utf-8"
@@ -1015,10 +1413,11 @@ class TestFilingApi:
         assert res.status_code == 404
 
         # verify Filing Not Found RegTechHttpException returned when filing does not exist
-        get_filing_mock.return_value = None
+        exists_mock.return_value = False
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/latest/report")
         assert res.status_code == 404
+        assert res.json()["error_detail"].startswith("There is no Filing for LEI 1234567890ZXWVUTSR00")
 
     async def test_get_sub_report(self, mocker: MockerFixture, app_fixture: FastAPI, authed_user_mock: Mock):
         sub_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.get_submission")
@@ -1040,13 +1439,13 @@ class TestFilingApi:
         )
 
         file_content = "Test"
-        file_mock = mocker.patch("sbl_filing_api.services.submission_processor.get_from_storage")
+        file_mock = mocker.patch("sbl_filing_api.services.submission_storage.get_from_storage")
         file_mock.return_value = [c for c in file_content]
 
         client = TestClient(app_fixture)
         res = client.get("/v1/filing/institutions/1234567890ZXWVUTSR00/filings/2024/submissions/2/report")
         sub_mock.assert_called_with(ANY, 2)
-        file_mock.assert_called_with("2024", "1234567890ZXWVUTSR00", "2" + submission_processor.REPORT_QUALIFIER)
+        file_mock.assert_called_with("2024", "1234567890ZXWVUTSR00", "2" + submission_storage.REPORT_QUALIFIER)
         assert res.status_code == 200
         assert res.text == "Test"
         assert res.headers["content-type"] == "text/csv; charset=utf-8"
@@ -1,4 +1,8 @@
-from sbl_filing_api.config import Settings
+import pytest
+
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+from sbl_filing_api.config import CsvEngine, Settings
 
 
 def test_postgres_dsn_building():
@@ -18,6 +22,11 @@ def test_default_maxes():
     assert settings.max_validation_errors == 1000000
     assert settings.max_json_records == 10000
     assert settings.max_json_group_size == 0
+    assert settings.validation_chunk_size == 0
+    assert settings.csv_engine == CsvEngine.C
+    assert settings.validation_progress_interval_secs == 2
+    assert settings.reference_data_cache_ttl_secs == 300
+    assert settings.reference_data_max_age_secs == 60
 
 
 def test_default_server_configs():
@@ -27,3 +36,26 @@ def test_default_server_configs():
     assert settings.server_config.reload is False
     assert settings.server_config.time_out == 65
     assert settings.server_config.port == 8888
+
+
+def test_default_fs_transfer_configs():
+    settings = Settings()
+    assert settings.fs_upload_config.multipart is True
+    assert settings.fs_upload_config.part_size == 8 * (1024**2)
+    assert settings.fs_upload_config.max_concurrency == 4
+
+
+def test_default_db_pool_configs():
+    settings = Settings()
+    assert settings.db_pool_enabled is True
+    assert settings.db_pool_size == 5
+    assert settings.db_max_overflow == 10
+    assert settings.db_pool_timeout == 30
+    assert settings.db_pool_recycle == 1800
+    assert settings.db_pool_pre_ping is True
+
+
+def test_pyarrow_csv_engine_requires_pyarrow(mocker: MockerFixture):
+    mocker.patch("importlib.util.find_spec", return_value=None)
+    with pytest.raises(ValidationError):
+        Settings(csv_engine="pyarrow")
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parents[2] / "src"
+# generous, so it only trips when something heavy is imported again, not on a slow CI runner
+API_IMPORT_TIME_LIMIT_SECS = 5
+VALIDATION_ONLY_PACKAGES = ["pandas", "regtech_data_validator"]
+
+
+def import_times(module: str) -> dict[str, float]:
+    """
+    Cumulative import time in seconds of every module imported by a fresh interpreter importing the given one,
+    from python -X importtime.
+    """
+    python_path = os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": python_path},
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative_us, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(cumulative_us) / 1e6
+    return times
+
+
+class TestImportTime:
+    def test_api_import_time(self):
+        times = import_times("sbl_filing_api.main")
+
+        assert times["sbl_filing_api.main"] < API_IMPORT_TIME_LIMIT_SECS
+        assert [m for m in times if m.split(".")[0] in VALIDATION_ONLY_PACKAGES] == []
@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import FastAPI
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from sbl_filing_api import cli, main, migrations
+from sbl_filing_api.config import settings
+
+
+class TestStartup:
+    async def test_lifespan_runs_migrations(self, mocker: MockerFixture):
+        run_mock = mocker.patch.object(main, "run_migrations")
+        verify_mock = mocker.patch.object(main, "verify_schema_current", AsyncMock())
+        mocker.patch.object(settings.validation_pool_config, "prestart", True)
+        mocker.patch.object(settings.validation_pool_config, "max_workers", 2)
+        prestart_mock = mocker.patch.object(main, "prestart_validation_executor")
+
+        async with main.lifespan(FastAPI()):
+            run_mock.assert_called_once()
+            verify_mock.assert_not_called()
+            prestart_mock.assert_called_once_with(main.validation_executor, 2)
+
+    async def test_lifespan_verifies_schema(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "run_migrations_on_startup", False)
+        run_mock = mocker.patch.object(main, "run_migrations")
+        verify_mock = mocker.patch.object(main, "verify_schema_current", AsyncMock(side_effect=RuntimeError("behind")))
+
+        with pytest.raises(RuntimeError, match="behind"):
+            async with main.lifespan(FastAPI()):
+                pass
+        verify_mock.assert_called_once_with(main.engine)
+        run_mock.assert_not_called()
+
+    async def test_verify_schema_current(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "db_schema", "main")
+        engine = create_async_engine("sqlite+aiosqlite://")
+        head = migrations.get_head_revisions()
+        assert len(head) == 1
+
+        with pytest.raises(RuntimeError, match="at revision none"):
+            await migrations.verify_schema_current(engine)
+
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            await conn.execute(text("INSERT INTO alembic_version VALUES ('f41d7b2c8e90')"))
+        with pytest.raises(RuntimeError, match="at revision f41d7b2c8e90"):
+            await migrations.verify_schema_current(engine)
+
+        async with engine.begin() as conn:
+            await conn.execute(text("UPDATE alembic_version SET version_num = :head"), {"head": next(iter(head))})
+        await migrations.verify_schema_current(engine)
+        await engine.dispose()
+
+    def test_cli(self, mocker: MockerFixture):
+        run_mock = mocker.patch.object(cli.migrations, "run_migrations")
+        worker_mock = mocker.patch.object(cli.validation_worker, "main", Mock())
+        # asyncio.run would close the event loop the rest of the tests run on
+        asyncio_run_mock = mocker.patch.object(cli.asyncio, "run")
+
+        cli.main(["migrate"])
+        run_mock.assert_called_once()
+        asyncio_run_mock.assert_not_called()
+
+        cli.main(["worker"])
+        asyncio_run_mock.assert_called_once_with(worker_mock.return_value)
+
+        with pytest.raises(SystemExit):
+            cli.main([])
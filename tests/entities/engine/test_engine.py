@@ -0,0 +1,34 @@
+from pytest_mock import MockerFixture
+from sqlalchemy.pool import NullPool
+
+from sbl_filing_api.entities.engine import engine
+
+
+def test_pool_options(mocker: MockerFixture):
+    mocker.patch.multiple(
+        engine.settings,
+        db_pool_enabled=True,
+        db_pool_size=20,
+        db_max_overflow=5,
+        db_pool_timeout=10,
+        db_pool_recycle=600,
+        db_pool_pre_ping=False,
+    )
+    assert engine.get_pool_options() == {
+        "pool_size": 20,
+        "max_overflow": 5,
+        "pool_timeout": 10,
+        "pool_recycle": 600,
+        "pool_pre_ping": False,
+    }
+
+
+def test_pool_options_disabled(mocker: MockerFixture):
+    mocker.patch.object(engine.settings, "db_pool_enabled", False)
+    assert engine.get_pool_options() == {"poolclass": NullPool}
+
+
+def test_reset_pool_after_fork(mocker: MockerFixture):
+    dispose_mock = mocker.patch.object(engine.base_engine.sync_engine, "dispose")
+    engine.reset_pool_after_fork()
+    dispose_mock.assert_called_once_with(close=False)
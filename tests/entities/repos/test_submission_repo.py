@@ -2,6 +2,8 @@ import pandas as pd
 import pytest
 
 import datetime
+
+from types import SimpleNamespace
 from datetime import datetime as dt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
@@ -19,7 +21,7 @@ from sbl_filing_api.entities.models.dao import (
     UserActionDAO,
 )
 from sbl_filing_api.entities.models.dto import FilingPeriodDTO, ContactInfoDTO
-from sbl_filing_api.entities.models.model_enums import UserActionType
+from sbl_filing_api.entities.models.model_enums import SubmissionProgressPhase, UserActionType
 from sbl_filing_api.entities.repos import submission_repo as repo
 from regtech_api_commons.models.auth import AuthenticatedUser
 from pytest_mock import MockerFixture
@@ -31,6 +33,7 @@ class TestSubmissionRepo:
         self, transaction_session: AsyncSession, mocker: MockerFixture, session_generator: async_scoped_session
     ):
         mocker.patch.object(repo, "SessionLocal", return_value=session_generator())
+        repo.reference_data_cache.invalidate()
 
         user_action1 = UserActionDAO(
             id=1,
@@ -224,6 +227,28 @@ class TestSubmissionRepo:
         res = await repo.get_filing_period(query_session, filing_period="2024")
         assert res.code == "2024"
         assert res.filing_type == FilingType.ANNUAL
+        assert await repo.get_filing_period(query_session, filing_period="2025") is None
+
+    async def test_filing_periods_cached(self, query_session: AsyncSession, transaction_session: AsyncSession):
+        repo.reference_data_cache.stats.reset()
+        res1 = await repo.get_filing_periods(query_session)
+        res2 = await repo.get_filing_periods(transaction_session)
+        assert res1 is res2
+        assert res1[0] not in query_session
+        assert repo.reference_data_cache.stats.hits == 1
+
+        await repo.upsert_filing_period(
+            transaction_session,
+            FilingPeriodDTO(
+                code="2025",
+                description="Filing Period 2025",
+                start_period=dt.now(),
+                end_period=dt.now(),
+                due=dt.now(),
+                filing_type=FilingType.ANNUAL,
+            ),
+        )
+        assert {p.code for p in await repo.get_filing_periods(query_session)} == {"2024", "2025"}
 
     async def test_add_filing(self, transaction_session: AsyncSession):
         user_action_create = await repo.add_user_action(
@@ -273,6 +298,23 @@ class TestSubmissionRepo:
         assert res.creator.user_id == "123456-7890-ABCDEF-GHIJ"
         assert res.creator.user_name == "test creator"
 
+    async def test_sign_populated_filing(self, transaction_session: AsyncSession):
+        signer = await repo.add_user_action(
+            transaction_session,
+            user_id="123456-7890-ABCDEF-GHIJ",
+            user_name="test signer",
+            user_email="test@local.host",
+            action_type=UserActionType.SIGN,
+        )
+        filing = await repo.get_filing(transaction_session, lei="ZYXWVUTSRQP", filing_period="2024")
+        # the defaulted tasks are not pending changes of the filing
+        assert len(filing.tasks) == 2
+        assert not transaction_session.new
+
+        filing.signatures.append(signer)
+        res = await repo.upsert_filing(transaction_session, filing)
+        assert [s.id for s in res.signatures] == [signer.id]
+
     async def test_get_filing_tasks(self, transaction_session: AsyncSession):
         tasks = await repo.get_filing_tasks(transaction_session)
         assert len(tasks) == 2
@@ -364,12 +406,52 @@ class TestSubmissionRepo:
         assert results[2].lei == "ZYXWVUTSRQP"
         assert results[2].filing_period == "2024"
 
+    async def test_stream_period_filings(self, query_session: AsyncSession):
+        result = await repo.stream_period_filings(query_session, filing_period="2024", yield_per=2)
+        rows = [row async for row in result.mappings()]
+        assert [(r["id"], r["lei"], r["signed"], r["latest_submission_id"]) for r in rows] == [
+            (1, "1234567890", False, 1),
+            (2, "ABCDEFGHIJ", False, 3),
+            (3, "ZYXWVUTSRQP", False, None),
+        ]
+        assert rows[1]["latest_submission_state"] == SubmissionState.SUBMISSION_UPLOADED
+
+        result = await repo.stream_period_filings(query_session, filing_period="2024", signed=True)
+        assert [row async for row in result] == []
+
+        result = await repo.stream_period_filings(
+            query_session,
+            filing_period="2024",
+            signed=False,
+            latest_submission_states=[SubmissionState.SUBMISSION_UPLOADED, SubmissionState.VALIDATION_ERROR],
+        )
+        assert [row.id async for row in result] == [1, 2]
+
+    async def test_get_filings_status(self, query_session: AsyncSession):
+        res = await repo.get_filings_status(
+            query_session, filing_period="2024", leis=["ZYXWVUTSRQP", "UNKNOWNLEI", "ABCDEFGHIJ", "ZYXWVUTSRQP"]
+        )
+        assert [(r["lei"], r.get("filing_id"), r.get("latest_submission_id")) for r in res] == [
+            ("ZYXWVUTSRQP", 3, None),
+            ("UNKNOWNLEI", None, None),
+            ("ABCDEFGHIJ", 2, 3),
+        ]
+        assert res[2]["latest_submission_state"] == SubmissionState.SUBMISSION_UPLOADED
+        assert res[2]["signed"] is False
+
     async def test_get_latest_submission(self, query_session: AsyncSession):
         res = await repo.get_latest_submission(query_session, lei="ABCDEFGHIJ", filing_period="2024")
         assert res.id == 3
         assert res.filing == 2
         assert res.state == SubmissionState.SUBMISSION_UPLOADED
         assert res.validation_ruleset_version == "v1"
+        assert res.submitter.user_id == "test@local.host"
+
+        assert await repo.get_latest_submission(query_session, lei="ZYXWVUTSRQP", filing_period="2024") is None
+
+    async def test_filing_exists(self, query_session: AsyncSession):
+        assert await repo.filing_exists(query_session, lei="ABCDEFGHIJ", filing_period="2024")
+        assert not await repo.filing_exists(query_session, lei="ABCDEFGHIJ", filing_period="2025")
 
     async def test_get_submission(self, query_session: AsyncSession):
         res = await repo.get_submission(query_session, 1)
@@ -378,6 +460,90 @@ class TestSubmissionRepo:
         assert res.state == SubmissionState.SUBMISSION_UPLOADED
         assert res.validation_ruleset_version == "v1"
 
+    async def test_get_submission_state(self, query_session: AsyncSession):
+        assert await repo.get_submission_state(query_session, 1) == SubmissionState.SUBMISSION_UPLOADED
+        assert await repo.get_submission_state(query_session, 100) is None
+
+    async def test_get_validated_submission_by_hash(self, query_session: AsyncSession):
+        for submission in await repo.get_submissions(query_session):
+            submission.file_hash = "abc123"
+            if submission.id in (2, 4):
+                submission.state = SubmissionState.VALIDATION_WITH_WARNINGS
+        await query_session.commit()
+
+        submission, period_code = await repo.get_validated_submission_by_hash(
+            query_session, "1234567890", "abc123", "v1", exclude_id=1
+        )
+        assert submission.id == 4
+        assert period_code == "2024"
+
+        submission, _ = await repo.get_validated_submission_by_hash(query_session, "ABCDEFGHIJ", "abc123", "v1")
+        assert submission.id == 2
+
+        assert await repo.get_validated_submission_by_hash(query_session, "1234567890", "abc123", "v2") is None
+        assert await repo.get_validated_submission_by_hash(query_session, "1234567890", "def456", "v1") is None
+        assert await repo.get_validated_submission_by_hash(query_session, "ZYXWVUTSRQP", "abc123", "v1") is None
+
+        # the submission a resubmission repeats was accepted since
+        submission = await repo.get_submission(query_session, 4)
+        submission.state = SubmissionState.SUBMISSION_ACCEPTED
+        await query_session.commit()
+        submission, _ = await repo.get_validated_submission_by_hash(
+            query_session, "1234567890", "abc123", "v1", exclude_id=1
+        )
+        assert submission.id == 4
+
+    async def test_get_validation_cache_stats(self, query_session: AsyncSession):
+        assert await repo.get_validation_cache_stats(query_session, "2024") == {
+            "filing_period": "2024",
+            "hits": 0,
+            "misses": 0,
+            "hit_rate": 0.0,
+        }
+
+        for submission in await repo.get_submissions(query_session):
+            submission.validation_cache_hit = submission.id != 4 if submission.id != 3 else None
+        await query_session.commit()
+
+        assert await repo.get_validation_cache_stats(query_session, "2024") == {
+            "filing_period": "2024",
+            "hits": 2,
+            "misses": 1,
+            "hit_rate": 2 / 3,
+        }
+        assert (await repo.get_validation_cache_stats(query_session, "2025"))["hits"] == 0
+
+    async def test_notify_submission_state(self, mocker: MockerFixture):
+        session = mocker.AsyncMock()
+        session.get_bind = mocker.Mock(return_value=mocker.Mock(dialect=mocker.Mock()))
+        session.get_bind.return_value.dialect.name = "postgresql"
+
+        await repo.notify_submission_state(session, 1, SubmissionState.VALIDATION_SUCCESSFUL)
+        statement = session.execute.call_args.args[0].compile(compile_kwargs={"literal_binds": True})
+        assert str(statement) == (
+            'SELECT pg_notify(\'submission_state\', \'{"id": 1, "state": "VALIDATION_SUCCESSFUL"}\') AS pg_notify_1'
+        )
+
+        session.execute.reset_mock()
+        session.get_bind.return_value.dialect.name = "sqlite"
+        await repo.notify_submission_state(session, 1, SubmissionState.VALIDATION_SUCCESSFUL)
+        assert not session.execute.called
+
+    async def test_submission_progress(self, transaction_session: AsyncSession):
+        assert await repo.get_submission_progress(transaction_session, 1) is None
+
+        await repo.update_submission_progress(transaction_session, 1, SubmissionProgressPhase.VALIDATING, 0)
+        res = await repo.update_submission_progress(
+            transaction_session, 1, SubmissionProgressPhase.GENERATING_REPORT, 200, 200
+        )
+        assert res.rows_processed == 200
+
+        res = await repo.get_submission_progress(transaction_session, 1)
+        assert res.submission == 1
+        assert res.phase == SubmissionProgressPhase.GENERATING_REPORT
+        assert res.rows_processed == 200
+        assert res.total_rows == 200
+
     async def test_get_submissions(self, query_session: AsyncSession):
         res = await repo.get_submissions(query_session)
         assert len(res) == 4
@@ -395,6 +561,32 @@ class TestSubmissionRepo:
         res = await repo.get_submissions(query_session, lei="ZYXWVUTSRQP", filing_period="2024")
         assert len(res) == 0
 
+    async def test_get_submissions_paginated(self, query_session: AsyncSession):
+        res = await repo.get_submissions(query_session, limit=2)
+        assert [s.id for s in res] == [4, 2]
+
+        res = await repo.get_submissions(query_session, limit=2, after=(res[-1].submission_time, res[-1].id))
+        assert [s.id for s in res] == [1, 3]
+
+        res = await repo.get_submissions(query_session, after=(res[-1].submission_time, res[-1].id))
+        assert res == []
+
+    async def test_get_submissions_fields(self, query_session: AsyncSession):
+        submission = await repo.get_submission(query_session, 2)
+        submission.validation_results = {"syntax_errors": {"total_count": 0}}
+        await repo.update_submission(query_session, submission)
+        query_session.expunge_all()
+
+        res = await repo.get_submissions(
+            query_session, lei="ABCDEFGHIJ", filing_period="2024", fields={"id", "state", "validation_results"}
+        )
+        assert [s.id for s in res] == [2, 3]
+        assert res[0].state == SubmissionState.SUBMISSION_UPLOADED
+        assert res[0].submitter is None
+        assert "filename" not in res[0].__dict__
+        assert res[0].validation_results == {"syntax_errors": {"total_count": 0}}
+        assert res[1].validation_results is None
+
     async def test_add_submission(self, transaction_session: AsyncSession):
         user_action_submit = await repo.add_user_action(
             transaction_session,
@@ -464,10 +656,24 @@ class TestSubmissionRepo:
                 assert new_res2.id == 5
                 assert new_res2.filing == 1
                 assert new_res2.state == SubmissionState.VALIDATION_WITH_ERRORS
-                assert new_res2.validation_results == validation_results
+                assert new_res2.validation_results is None
+                assert new_res2.version == 3
+                assert await repo.get_submission_version(search_session, 5) == 3
+                assert await repo.get_validation_results(search_session, 5) == validation_results
 
         await query_updated_dao()
 
+        # a submission loaded without its results must not clear the stored ones
+        res.validation_results = None
+        res.state = SubmissionState.SUBMISSION_ACCEPTED
+        async with session_generator() as update_session:
+            await repo.update_submission(update_session, res)
+
+        async with session_generator() as search_session:
+            new_res3 = await repo.get_submission(search_session, 5, load_results=True)
+            assert new_res3.state == SubmissionState.SUBMISSION_ACCEPTED
+            assert new_res3.validation_results == validation_results
+
     async def test_get_contact_info(self, query_session: AsyncSession):
         res = await repo.get_filing(session=query_session, lei="ABCDEFGHIJ", filing_period="2024")
 
@@ -557,6 +763,32 @@ class TestSubmissionRepo:
         assert filing.contact_info.phone_number == "212-345-6789"
         assert filing.contact_info.email == "test2_upd@cfpb.gov"
 
+    async def test_filing_version_bumped(self, query_session: AsyncSession, transaction_session: AsyncSession):
+        assert await repo.get_filing_version(query_session, lei="ABCDEFGHIJ", filing_period="2024") == (2, 1)
+        assert await repo.get_filing_version(query_session, lei="ABCDEFGHIJ", filing_period="2025") is None
+
+        user = AuthenticatedUser.from_claim({"preferred_username": "testuser"})
+        await repo.update_task_state(
+            transaction_session,
+            lei="ABCDEFGHIJ",
+            filing_period="2024",
+            task_name="Task-1",
+            state="COMPLETED",
+            user=user,
+        )
+        assert await repo.get_filing_version(transaction_session, lei="ABCDEFGHIJ", filing_period="2024") == (2, 2)
+
+        filing = await repo.get_filing(transaction_session, lei="ABCDEFGHIJ", filing_period="2024")
+        filing.institution_snapshot_id = "v2"
+        filing = await repo.upsert_filing(transaction_session, filing)
+        assert filing.version == 3
+
+        # a copy of the filing holding an older version does not take the version back
+        stale_filing = SimpleNamespace(**{**filing.__dict__, "version": 1, "confirmation_id": "ABCDEFGHIJ-2024-1"})
+        filing = await repo.upsert_filing(transaction_session, stale_filing)
+        assert filing.confirmation_id == "ABCDEFGHIJ-2024-1"
+        assert filing.version == 4
+
     async def test_get_user_action(self, query_session: AsyncSession):
         res = await repo.get_user_action(session=query_session, id=3)
 
@@ -0,0 +1,135 @@
+import pytest
+
+from datetime import datetime as dt, timedelta
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.models.dao import SubmissionDAO, ValidationJobDAO
+from sbl_filing_api.entities.models.model_enums import SubmissionState, ValidationJobState
+from sbl_filing_api.entities.repos import validation_job_repo as job_repo
+from pytest_mock import MockerFixture
+
+
+class TestValidationJobRepo:
+    @pytest.fixture(scope="function", autouse=True)
+    async def setup(self, transaction_session: AsyncSession, mocker: MockerFixture):
+        mocker.patch.object(job_repo.settings.validation_queue_config, "max_attempts", 2)
+        mocker.patch.object(job_repo.settings.validation_queue_config, "lease_secs", 60)
+
+        for i in range(1, 4):
+            transaction_session.add(
+                SubmissionDAO(
+                    id=i,
+                    filing=1,
+                    submitter_id=1,
+                    state=SubmissionState.SUBMISSION_UPLOADED,
+                    submission_time=dt.now(),
+                    filename=f"file{i}.csv",
+                )
+            )
+        await transaction_session.commit()
+
+    async def test_enqueue_validation_job(self, query_session: AsyncSession):
+        job = await job_repo.enqueue_validation_job(
+            query_session, 1, "1234567890", "2024", "upload/2024/1234567890/1.csv"
+        )
+        assert job.id == 1
+        assert job.submission == 1
+        assert job.state == ValidationJobState.QUEUED
+        assert job.attempts == 0
+        assert job.worker_id is None
+
+    async def test_claim_validation_job(self, query_session: AsyncSession):
+        await job_repo.enqueue_validation_job(query_session, 1, "1234567890", "2024", "upload/2024/1234567890/1.csv")
+        await job_repo.enqueue_validation_job(query_session, 2, "1234567890", "2024", "upload/2024/1234567890/2.csv")
+
+        job = await job_repo.claim_validation_job(query_session, "worker-1")
+        assert job.submission == 1
+        assert job.state == ValidationJobState.RUNNING
+        assert job.attempts == 1
+        assert job.worker_id == "worker-1"
+        assert job.lease_expiration == job.heartbeat_timestamp + timedelta(seconds=60)
+
+        job = await job_repo.claim_validation_job(query_session, "worker-2")
+        assert job.submission == 2
+        assert job.worker_id == "worker-2"
+
+        assert await job_repo.claim_validation_job(query_session, "worker-3") is None
+
+    async def test_claim_expired_lease(self, query_session: AsyncSession):
+        job = await job_repo.enqueue_validation_job(
+            query_session, 1, "1234567890", "2024", "upload/2024/1234567890/1.csv"
+        )
+        job = await job_repo.claim_validation_job(query_session, "worker-1")
+
+        assert await job_repo.claim_validation_job(query_session, "worker-2") is None
+
+        job.lease_expiration = job.heartbeat_timestamp - timedelta(seconds=1)
+        await query_session.commit()
+
+        job = await job_repo.claim_validation_job(query_session, "worker-2")
+        assert job.worker_id == "worker-2"
+        assert job.attempts == 2
+        assert not await job_repo.heartbeat_validation_job(query_session, job.id, "worker-1")
+
+    async def test_claim_exceeded_attempts(self, query_session: AsyncSession):
+        job = await job_repo.enqueue_validation_job(
+            query_session, 1, "1234567890", "2024", "upload/2024/1234567890/1.csv"
+        )
+        await job_repo.enqueue_validation_job(query_session, 2, "1234567890", "2024", "upload/2024/1234567890/2.csv")
+        job.state = ValidationJobState.RUNNING
+        job.attempts = settings.validation_queue_config.max_attempts
+        job.lease_expiration = dt.now() - timedelta(days=1)
+        await query_session.commit()
+
+        job = await job_repo.claim_validation_job(query_session, "worker-1")
+        assert job.submission == 2
+
+        failed = await query_session.scalar(select(ValidationJobDAO).filter_by(submission=1))
+        await query_session.refresh(failed)
+        assert failed.state == ValidationJobState.FAILED
+        submission = await query_session.scalar(select(SubmissionDAO).filter_by(id=1))
+        await query_session.refresh(submission)
+        assert submission.state == SubmissionState.VALIDATION_ERROR
+
+    async def test_heartbeat_validation_job(self, query_session: AsyncSession):
+        await job_repo.enqueue_validation_job(query_session, 1, "1234567890", "2024", "upload/2024/1234567890/1.csv")
+        job = await job_repo.claim_validation_job(query_session, "worker-1")
+        lease_expiration = job.lease_expiration
+
+        assert await job_repo.heartbeat_validation_job(query_session, job.id, "worker-1")
+        await query_session.refresh(job)
+        assert job.lease_expiration >= lease_expiration
+
+        assert not await job_repo.heartbeat_validation_job(query_session, job.id, "worker-2")
+
+    async def test_holds_validation_job(self, query_session: AsyncSession):
+        await job_repo.enqueue_validation_job(query_session, 1, "1234567890", "2024", "upload/2024/1234567890/1.csv")
+        job = await job_repo.claim_validation_job(query_session, "worker-1")
+
+        assert await job_repo.holds_validation_job(query_session, job.id, "worker-1")
+        assert not await job_repo.holds_validation_job(query_session, job.id, "worker-2")
+        await job_repo.release_validation_job(query_session, job.id, "worker-1", ValidationJobState.COMPLETED)
+        assert not await job_repo.holds_validation_job(query_session, job.id, "worker-1")
+
+    async def test_release_validation_job(self, query_session: AsyncSession):
+        await job_repo.enqueue_validation_job(query_session, 1, "1234567890", "2024", "upload/2024/1234567890/1.csv")
+        job = await job_repo.claim_validation_job(query_session, "worker-1")
+
+        assert not await job_repo.release_validation_job(
+            query_session, job.id, "worker-2", ValidationJobState.COMPLETED
+        )
+        assert await job_repo.release_validation_job(query_session, job.id, "worker-1", ValidationJobState.COMPLETED)
+
+        await query_session.refresh(job)
+        assert job.state == ValidationJobState.COMPLETED
+        assert job.worker_id is None
+        assert job.lease_expiration is None
+        assert not await job_repo.heartbeat_validation_job(query_session, job.id, "worker-1")
+
+    def test_lease_expiration_from_now(self):
+        stmt = select(job_repo.lease_expiration_from_now(30))
+        assert "now() + " in str(stmt.compile(dialect=postgresql.dialect()))
+        assert "datetime(" in str(stmt.compile(dialect=sqlite.dialect()))
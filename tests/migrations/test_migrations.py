@@ -389,3 +389,128 @@ def test_migrations_to_7356a7d7036d(alembic_runner: MigrationContext, alembic_en
     inspector = sqlalchemy.inspect(alembic_engine)
 
     assert "total_records" in set([c["name"] for c in inspector.get_columns("submission")])
+
+
+def test_migrations_to_a3d6e8f21c47(alembic_runner: MigrationContext, alembic_engine: Engine):
+    alembic_runner.migrate_up_to("a3d6e8f21c47")
+
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "validation_job" in inspector.get_table_names()
+    assert {
+        "id",
+        "submission",
+        "lei",
+        "filing_period",
+        "file_path",
+        "state",
+        "attempts",
+        "worker_id",
+        "lease_expiration",
+        "heartbeat_timestamp",
+        "created_timestamp",
+    } == set([c["name"] for c in inspector.get_columns("validation_job")])
+
+    job_fks = inspector.get_foreign_keys("validation_job")
+    assert (
+        "submission" in job_fks[0]["constrained_columns"]
+        and "submission" == job_fks[0]["referred_table"]
+        and "id" in job_fks[0]["referred_columns"]
+    )
+    assert "ix_validation_job_state" in [i["name"] for i in inspector.get_indexes("validation_job")]
+
+
+def test_migrations_to_e2f4c81b9d35(alembic_runner: MigrationContext, alembic_engine: Engine):
+    alembic_runner.migrate_up_to("e2f4c81b9d35")
+
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "file_hash" in set([c["name"] for c in inspector.get_columns("submission")])
+    assert "ix_submission_file_hash" in [i["name"] for i in inspector.get_indexes("submission")]
+
+
+def test_migrations_to_5b1c9e7d2a64(alembic_runner: MigrationContext, alembic_engine: Engine):
+    alembic_runner.migrate_up_to("5b1c9e7d2a64")
+
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "submission_progress" in inspector.get_table_names()
+    assert {"submission", "phase", "rows_processed", "total_rows", "change_timestamp"} == set(
+        [c["name"] for c in inspector.get_columns("submission_progress")]
+    )
+    progress_fks = inspector.get_foreign_keys("submission_progress")
+    assert (
+        "submission" in progress_fks[0]["constrained_columns"]
+        and "submission" == progress_fks[0]["referred_table"]
+        and "id" in progress_fks[0]["referred_columns"]
+    )
+
+
+def test_migrations_to_8c3a5f0e9b17(alembic_runner: MigrationContext, alembic_engine: Engine):
+    alembic_runner.migrate_up_to("5b1c9e7d2a64")
+    alembic_runner.insert_into(
+        "submission",
+        [
+            {
+                "id": 1,
+                "filing": 1,
+                "submitter_id": 1,
+                "state": "VALIDATION_SUCCESSFUL",
+                "filename": "file1.csv",
+                "validation_results": {"logic_errors": {"total_count": 0}},
+            },
+            {"id": 2, "filing": 1, "submitter_id": 1, "state": "SUBMISSION_UPLOADED", "filename": "file2.csv"},
+        ],
+    )
+    alembic_runner.migrate_up_one()
+
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "validation_results" not in set([c["name"] for c in inspector.get_columns("submission")])
+    assert {"submission", "results"} == set([c["name"] for c in inspector.get_columns("validation_results")])
+    results_fks = inspector.get_foreign_keys("validation_results")
+    assert (
+        "submission" in results_fks[0]["constrained_columns"]
+        and "submission" == results_fks[0]["referred_table"]
+        and "id" in results_fks[0]["referred_columns"]
+    )
+    with alembic_engine.connect() as conn:
+        rows = conn.execute(sqlalchemy.text("SELECT submission, results FROM validation_results")).all()
+    assert rows == [(1, '{"logic_errors": {"total_count": 0}}')]
+
+
+def test_migrations_to_f41d7b2c8e90(alembic_runner: MigrationContext, alembic_engine: Engine):
+    alembic_runner.migrate_up_to("f41d7b2c8e90")
+
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    indexes = {i["name"]: i["column_names"] for i in inspector.get_indexes("submission")}
+    assert indexes["ix_submission_filing_submission_time"] == ["filing", "submission_time", "id"]
+
+
+def test_migrations_to_3d9a6c1f4b28(alembic_runner: MigrationContext, alembic_engine: Engine):
+    alembic_runner.migrate_up_to("3d9a6c1f4b28")
+
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "version" in [c["name"] for c in inspector.get_columns("filing")]
+    assert "version" in [c["name"] for c in inspector.get_columns("submission")]
+
+    alembic_runner.migrate_down_one()
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "version" not in [c["name"] for c in inspector.get_columns("filing")]
+    assert "version" not in [c["name"] for c in inspector.get_columns("submission")]
+
+
+def test_migrations_to_6d2e4b8a1f35(alembic_runner: MigrationContext, alembic_engine: Engine):
+    alembic_runner.migrate_up_to("6d2e4b8a1f35")
+
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "validation_cache_hit" in [c["name"] for c in inspector.get_columns("submission")]
+
+    alembic_runner.migrate_down_one()
+    inspector = sqlalchemy.inspect(alembic_engine)
+
+    assert "validation_cache_hit" not in [c["name"] for c in inspector.get_columns("submission")]
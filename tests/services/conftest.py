@@ -1,15 +1,25 @@
+import io
 import pandas as pd
 import pytest
+import threading
 
 from pytest_mock import MockerFixture
 from textwrap import dedent
 from unittest.mock import Mock
 
 from sbl_filing_api.entities.models.dao import SubmissionDAO, SubmissionState
+from sbl_filing_api.services import file_handler
 
 from regtech_data_validator.validation_results import ValidationResults, ValidationPhase, Counts
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_s3_client():
+    file_handler.reset_s3_client()
+    yield
+    file_handler.reset_s3_client()
+
+
 @pytest.fixture(scope="function")
 def validate_submission_mock(mocker: MockerFixture):
     return_sub = SubmissionDAO(
@@ -20,6 +30,13 @@ def validate_submission_mock(mocker: MockerFixture):
     )
     mock_update_submission = mocker.patch("sbl_filing_api.services.submission_processor.update_submission")
     mock_update_submission.return_value = return_sub
+    mocker.patch(
+        "sbl_filing_api.services.submission_processor.get_submission_state",
+        return_value=SubmissionState.VALIDATION_IN_PROGRESS,
+    )
+
+    mocker.patch("sbl_filing_api.services.file_handler.open_file")
+    mocker.patch("sbl_filing_api.services.validation_progress.update_submission_progress")
 
     mock_read_csv = mocker.patch("pandas.read_csv")
     mock_read_csv.return_value = pd.DataFrame([["0", "1"]], columns=["Submission_Column_1", "Submission_Column_2"])
@@ -104,3 +121,72 @@ def df_to_download_mock(mocker: MockerFixture):
     mock_download_formatting = mocker.patch("sbl_filing_api.services.submission_processor.df_to_download")
     mock_download_formatting.return_value = expected_output
     return mock_download_formatting
+
+
+class FakeS3Client:
+    """
+    In-memory stand-in for the parts of the boto3 S3 client used by file_handler, including multipart uploads
+    and ranged GETs.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, **kwargs):
+        with self._lock:
+            self.calls.append((name, kwargs))
+
+    def put_object(self, Bucket, Key, Body):
+        self._record("put_object", Bucket=Bucket, Key=Key)
+        self.objects[(Bucket, Key)] = Body if isinstance(Body, bytes) else Body.read()
+        return {"ETag": "put"}
+
+    def create_multipart_upload(self, Bucket, Key):
+        self._record("create_multipart_upload", Bucket=Bucket, Key=Key)
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self._record("upload_part", Bucket=Bucket, Key=Key, PartNumber=PartNumber)
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self._record("complete_multipart_upload", Bucket=Bucket, Key=Key)
+        parts = self.uploads.pop(UploadId)
+        self.objects[(Bucket, Key)] = b"".join(parts[p["PartNumber"]] for p in MultipartUpload["Parts"])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self._record("abort_multipart_upload", Bucket=Bucket, Key=Key)
+        self.uploads.pop(UploadId, None)
+
+    def copy_object(self, Bucket, Key, CopySource):
+        self._record("copy_object", Bucket=Bucket, Key=Key)
+        self.objects[(Bucket, Key)] = self.objects[(CopySource["Bucket"], CopySource["Key"])]
+
+    def head_object(self, Bucket, Key):
+        self._record("head_object", Bucket=Bucket, Key=Key)
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def get_object(self, Bucket, Key, Range=None):
+        self._record("get_object", Bucket=Bucket, Key=Key, Range=Range)
+        content = self.objects[(Bucket, Key)]
+        if Range:
+            start, end = Range.removeprefix("bytes=").split("-")
+            content = content[int(start) : int(end) + 1]
+        return {"Body": io.BytesIO(content), "ContentLength": len(content)}
+
+    def call_names(self):
+        return [name for name, _ in self.calls]
+
+
+@pytest.fixture(scope="function")
+def fake_s3(mocker: MockerFixture) -> FakeS3Client:
+    client = FakeS3Client()
+    boto3_mock = mocker.patch("sbl_filing_api.services.file_handler.boto3")
+    boto3_mock.client.return_value = client
+    return client
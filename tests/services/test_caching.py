@@ -0,0 +1,65 @@
+from unittest.mock import AsyncMock
+
+from pytest_mock import MockerFixture
+
+from sbl_filing_api.services import caching
+from sbl_filing_api.services.caching import TtlCache
+
+
+class TestTtlCache:
+    async def test_get_or_load(self, mocker: MockerFixture):
+        monotonic_mock = mocker.patch.object(caching.time, "monotonic", return_value=100.0)
+        loader = AsyncMock(side_effect=["first", "second"])
+        cache = TtlCache("test", ttl_secs=60)
+
+        assert await cache.get_or_load("key", loader) == "first"
+        assert await cache.get_or_load("key", loader) == "first"
+        assert loader.call_count == 1
+
+        monotonic_mock.return_value = 161.0
+        assert await cache.get_or_load("key", loader) == "second"
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+
+    async def test_invalidate(self):
+        loader = AsyncMock(side_effect=["a1", "b1", "a2", "b2", "a3"])
+        cache = TtlCache("test", ttl_secs=60)
+        await cache.get_or_load("a", loader)
+        await cache.get_or_load("b", loader)
+
+        cache.invalidate("a")
+        assert await cache.get_or_load("a", loader) == "a2"
+        assert await cache.get_or_load("b", loader) == "b1"
+
+        cache.invalidate()
+        assert await cache.get_or_load("b", loader) == "b2"
+
+    async def test_disabled_and_maxsize(self):
+        loader = AsyncMock(side_effect=lambda: object())
+        cache = TtlCache("test", ttl_secs=0)
+        assert await cache.get_or_load("key", loader) is not await cache.get_or_load("key", loader)
+
+        cache = TtlCache("test", ttl_secs=60, maxsize=2)
+        first = await cache.get_or_load("a", loader)
+        await cache.get_or_load("b", loader)
+        await cache.get_or_load("c", loader)
+        assert await cache.get_or_load("c", loader) is await cache.get_or_load("c", loader)
+        assert await cache.get_or_load("a", loader) is not first
+
+    async def test_ttl_of(self, mocker: MockerFixture):
+        monotonic_mock = mocker.patch.object(caching.time, "monotonic", return_value=100.0)
+        loader = AsyncMock(side_effect=["short", "short", "long"])
+        cache = TtlCache("test", ttl_secs=60)
+
+        def ttl_of(value):
+            return 10 if value == "short" else 0
+
+        assert await cache.get_or_load("key", loader, ttl_of=ttl_of) == "short"
+        monotonic_mock.return_value = 109.0
+        assert await cache.get_or_load("key", loader, ttl_of=ttl_of) == "short"
+        assert loader.call_count == 1
+
+        monotonic_mock.return_value = 111.0
+        assert await cache.get_or_load("key", loader, ttl_of=ttl_of) == "short"
+        assert await cache.get_or_load("other", loader, ttl_of=ttl_of) == "long"
+        assert await cache.get_or_load("other", AsyncMock(return_value="reloaded"), ttl_of=ttl_of) == "reloaded"
@@ -1,5 +1,8 @@
+import pytest
+
 from pytest_mock import MockerFixture
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock
+import hashlib
 import io
 
 from sbl_filing_api.config import FsProtocol, settings
@@ -16,7 +19,7 @@ def test_upload_local_fs(mocker: MockerFixture):
 
     path = "test"
     content = b"test"
-    fh.upload(path, b"test")
+    assert fh.upload(path, b"test") == hashlib.sha256(content).hexdigest()
     path_mock.assert_called_with(f"{settings.fs_upload_config.root}/{path}")
     file_mock.parent.mkdir.assert_called_with(parents=True, exist_ok=True)
     file_mock.write_bytes.assert_called_with(content)
@@ -35,7 +38,7 @@ def test_upload_s3(mocker: MockerFixture):
     content = b"test"
     fh.upload(path, b"test")
 
-    boto3_mock.client.assert_called_once_with("s3")
+    boto3_mock.client.assert_called_once_with("s3", config=ANY)
     client_mock.put_object.assert_called_once_with(
         Bucket=settings.fs_upload_config.root,
         Key=path,
@@ -62,7 +65,9 @@ def test_download_local(mocker: MockerFixture):
 
 def test_download_s3(mocker: MockerFixture):
     default_file_proto = settings.fs_upload_config.protocol
+    default_multipart = settings.fs_upload_config.multipart
     settings.fs_upload_config.protocol = FsProtocol.S3
+    settings.fs_upload_config.multipart = False
     path = "test"
     content = "test content"
     boto3_mock = mocker.patch("sbl_filing_api.services.file_handler.boto3")
@@ -74,10 +79,144 @@ def test_download_s3(mocker: MockerFixture):
     for chunk in fh.download(path):
         res += chunk
 
-    boto3_mock.client.assert_called_once_with("s3")
+    boto3_mock.client.assert_called_once_with("s3", config=ANY)
     client_mock.get_object.assert_called_once_with(
         Bucket=settings.fs_upload_config.root,
         Key=path,
     )
     assert res == content
     settings.fs_upload_config.protocol = default_file_proto
+    settings.fs_upload_config.multipart = default_multipart
+
+
+def test_upload_stream_local_fs(tmp_path):
+    default_file_proto = settings.fs_upload_config.protocol
+    default_root = settings.fs_upload_config.root
+    settings.fs_upload_config.protocol = FsProtocol.FILE
+    settings.fs_upload_config.root = str(tmp_path)
+
+    content = b"a" * (settings.fs_upload_config.part_size + 10)
+    assert fh.upload_stream("upload/2024/test/1.csv", io.BytesIO(content)) == hashlib.sha256(content).hexdigest()
+    assert (tmp_path / "upload/2024/test/1.csv").read_bytes() == content
+
+    fh.copy("upload/2024/test/1.csv", "upload/2025/test/2.csv")
+    assert (tmp_path / "upload/2025/test/2.csv").read_bytes() == content
+
+    settings.fs_upload_config.protocol = default_file_proto
+    settings.fs_upload_config.root = default_root
+
+
+class TestS3Transfers:
+    @pytest.fixture(autouse=True)
+    def s3_settings(self):
+        default_file_proto = settings.fs_upload_config.protocol
+        default_part_size = settings.fs_upload_config.part_size
+        default_concurrency = settings.fs_upload_config.max_concurrency
+        default_multipart = settings.fs_upload_config.multipart
+        settings.fs_upload_config.protocol = FsProtocol.S3
+        settings.fs_upload_config.part_size = 4
+        settings.fs_upload_config.max_concurrency = 2
+        settings.fs_upload_config.multipart = True
+        yield
+        settings.fs_upload_config.protocol = default_file_proto
+        settings.fs_upload_config.part_size = default_part_size
+        settings.fs_upload_config.max_concurrency = default_concurrency
+        settings.fs_upload_config.multipart = default_multipart
+
+    def test_upload_stream_single_part(self, fake_s3):
+        assert fh.upload_stream("test", io.BytesIO(b"tes")) == hashlib.sha256(b"tes").hexdigest()
+
+        assert fake_s3.call_names() == ["put_object"]
+        assert fake_s3.objects[(settings.fs_upload_config.root, "test")] == b"tes"
+
+    def test_upload_stream_multipart(self, fake_s3):
+        content = b"0123456789abcdefghij-"
+        assert fh.upload_stream("test", io.BytesIO(content)) == hashlib.sha256(content).hexdigest()
+
+        names = fake_s3.call_names()
+        assert names[0] == "create_multipart_upload"
+        assert names.count("upload_part") == 6
+        assert names[-1] == "complete_multipart_upload"
+        assert fake_s3.objects[(settings.fs_upload_config.root, "test")] == content
+
+    def test_upload_stream_multipart_failure(self, mocker: MockerFixture, fake_s3):
+        mocker.patch.object(fake_s3, "upload_part", side_effect=IOError("connection reset"))
+        with pytest.raises(IOError):
+            fh.upload_stream("test", io.BytesIO(b"testtesttt"))
+
+        assert "abort_multipart_upload" in fake_s3.call_names()
+        assert "complete_multipart_upload" not in fake_s3.call_names()
+        assert not fake_s3.uploads
+        assert (settings.fs_upload_config.root, "test") not in fake_s3.objects
+
+    def test_upload_stream_single_put(self, fake_s3):
+        settings.fs_upload_config.multipart = False
+        content = b"0123456789abcdefghij-"
+        stream = io.BytesIO(b"skip" + content)
+        stream.seek(4)
+        assert fh.upload_stream("test", stream) == hashlib.sha256(content).hexdigest()
+
+        assert fake_s3.call_names() == ["put_object"]
+        assert fake_s3.objects[(settings.fs_upload_config.root, "test")] == content
+
+    def test_copy(self, fake_s3):
+        fake_s3.objects[(settings.fs_upload_config.root, "upload/2024/test/1_report.csv")] = b"report"
+
+        fh.copy("upload/2024/test/1_report.csv", "upload/2024/test/2_report.csv")
+
+        assert fake_s3.call_names() == ["copy_object"]
+        assert fake_s3.objects[(settings.fs_upload_config.root, "upload/2024/test/2_report.csv")] == b"report"
+
+    def test_download_ranges(self, fake_s3):
+        content = b"0123456789abcdefghij-"
+        fake_s3.objects[(settings.fs_upload_config.root, "test")] = content
+
+        assert b"".join(fh.download("test")) == content
+        ranges = sorted(kwargs["Range"] for name, kwargs in fake_s3.calls if name == "get_object")
+        assert ranges == sorted(["bytes=0-3", "bytes=4-7", "bytes=8-11", "bytes=12-15", "bytes=16-19", "bytes=20-20"])
+
+    def test_download_small_object(self, fake_s3):
+        fake_s3.objects[(settings.fs_upload_config.root, "test")] = b"tes"
+
+        assert b"".join(fh.download("test")) == b"tes"
+        assert fake_s3.call_names() == ["head_object", "get_object"]
+
+    def test_open_file_ranges(self, fake_s3):
+        content = b"0123456789abcdefghij-"
+        fake_s3.objects[(settings.fs_upload_config.root, "test")] = content
+
+        with fh.open_file("test") as f:
+            assert f.read() == content
+        assert fake_s3.call_names().count("get_object") == 6
+
+    def test_open_file_single_get(self, fake_s3):
+        settings.fs_upload_config.multipart = False
+        fake_s3.objects[(settings.fs_upload_config.root, "test")] = b"test content"
+
+        with fh.open_file("test") as f:
+            assert f.read() == b"test content"
+        assert fake_s3.call_names() == ["get_object"]
+
+
+def test_s3_client_reused(mocker: MockerFixture):
+    boto3_mock = mocker.patch("sbl_filing_api.services.file_handler.boto3")
+    client_mock = Mock()
+    boto3_mock.client.return_value = client_mock
+
+    assert fh.get_s3_client() is client_mock
+    assert fh.get_s3_client() is client_mock
+    assert fh.get_s3_client() is client_mock
+
+    boto3_mock.client.assert_called_once_with("s3", config=ANY)
+    assert (
+        boto3_mock.client.call_args.kwargs["config"].max_pool_connections
+        == settings.fs_upload_config.max_pool_connections
+    )
+    assert fh.s3_client_stats.misses == 1
+    assert fh.s3_client_stats.hits == 2
+
+    # simulates what runs in a forked child process
+    fh.reset_s3_client()
+    assert fh.s3_client_stats.hits == 0
+    fh.get_s3_client()
+    assert boto3_mock.client.call_count == 2
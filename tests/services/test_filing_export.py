@@ -0,0 +1,69 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from pytest_mock import MockerFixture
+
+from sbl_filing_api.entities.models.model_enums import ExportFormat, SubmissionState
+from sbl_filing_api.services import filing_export
+
+
+class TestFilingExport:
+    rows = [
+        {
+            "id": 1,
+            "lei": "1234567890ABCDEFGH00",
+            "filing_period": "2024",
+            "institution_snapshot_id": "v1",
+            "confirmation_id": None,
+            "signed": False,
+            "latest_submission_id": 3,
+            "latest_submission_state": SubmissionState.VALIDATION_SUCCESSFUL,
+            "latest_submission_time": datetime(2024, 6, 1, 12, 30),
+        },
+        {
+            "id": 2,
+            "lei": "1234567890ZXWVUTSR00",
+            "filing_period": "2024",
+            "institution_snapshot_id": "v1",
+            "confirmation_id": None,
+            "signed": False,
+            "latest_submission_id": None,
+            "latest_submission_state": None,
+            "latest_submission_time": None,
+        },
+    ]
+
+    def mock_stream(self, mocker: MockerFixture) -> AsyncMock:
+        async def partitions():
+            yield self.rows[:1]
+            yield self.rows[1:]
+
+        result = MagicMock()
+        result.mappings.return_value.partitions = partitions
+        mocker.patch.object(filing_export, "SessionLocal", return_value=MagicMock())
+        return mocker.patch.object(filing_export.repo, "stream_period_filings", AsyncMock(return_value=result))
+
+    async def test_export_ndjson(self, mocker: MockerFixture):
+        stream_mock = self.mock_stream(mocker)
+
+        chunks = [c async for c in filing_export.export_period_filings("2024", ExportFormat.NDJSON, signed=False)]
+
+        stream_mock.assert_called_once_with(mocker.ANY, "2024", False, None, yield_per=filing_export.EXPORT_BATCH_SIZE)
+        assert len(chunks) == 2
+        assert chunks[0] == (
+            '{"id": 1, "lei": "1234567890ABCDEFGH00", "filing_period": "2024", "institution_snapshot_id": "v1", '
+            '"confirmation_id": null, "signed": false, "latest_submission_id": 3, '
+            '"latest_submission_state": "VALIDATION_SUCCESSFUL", "latest_submission_time": "2024-06-01T12:30:00"}\n'
+        )
+
+    async def test_export_csv(self, mocker: MockerFixture):
+        self.mock_stream(mocker)
+
+        chunks = [c async for c in filing_export.export_period_filings("2024", ExportFormat.CSV)]
+
+        assert "".join(chunks) == (
+            "id,lei,filing_period,institution_snapshot_id,confirmation_id,signed,latest_submission_id,"
+            "latest_submission_state,latest_submission_time\n"
+            "1,1234567890ABCDEFGH00,2024,v1,,False,3,VALIDATION_SUCCESSFUL,2024-06-01T12:30:00\n"
+            "2,1234567890ZXWVUTSR00,2024,v1,,False,,,\n"
+        )
@@ -1,11 +1,10 @@
 import asyncio
 from concurrent.futures.process import BrokenProcessPool
 
-from multiprocessing import Manager
 from pytest_mock import MockerFixture
 from sbl_filing_api.entities.models.dao import SubmissionDAO, SubmissionState
 from sbl_filing_api.services.multithread_handler import check_future, handle_submission
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, MagicMock, Mock
 
 
 class TestMultithreader:
@@ -18,19 +17,20 @@ class TestMultithreader:
         raise BrokenProcessPool("Pool died.")
 
     async def test_future_checker(self, mocker: MockerFixture):
-        exec_check = Manager().dict()
-        exec_check["continue"] = True
-
         mocker.patch("sbl_filing_api.services.multithread_handler.settings.expired_submission_check_secs", 4)
+        mocker.patch("sbl_filing_api.services.multithread_handler.SessionLocal", return_value=MagicMock())
+        mocker.patch(
+            "sbl_filing_api.entities.repos.submission_repo.get_submission_state",
+            AsyncMock(return_value=SubmissionState.VALIDATION_IN_PROGRESS),
+        )
         expire_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.expire_submission")
         error_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.error_out_submission")
         log_mock = mocker.patch("sbl_filing_api.services.multithread_handler.logger")
 
         future = asyncio.get_event_loop().create_task(self.mock_future_exception())
         cancel_mock = mocker.patch.object(future, "cancel")
-        await check_future(future, 1, exec_check)
+        await check_future(future, 1)
 
-        assert not exec_check["continue"]
         error_mock.assert_called_with(1)
         log_mock.error.assert_called_with(
             "Validation for submission 1 did not complete due to an unexpected error.",
@@ -42,10 +42,8 @@ class TestMultithreader:
 
         future = asyncio.get_event_loop().create_task(self.mock_future(6))
         cancel_mock = mocker.patch.object(future, "cancel")
-        exec_check["continue"] = True
-        await check_future(future, 1, exec_check)
+        await check_future(future, 1)
 
-        assert not exec_check["continue"]
         cancel_mock.assert_called_once()
         expire_mock.assert_called_with(1)
         log_mock.warning.assert_called_with(
@@ -58,15 +56,30 @@ class TestMultithreader:
         cancel_mock.reset_mock()
 
         future = asyncio.get_event_loop().create_task(self.mock_future(1))
-        exec_check["continue"] = True
-        await check_future(future, 2, exec_check)
+        await check_future(future, 2)
 
-        assert exec_check["continue"]
         assert not cancel_mock.called
         assert not expire_mock.called
         assert not error_mock.called
         assert not log_mock.called
 
+    async def test_future_checker_waits_for_validation_start(self, mocker: MockerFixture):
+        mocker.patch("sbl_filing_api.services.multithread_handler.settings.expired_submission_check_secs", 0.3)
+        mocker.patch("sbl_filing_api.services.multithread_handler.settings.expired_submission_start_poll_secs", 0.1)
+        mocker.patch("sbl_filing_api.services.multithread_handler.SessionLocal", return_value=MagicMock())
+        state_mock = mocker.patch(
+            "sbl_filing_api.entities.repos.submission_repo.get_submission_state",
+            AsyncMock(side_effect=[SubmissionState.SUBMISSION_UPLOADED] * 4 + [SubmissionState.VALIDATION_IN_PROGRESS]),
+        )
+        expire_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.expire_submission")
+
+        # queued for ~0.4s, then validated in 0.1s, which is over the 0.3s limit from dispatch but not from the start
+        future = asyncio.get_event_loop().create_task(self.mock_future(0.5))
+        await check_future(future, 1)
+
+        assert state_mock.call_count == 5
+        assert not expire_mock.called
+
     async def test_handler(self, mocker: MockerFixture):
         mock_sub = SubmissionDAO(
             id=1,
@@ -75,14 +88,19 @@ class TestMultithreader:
             filename="submission.csv",
         )
 
-        validation_mock = mocker.patch("sbl_filing_api.services.multithread_handler.validate_and_update_submission")
+        validation_mock = mocker.patch("sbl_filing_api.services.submission_processor.validate_and_update_submission")
         mock_new_loop = mocker.patch("asyncio.get_event_loop")
         mock_event_loop = Mock()
         mock_new_loop.return_value = mock_event_loop
 
-        exec_check = Manager().dict()
-        exec_check["continue"] = True
+        handle_submission("2024", "123456789TESTBANK123", mock_sub, "upload/2024/123456789TESTBANK123/1.csv")
 
-        handle_submission("2024", "123456789TESTBANK123", mock_sub, b"\00\00", exec_check)
+        validation_mock.assert_called_with(
+            "2024", "123456789TESTBANK123", mock_sub, "upload/2024/123456789TESTBANK123/1.csv", None, None
+        )
 
-        validation_mock.assert_called_with("2024", "123456789TESTBANK123", mock_sub, b"\00\00", exec_check)
+        handle_submission("2024", "123456789TESTBANK123", mock_sub, "upload/2024/123456789TESTBANK123/1.csv", 1, "w")
+
+        validation_mock.assert_called_with(
+            "2024", "123456789TESTBANK123", mock_sub, "upload/2024/123456789TESTBANK123/1.csv", 1, "w"
+        )
@@ -0,0 +1,108 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.models.model_enums import SubmissionState
+from sbl_filing_api.services import submission_events
+from sbl_filing_api.services.submission_events import SubmissionEventBroker
+
+
+class TestSubmissionEventBroker:
+    @pytest.fixture
+    def broker(self, mocker: MockerFixture) -> SubmissionEventBroker:
+        broker = SubmissionEventBroker()
+        mocker.patch.object(broker, "connect", AsyncMock())
+        return broker
+
+    async def test_notification_fan_out(self, broker: SubmissionEventBroker):
+        async with broker.subscribe(1) as queue1, broker.subscribe(1) as queue2, broker.subscribe(2) as queue3:
+            broker._on_notification(None, 1, "submission_state", json.dumps({"id": 1, "state": "VALIDATION_ERROR"}))
+            broker._on_notification(None, 1, "submission_state", "not json")
+
+            assert queue1.get_nowait() == {"id": 1, "state": "VALIDATION_ERROR"}
+            assert queue2.get_nowait() == {"id": 1, "state": "VALIDATION_ERROR"}
+            assert queue1.empty()
+            assert queue3.empty()
+        assert broker._subscribers == {}
+
+    async def test_termination_ends_streams(self, broker: SubmissionEventBroker):
+        async with broker.subscribe(1) as queue:
+            broker._on_termination(None)
+            assert queue.get_nowait() is None
+
+    async def test_connect(self, mocker: MockerFixture):
+        conn = MagicMock(add_listener=AsyncMock(), close=AsyncMock())
+        conn.is_closed.return_value = False
+        connect_mock = mocker.patch("asyncpg.connect", AsyncMock(return_value=conn))
+        mocker.patch.object(settings, "conn", mocker.Mock(unicode_string=lambda: "postgresql+asyncpg://u:p@h:5432/db"))
+        broker = SubmissionEventBroker()
+
+        await broker.connect()
+        await broker.connect()
+        connect_mock.assert_called_once_with("postgresql://u:p@h:5432/db")
+        conn.add_listener.assert_called_once_with("submission_state", broker._on_notification)
+
+        await broker.close()
+        conn.close.assert_called_once()
+
+
+class TestSubmissionStateEvents:
+    @pytest.fixture
+    def broker(self, mocker: MockerFixture) -> SubmissionEventBroker:
+        broker = SubmissionEventBroker()
+        mocker.patch.object(broker, "connect", AsyncMock())
+        mocker.patch.object(submission_events, "broker", broker)
+        mocker.patch.object(submission_events, "SessionLocal", return_value=MagicMock())
+        return broker
+
+    async def test_finished_submission(self, mocker: MockerFixture, broker: SubmissionEventBroker):
+        mocker.patch.object(
+            submission_events, "get_submission_state", AsyncMock(return_value=SubmissionState.VALIDATION_SUCCESSFUL)
+        )
+
+        events = [e async for e in submission_events.submission_state_events(1)]
+
+        assert events == [
+            'event: submission_state\ndata: {"id": 1, "state": "VALIDATION_SUCCESSFUL"}\n\n',
+        ]
+
+    async def test_state_changes(self, mocker: MockerFixture, broker: SubmissionEventBroker):
+        mocker.patch.object(settings.submission_events_config, "keepalive_secs", 0.05)
+        mocker.patch.object(
+            submission_events, "get_submission_state", AsyncMock(return_value=SubmissionState.SUBMISSION_UPLOADED)
+        )
+
+        async def notify():
+            await asyncio.sleep(0.08)
+            for state in [SubmissionState.VALIDATION_IN_PROGRESS, SubmissionState.VALIDATION_WITH_ERRORS]:
+                broker._on_notification(None, 1, "submission_state", json.dumps({"id": 1, "state": state}))
+
+        notify_task = asyncio.create_task(notify())
+        events = [e async for e in submission_events.submission_state_events(1)]
+        await notify_task
+
+        assert events == [
+            'event: submission_state\ndata: {"id": 1, "state": "SUBMISSION_UPLOADED"}\n\n',
+            ": keepalive\n\n",
+            'event: submission_state\ndata: {"id": 1, "state": "VALIDATION_IN_PROGRESS"}\n\n',
+            'event: submission_state\ndata: {"id": 1, "state": "VALIDATION_WITH_ERRORS"}\n\n',
+        ]
+        assert broker._subscribers == {}
+
+    async def test_timeout(self, mocker: MockerFixture, broker: SubmissionEventBroker):
+        mocker.patch.object(settings.submission_events_config, "keepalive_secs", 10)
+        mocker.patch.object(settings.submission_events_config, "timeout_secs", 0.05)
+        mocker.patch.object(
+            submission_events, "get_submission_state", AsyncMock(return_value=SubmissionState.VALIDATION_IN_PROGRESS)
+        )
+
+        events = [e async for e in submission_events.submission_state_events(1)]
+
+        assert events == [
+            'event: submission_state\ndata: {"id": 1, "state": "VALIDATION_IN_PROGRESS"}\n\n',
+            ": keepalive\n\n",
+        ]
@@ -1,79 +1,17 @@
+import io
 import pandas as pd
 import pytest
 
-from http import HTTPStatus
 from sbl_filing_api.services import submission_processor
-from fastapi import HTTPException
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock
 from pytest_mock import MockerFixture
-from sbl_filing_api.config import settings
+from sbl_filing_api.config import CsvEngine, settings
 from sbl_filing_api.entities.models.dao import SubmissionDAO, SubmissionState
+from sbl_filing_api.entities.models.model_enums import SubmissionProgressPhase
 from regtech_data_validator.validation_results import ValidationResults, ValidationPhase, Counts
-from regtech_api_commons.api.exceptions import RegTechHttpException
 
 
 class TestSubmissionProcessor:
-    @pytest.fixture
-    def mock_upload_file(self, mocker: MockerFixture) -> Mock:
-        file_mock = mocker.patch("fastapi.UploadFile")
-        return file_mock.return_value
-
-    async def test_upload(self, mocker: MockerFixture):
-        upload_mock = mocker.patch("sbl_filing_api.services.file_handler.upload")
-        submission_processor.upload_to_storage("test_period", "test", "test", b"test content local")
-        upload_mock.assert_called_once_with(path="upload/test_period/test/test.csv", content=b"test content local")
-
-    async def test_read_from_storage(self, mocker: MockerFixture):
-        download_mock = mocker.patch("sbl_filing_api.services.file_handler.download")
-        submission_processor.get_from_storage("2024", "1234567890", "1_report")
-        download_mock.assert_called_with("upload/2024/1234567890/1_report.csv")
-
-    async def test_upload_failure(self, mocker: MockerFixture):
-        upload_mock = mocker.patch("sbl_filing_api.services.file_handler.upload")
-        upload_mock.side_effect = IOError("test")
-        with pytest.raises(Exception) as e:
-            submission_processor.upload_to_storage("test_period", "test", "test", b"test content")
-        assert isinstance(e.value, RegTechHttpException)
-        assert e.value.name == "Upload Failure"
-
-    async def test_read_failure(self, mocker: MockerFixture):
-        download_mock = mocker.patch("sbl_filing_api.services.file_handler.download")
-        download_mock.side_effect = IOError("test")
-        with pytest.raises(Exception) as e:
-            submission_processor.get_from_storage("2024", "1234567890", "1_report")
-        assert isinstance(e.value, RegTechHttpException)
-        assert e.value.name == "Download Failure"
-
-    def test_validate_file_supported(self, mock_upload_file: Mock):
-        mock_upload_file.filename = "test.csv"
-        mock_upload_file.content_type = "text/csv"
-        mock_upload_file.size = settings.submission_file_size - 1
-        submission_processor.validate_file_processable(mock_upload_file)
-
-    def test_file_not_supported_invalid_extension(self, mock_upload_file: Mock):
-        mock_upload_file.filename = "test.txt"
-        mock_upload_file.content_type = "text/csv"
-        mock_upload_file.size = settings.submission_file_size - 1
-        with pytest.raises(HTTPException) as e:
-            submission_processor.validate_file_processable(mock_upload_file)
-        assert e.value.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
-
-    def test_file_not_supported_invalid_content_type(self, mock_upload_file: Mock):
-        mock_upload_file.filename = "test.csv"
-        mock_upload_file.content_type = "text/plain"
-        mock_upload_file.size = settings.submission_file_size - 1
-        with pytest.raises(HTTPException) as e:
-            submission_processor.validate_file_processable(mock_upload_file)
-        assert e.value.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
-
-    def test_file_not_supported_file_size_too_large(self, mock_upload_file: Mock):
-        mock_upload_file.filename = "test.csv"
-        mock_upload_file.content_type = "text/csv"
-        mock_upload_file.size = settings.submission_file_size + 1
-        with pytest.raises(HTTPException) as e:
-            submission_processor.validate_file_processable(mock_upload_file)
-        assert e.value.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
-
     async def test_validate_and_update_successful(
         self,
         mocker: MockerFixture,
@@ -91,7 +29,7 @@ class TestSubmissionProcessor:
         df_to_download_mock.return_value = ""
 
         await submission_processor.validate_and_update_submission(
-            "2024", "123456790", mock_sub, None, {"continue": True}
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
         )
         encoded_results = df_to_download_mock.return_value.encode("utf-8")
         assert file_mock.mock_calls[0].args == (
@@ -105,6 +43,80 @@ class TestSubmissionProcessor:
         assert successful_submission_mock.mock_calls[1].args[1].state == "VALIDATION_SUCCESSFUL"
         assert successful_submission_mock.mock_calls[1].args[1].total_records == 1
 
+    async def test_validate_and_update_cached(self, mocker: MockerFixture, validate_submission_mock: Mock):
+        validate_submission_mock.return_value.file_hash = "abc123"
+        validate_submission_mock.return_value.validation_ruleset_version = "0.1.0"
+        cached_sub = SubmissionDAO(
+            id=5,
+            filing=1,
+            state=SubmissionState.VALIDATION_WITH_WARNINGS,
+            filename="submission.csv",
+            total_records=10,
+        )
+        get_cached_mock = mocker.patch(
+            "sbl_filing_api.services.submission_processor.get_validated_submission_by_hash",
+            return_value=(cached_sub, "2024"),
+        )
+        get_results_mock = mocker.patch(
+            "sbl_filing_api.services.submission_processor.get_validation_results",
+            return_value={"logic_warnings": {"total_count": 1}},
+        )
+        copy_mock = mocker.patch("sbl_filing_api.services.file_handler.copy")
+        validation_mock = mocker.patch("sbl_filing_api.services.submission_processor.validate_phases")
+
+        mock_sub = SubmissionDAO(
+            id=1, filing=1, state=SubmissionState.SUBMISSION_UPLOADED, filename="submission.csv", file_hash="abc123"
+        )
+        await submission_processor.validate_and_update_submission(
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
+        )
+
+        get_cached_mock.assert_called_once_with(ANY, "123456790", "abc123", "0.1.0", exclude_id=1)
+        get_results_mock.assert_called_once_with(ANY, 5)
+        copy_mock.assert_called_once_with("upload/2024/123456790/5_report.csv", "upload/2024/123456790/1_report.csv")
+        assert not validation_mock.called
+        final_sub = validate_submission_mock.mock_calls[1].args[1]
+        assert final_sub.state == SubmissionState.VALIDATION_WITH_WARNINGS
+        assert final_sub.validation_results == {"logic_warnings": {"total_count": 1}}
+        assert final_sub.total_records == 10
+        assert final_sub.validation_cache_hit is True
+
+    def test_validated_state_of_accepted(self):
+        accepted = SubmissionDAO(id=5, filing=1, state=SubmissionState.SUBMISSION_ACCEPTED, filename="submission.csv")
+        assert (
+            submission_processor.validated_state_of(accepted, {"logic_warnings": {"total_count": 1}})
+            == SubmissionState.VALIDATION_WITH_WARNINGS
+        )
+        assert (
+            submission_processor.validated_state_of(accepted, {"logic_warnings": {"total_count": 0}})
+            == SubmissionState.VALIDATION_SUCCESSFUL
+        )
+        validated = SubmissionDAO(
+            id=6, filing=1, state=SubmissionState.VALIDATION_WITH_ERRORS, filename="submission.csv"
+        )
+        assert submission_processor.validated_state_of(validated, {}) == SubmissionState.VALIDATION_WITH_ERRORS
+
+    async def test_validate_and_update_cache_miss(
+        self,
+        mocker: MockerFixture,
+        successful_submission_mock: Mock,
+        build_validation_results_mock: Mock,
+        df_to_download_mock: Mock,
+    ):
+        successful_submission_mock.return_value.file_hash = "abc123"
+        mocker.patch("sbl_filing_api.services.submission_processor.get_validated_submission_by_hash", return_value=None)
+        mocker.patch("sbl_filing_api.services.submission_processor.upload_to_storage")
+
+        mock_sub = SubmissionDAO(
+            id=1, filing=1, state=SubmissionState.SUBMISSION_UPLOADED, filename="submission.csv", file_hash="abc123"
+        )
+        await submission_processor.validate_and_update_submission(
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
+        )
+
+        assert successful_submission_mock.mock_calls[1].args[1].state == SubmissionState.VALIDATION_SUCCESSFUL
+        assert successful_submission_mock.mock_calls[1].args[1].validation_cache_hit is False
+
     async def test_validate_and_update_warnings(
         self,
         mocker: MockerFixture,
@@ -123,7 +135,7 @@ class TestSubmissionProcessor:
         mock_build_json.return_value = {"logic_errors": {"total_count": 0}, "logic_warnings": {"total_count": 1}}
 
         await submission_processor.validate_and_update_submission(
-            "2024", "123456790", mock_sub, None, {"continue": True}
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
         )
         encoded_results = df_to_download_mock.return_value.encode("utf-8")
         assert file_mock.mock_calls[0].args == (
@@ -155,7 +167,7 @@ class TestSubmissionProcessor:
         mocker.patch("sbl_filing_api.services.submission_processor.build_validation_results")
 
         await submission_processor.validate_and_update_submission(
-            "2024", "123456790", mock_sub, None, {"continue": True}
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
         )
         encoded_results = df_to_download_mock.return_value.encode("utf-8")
         assert file_mock.mock_calls[0].args == (
@@ -190,11 +202,12 @@ class TestSubmissionProcessor:
             filename="submission.csv",
         )
 
+        mocker.patch("sbl_filing_api.services.file_handler.open_file")
         mock_read_csv = mocker.patch("pandas.read_csv")
         mock_read_csv.side_effect = RuntimeError("File not in csv format")
 
         await submission_processor.validate_and_update_submission(
-            "2024", "123456790", mock_sub, None, {"continue": True}
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
         )
 
         mock_update_submission.assert_called()
@@ -208,7 +221,7 @@ class TestSubmissionProcessor:
         mock_validation.side_effect = RuntimeError("File can not be parsed by validator")
 
         await submission_processor.validate_and_update_submission(
-            "2024", "123456790", mock_sub, None, {"continue": True}
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
         )
         log_mock.exception.assert_called_with("The file is malformed.")
         assert mock_update_submission.mock_calls[0].args[1].state == SubmissionState.VALIDATION_IN_PROGRESS
@@ -217,12 +230,194 @@ class TestSubmissionProcessor:
         mock_validation.side_effect = Exception("Test exception")
 
         await submission_processor.validate_and_update_submission(
-            "2024", "123456790", mock_sub, None, {"continue": True}
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
         )
         log_mock.exception.assert_called_with(
             "Validation for submission %d did not complete due to an unexpected error.", mock_sub.id
         )
 
+    def chunk_results(
+        self, phase: ValidationPhase, errors: int = 0, warnings: int = 0, fields: int = 1
+    ) -> ValidationResults:
+        # a finding has a row per field it involves
+        findings = pd.DataFrame(
+            [["E0001", str(n), "Error"] for n in range(errors) for _ in range(fields)]
+            + [["W0001", str(n), "Warning"] for n in range(warnings) for _ in range(fields)],
+            columns=["validation_id", "record_no", "validation_severity"],
+            dtype=str,
+        )
+        return ValidationResults(
+            phase=phase,
+            error_counts=Counts(single_field_count=errors, multi_field_count=0, register_count=0, total_count=errors),
+            warning_counts=Counts(
+                single_field_count=warnings, multi_field_count=0, register_count=0, total_count=warnings
+            ),
+            findings=findings,
+            is_valid=findings.empty,
+        )
+
+    @pytest.mark.parametrize("engine", list(CsvEngine))
+    def test_read_submission_csv_engines_equivalent(self, mocker: MockerFixture, engine: CsvEngine):
+        if engine == CsvEngine.PYARROW:
+            pytest.importorskip("pyarrow")
+        content = (
+            "uid,ct_credit_product,ct_credit_product_ff,amount_applied_for\n"
+            "123456789TESTBANK12300001,1,,00100\n"
+            '123456789TESTBANK12300002,NA,"free, form",null\n'
+            '123456789TESTBANK12300003, 2 ,N/A,""\n'
+            '123456789TESTBANK12300004,977,"quoted ""text"" – ünicode",nan\n'
+        ).encode("utf-8")
+        expected = pd.read_csv(io.BytesIO(content), dtype=str, na_filter=False)
+
+        mocker.patch.object(settings, "csv_engine", engine)
+        df = submission_processor.read_submission_csv(io.BytesIO(content))
+
+        pd.testing.assert_frame_equal(df, expected)
+        assert df.loc[1, "amount_applied_for"] == "null"
+        assert df.loc[0, "ct_credit_product_ff"] == ""
+
+    async def test_validate_file_in_chunks(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "validation_chunk_size", 2)
+        mocker.patch(
+            "sbl_filing_api.services.file_handler.open_file",
+            side_effect=lambda path: io.BytesIO(b"uid,amount\na,1\nb,2\nc,3\nd,\ne,5\n"),
+        )
+        chunks = []
+
+        def validate(df, context, max_errors):
+            chunks.append(df)
+            return self.chunk_results(ValidationPhase.LOGICAL, warnings=1 if len(chunks) == 2 else 0)
+
+        mocker.patch("sbl_filing_api.services.submission_processor.validate_phases", side_effect=validate)
+
+        results, total_records = await submission_processor.validate_file_in_chunks(
+            "upload/2024/123456790/1.csv", "123456790"
+        )
+
+        assert total_records == 5
+        assert [list(c.index) for c in chunks] == [[0, 1], [2, 3], [4]]
+        assert chunks[1]["amount"].tolist() == ["3", ""]
+        assert results.phase == ValidationPhase.LOGICAL
+        assert results.warning_counts.total_count == 1
+        assert results.error_counts.total_count == 0
+        assert len(results.findings) == 1
+
+    async def test_validate_file_in_chunks_syntax_errors(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "validation_chunk_size", 1)
+        mocker.patch(
+            "sbl_filing_api.services.file_handler.open_file",
+            side_effect=lambda path: io.BytesIO(b"uid,amount\na,1\nb,x\nc,y\nd,4\n"),
+        )
+        mocker.patch(
+            "sbl_filing_api.services.submission_processor.validate_phases",
+            side_effect=[
+                self.chunk_results(ValidationPhase.LOGICAL, warnings=2),
+                self.chunk_results(ValidationPhase.SYNTACTICAL, errors=1),
+                self.chunk_results(ValidationPhase.SYNTACTICAL, errors=2),
+                self.chunk_results(ValidationPhase.LOGICAL, errors=1),
+            ],
+        )
+
+        results, total_records = await submission_processor.validate_file_in_chunks(
+            "upload/2024/123456790/1.csv", "123456790"
+        )
+
+        assert total_records == 4
+        assert results.phase == ValidationPhase.SYNTACTICAL
+        assert results.error_counts.total_count == 3
+        assert results.warning_counts.total_count == 0
+        assert results.findings["validation_severity"].tolist() == ["Error"] * 3
+
+    async def test_validate_file_in_chunks_duplicate_uids(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "validation_chunk_size", 2)
+        mocker.patch(
+            "sbl_filing_api.services.file_handler.open_file",
+            side_effect=lambda path: io.BytesIO(b"uid,amount\na,1\nb,2\na,3\n"),
+        )
+        validation_mock = mocker.patch(
+            "sbl_filing_api.services.submission_processor.validate_phases",
+            return_value=self.chunk_results(ValidationPhase.LOGICAL, errors=1),
+        )
+
+        results, total_records = await submission_processor.validate_file_in_chunks(
+            "upload/2024/123456790/1.csv", "123456790"
+        )
+
+        # found from the uids before validating, the file is only validated whole
+        assert total_records == 3
+        validation_mock.assert_called_once()
+        assert validation_mock.call_args.args[0]["uid"].tolist() == ["a", "b", "a"]
+        assert results.error_counts.total_count == 1
+
+    def test_chunked_results_max_errors(self):
+        merged = submission_processor.ChunkedValidationResults(max_errors=3)
+        merged.add(self.chunk_results(ValidationPhase.LOGICAL, errors=2))
+        merged.add(self.chunk_results(ValidationPhase.LOGICAL, errors=2))
+        merged.add(self.chunk_results(ValidationPhase.LOGICAL, errors=2))
+
+        results = merged.results()
+        assert results.error_counts.total_count == 6
+        assert len(results.findings) == 3
+        assert not results.is_valid
+
+    def test_chunked_results_max_errors_whole_findings(self):
+        merged = submission_processor.ChunkedValidationResults(max_errors=5)
+        merged.add(self.chunk_results(ValidationPhase.LOGICAL, errors=2, fields=2))
+        merged.add(self.chunk_results(ValidationPhase.LOGICAL, warnings=2, fields=2))
+
+        # the third finding would only have one of its two rows under the cap, so it is left out
+        findings = merged.results().findings
+        assert findings[["validation_id", "record_no"]].values.tolist() == [["E0001", "0"]] * 2 + [["E0001", "1"]] * 2
+
+        merged = submission_processor.ChunkedValidationResults(max_errors=1)
+        merged.add(self.chunk_results(ValidationPhase.LOGICAL, errors=2, fields=2))
+
+        # a finding over the cap on its own is still kept whole
+        assert len(merged.results().findings) == 2
+        assert not merged.results().is_valid
+
+    def test_has_uids_across_chunks(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "validation_chunk_size", 2)
+        open_mock = mocker.patch("sbl_filing_api.services.file_handler.open_file")
+
+        open_mock.return_value = io.BytesIO(b"uid,amount\na,1\na,2\nb,3\n")
+        assert not submission_processor.has_uids_across_chunks("upload/2024/123456790/1.csv")
+
+        open_mock.return_value = io.BytesIO(b"uid,amount\na,1\nb,2\nb,3\n")
+        assert submission_processor.has_uids_across_chunks("upload/2024/123456790/1.csv")
+
+        open_mock.return_value = io.BytesIO(b"amount\n1\n1\n1\n")
+        assert not submission_processor.has_uids_across_chunks("upload/2024/123456790/1.csv")
+
+    async def test_validate_and_update_chunked(
+        self,
+        mocker: MockerFixture,
+        validate_submission_mock: Mock,
+        build_validation_results_mock: Mock,
+        df_to_download_mock: Mock,
+    ):
+        mocker.patch.object(settings, "validation_chunk_size", 100)
+        chunked_mock = mocker.patch(
+            "sbl_filing_api.services.submission_processor.validate_file_in_chunks",
+            return_value=(self.chunk_results(ValidationPhase.LOGICAL), 250),
+        )
+        mocker.patch("sbl_filing_api.services.submission_processor.upload_to_storage")
+        progress_mock = mocker.patch("sbl_filing_api.services.validation_progress.update_submission_progress")
+
+        mock_sub = SubmissionDAO(id=1, filing=1, state=SubmissionState.SUBMISSION_UPLOADED, filename="submission.csv")
+        await submission_processor.validate_and_update_submission(
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
+        )
+
+        chunked_mock.assert_called_once_with("upload/2024/123456790/1.csv", "123456790", ANY)
+        assert [c.args[2:] for c in progress_mock.call_args_list] == [
+            (SubmissionProgressPhase.VALIDATING, 0, None),
+            (SubmissionProgressPhase.GENERATING_REPORT, 250, 250),
+            (SubmissionProgressPhase.COMPLETED, 250, 250),
+        ]
+        assert validate_submission_mock.mock_calls[1].args[1].state == SubmissionState.VALIDATION_SUCCESSFUL
+        assert validate_submission_mock.mock_calls[1].args[1].total_records == 250
+
     async def test_validation_expired(
         self,
         mocker: MockerFixture,
@@ -248,14 +443,40 @@ class TestSubmissionProcessor:
             filename="submission.csv",
         )
 
+        mocker.patch(
+            "sbl_filing_api.services.submission_processor.get_submission_state",
+            return_value=SubmissionState.VALIDATION_EXPIRED,
+        )
+
         await submission_processor.validate_and_update_submission(
-            "2024", "123456790", mock_sub, None, {"continue": False}
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv"
         )
 
         # second update shouldn't be called
         assert len(mock_update_submission.mock_calls) == 1
         log_mock.warning.assert_called_with("Submission 1 is expired, will not be updating final state with results.")
 
+    async def test_validate_and_update_lost_job(self, mocker: MockerFixture, successful_submission_mock: Mock):
+        mocker.patch("sbl_filing_api.services.submission_processor.upload_to_storage")
+        mocker.patch("sbl_filing_api.services.submission_processor.df_to_download", return_value="")
+        mocker.patch("sbl_filing_api.services.submission_processor.build_validation_results", return_value={})
+        holds_mock = mocker.patch(
+            "sbl_filing_api.services.submission_processor.holds_validation_job", return_value=False
+        )
+        log_mock = mocker.patch("sbl_filing_api.services.submission_processor.log")
+
+        mock_sub = SubmissionDAO(id=1, filing=1, state=SubmissionState.SUBMISSION_UPLOADED, filename="submission.csv")
+        await submission_processor.validate_and_update_submission(
+            "2024", "123456790", mock_sub, "upload/2024/123456790/1.csv", 1, "worker-1"
+        )
+
+        holds_mock.assert_called_once_with(ANY, 1, "worker-1")
+        # only the VALIDATION_IN_PROGRESS update, the worker that reclaimed the job writes the results
+        assert len(successful_submission_mock.mock_calls) == 1
+        log_mock.warning.assert_called_with(
+            "Validation job 1 was reclaimed by another worker, will not be updating submission 1 with results."
+        )
+
     async def test_build_validation_results_success(self, mocker: MockerFixture):
         result = ValidationResults(
             phase=ValidationPhase.LOGICAL,
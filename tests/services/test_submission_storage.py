@@ -0,0 +1,80 @@
+import io
+import pytest
+
+from http import HTTPStatus
+from sbl_filing_api.services import submission_storage
+from fastapi import HTTPException
+from unittest.mock import Mock
+from pytest_mock import MockerFixture
+from sbl_filing_api.config import settings
+from regtech_api_commons.api.exceptions import RegTechHttpException
+
+
+class TestSubmissionStorage:
+    @pytest.fixture
+    def mock_upload_file(self, mocker: MockerFixture) -> Mock:
+        file_mock = mocker.patch("fastapi.UploadFile")
+        return file_mock.return_value
+
+    async def test_upload(self, mocker: MockerFixture):
+        upload_mock = mocker.patch("sbl_filing_api.services.file_handler.upload")
+        submission_storage.upload_to_storage("test_period", "test", "test", b"test content local")
+        upload_mock.assert_called_once_with(path="upload/test_period/test/test.csv", content=b"test content local")
+
+    async def test_read_from_storage(self, mocker: MockerFixture):
+        download_mock = mocker.patch("sbl_filing_api.services.file_handler.download")
+        submission_storage.get_from_storage("2024", "1234567890", "1_report")
+        download_mock.assert_called_with("upload/2024/1234567890/1_report.csv")
+
+    async def test_upload_stream(self, mocker: MockerFixture):
+        upload_mock = mocker.patch("sbl_filing_api.services.file_handler.upload_stream")
+        upload_mock.return_value = "hash"
+        stream = io.BytesIO(b"test content local")
+        assert submission_storage.upload_to_storage("test_period", "test", "test", stream) == "hash"
+        upload_mock.assert_called_once_with(path="upload/test_period/test/test.csv", stream=stream)
+
+    async def test_upload_failure(self, mocker: MockerFixture):
+        upload_mock = mocker.patch("sbl_filing_api.services.file_handler.upload")
+        upload_mock.side_effect = IOError("test")
+        with pytest.raises(Exception) as e:
+            submission_storage.upload_to_storage("test_period", "test", "test", b"test content")
+        assert isinstance(e.value, RegTechHttpException)
+        assert e.value.name == "Upload Failure"
+
+    async def test_read_failure(self, mocker: MockerFixture):
+        download_mock = mocker.patch("sbl_filing_api.services.file_handler.download")
+        download_mock.side_effect = IOError("test")
+        with pytest.raises(Exception) as e:
+            submission_storage.get_from_storage("2024", "1234567890", "1_report")
+        assert isinstance(e.value, RegTechHttpException)
+        assert e.value.name == "Download Failure"
+
+    def test_validate_file_supported(self, mock_upload_file: Mock):
+        mock_upload_file.filename = "test.csv"
+        mock_upload_file.content_type = "text/csv"
+        mock_upload_file.size = settings.submission_file_size - 1
+        submission_storage.validate_file_processable(mock_upload_file)
+
+    def test_file_not_supported_invalid_extension(self, mock_upload_file: Mock):
+        mock_upload_file.filename = "test.txt"
+        mock_upload_file.content_type = "text/csv"
+        mock_upload_file.size = settings.submission_file_size - 1
+        with pytest.raises(HTTPException) as e:
+            submission_storage.validate_file_processable(mock_upload_file)
+        assert e.value.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+    def test_file_not_supported_invalid_content_type(self, mock_upload_file: Mock):
+        mock_upload_file.filename = "test.csv"
+        mock_upload_file.content_type = "text/plain"
+        mock_upload_file.size = settings.submission_file_size - 1
+        with pytest.raises(HTTPException) as e:
+            submission_storage.validate_file_processable(mock_upload_file)
+        assert e.value.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+    def test_file_not_supported_file_size_too_large(self, mock_upload_file: Mock):
+        mock_upload_file.filename = "test.csv"
+        mock_upload_file.content_type = "text/csv"
+        mock_upload_file.size = settings.submission_file_size + 1
+        with pytest.raises(HTTPException) as e:
+            submission_storage.validate_file_processable(mock_upload_file)
+        assert e.value.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
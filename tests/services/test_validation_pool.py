@@ -0,0 +1,72 @@
+import logging
+import os
+import sys
+
+import pytest
+from pytest_mock import MockerFixture
+
+from sbl_filing_api.config import settings
+from sbl_filing_api import services
+from sbl_filing_api.services import validation_pool
+
+
+class TestValidationPool:
+    def test_create_validation_executor(self, mocker: MockerFixture):
+        mocker.patch.object(settings.validation_pool_config, "max_workers", 3)
+        mocker.patch.object(settings.validation_pool_config, "max_tasks_per_child", 0)
+        executor_mock = mocker.patch.object(validation_pool, "ProcessPoolExecutor")
+
+        validation_pool.create_validation_executor()
+        kwargs = executor_mock.call_args.kwargs
+        assert kwargs["max_workers"] == 3
+        assert kwargs["mp_context"].get_start_method() == "spawn"
+        assert kwargs["initializer"] is validation_pool.warm_validation_process
+        assert kwargs["max_tasks_per_child"] is None
+
+        validation_pool.create_validation_executor(2)
+        assert executor_mock.call_args.kwargs["max_workers"] == 2
+
+    def test_max_tasks_per_child(self, mocker: MockerFixture):
+        mocker.patch.object(settings.validation_pool_config, "max_tasks_per_child", 50)
+        executor_mock = mocker.patch.object(validation_pool, "ProcessPoolExecutor")
+
+        validation_pool.create_validation_executor()
+        assert executor_mock.call_args.kwargs["max_tasks_per_child"] == 50
+
+        mocker.patch.object(settings.validation_pool_config, "prestart", True)
+        validation_pool.create_validation_executor()
+        assert executor_mock.call_args.kwargs["max_tasks_per_child"] == 51
+
+    def test_validation_pool_size(self, mocker: MockerFixture):
+        mocker.patch.object(settings.validation_pool_config, "max_workers", None)
+        assert validation_pool.validation_pool_size() == os.cpu_count()
+        assert validation_pool.validation_pool_size(2) == 2
+        mocker.patch.object(settings.validation_pool_config, "max_workers", 3)
+        assert validation_pool.validation_pool_size() == 3
+
+    def test_warm_validation_process(self):
+        validation_pool.warm_validation_process(logging.INFO)
+        assert "sbl_filing_api.services.submission_processor" in sys.modules
+        assert "regtech_data_validator.create_schemas" in sys.modules
+
+    def test_warm_validation_process_failure(self, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch):
+        # a failing import of the validation modules
+        monkeypatch.delattr(services, "submission_processor", raising=False)
+        monkeypatch.setitem(sys.modules, "sbl_filing_api.services.submission_processor", None)
+        log_mock = mocker.patch.object(validation_pool, "logger")
+
+        validation_pool.warm_validation_process(logging.INFO)
+        log_mock.warning.assert_called_once_with("Could not warm up the validation process.", exc_info=True)
+
+    def test_prestarted_executor(self, mocker: MockerFixture):
+        mocker.patch.object(settings.validation_pool_config, "prestart", True)
+        mocker.patch.object(settings.validation_pool_config, "max_tasks_per_child", 1)
+
+        with validation_pool.create_validation_executor(1) as executor:
+            [prestarted] = validation_pool.prestart_validation_executor(executor, 1)
+            pid = prestarted.result(timeout=60)
+            assert pid != os.getpid()
+            # the no-op that started the process does not use up its one validation
+            assert executor.submit(os.getpid).result(timeout=60) == pid
+            # after which it is recycled, the next one runs in a new process
+            assert executor.submit(os.getpid).result(timeout=60) != pid
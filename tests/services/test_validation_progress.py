@@ -0,0 +1,92 @@
+from asyncio import current_task
+from unittest.mock import ANY, AsyncMock, Mock
+
+import pandas as pd
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker, create_async_engine
+
+from sbl_filing_api.config import settings
+from sbl_filing_api.entities.models.dao import Base, SubmissionDAO
+from sbl_filing_api.entities.models.model_enums import SubmissionProgressPhase, SubmissionState
+from sbl_filing_api.services import submission_processor, validation_progress
+from sbl_filing_api.services.validation_progress import ProgressReporter
+from regtech_data_validator.validation_results import Counts, ValidationPhase, ValidationResults
+
+
+class TestProgressReporter:
+    async def test_report_throttles_row_progress(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "validation_progress_interval_secs", 60)
+        update_mock = mocker.patch.object(validation_progress, "update_submission_progress", AsyncMock())
+        progress = ProgressReporter(1)
+
+        await progress.report(SubmissionProgressPhase.VALIDATING, 0)
+        await progress.report(SubmissionProgressPhase.VALIDATING, 100)
+        await progress.report(SubmissionProgressPhase.GENERATING_REPORT, 200, 200)
+
+        assert [c.args for c in update_mock.call_args_list] == [
+            (ANY, 1, SubmissionProgressPhase.VALIDATING, 0, None),
+            (ANY, 1, SubmissionProgressPhase.GENERATING_REPORT, 200, 200),
+        ]
+
+    async def test_report_without_interval(self, mocker: MockerFixture):
+        mocker.patch.object(settings, "validation_progress_interval_secs", 0)
+        update_mock = mocker.patch.object(validation_progress, "update_submission_progress", AsyncMock())
+        progress = ProgressReporter(1)
+
+        await progress.report(SubmissionProgressPhase.VALIDATING, 0)
+        await progress.report(SubmissionProgressPhase.VALIDATING, 100)
+
+        assert update_mock.call_count == 2
+
+    async def test_report_error_is_not_raised(self, mocker: MockerFixture):
+        mocker.patch.object(
+            validation_progress, "update_submission_progress", AsyncMock(side_effect=RuntimeError("Test error"))
+        )
+        log_mock = mocker.patch.object(validation_progress, "log")
+        progress = ProgressReporter(1)
+
+        await progress.report(SubmissionProgressPhase.VALIDATING, 0)
+
+        log_mock.warning.assert_called_once()
+
+    async def test_report_error_does_not_fail_validation(self, mocker: MockerFixture):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_local = async_scoped_session(async_sessionmaker(engine, expire_on_commit=False), current_task)
+        mocker.patch.object(submission_processor, "SessionLocal", session_local)
+        mocker.patch.object(validation_progress, "SessionLocal", session_local)
+        mocker.patch.object(
+            validation_progress, "update_submission_progress", AsyncMock(side_effect=RuntimeError("Test error"))
+        )
+        mocker.patch.object(settings, "validation_chunk_size", 0)
+        results = ValidationResults(
+            phase=ValidationPhase.LOGICAL,
+            error_counts=Counts(single_field_count=0, multi_field_count=0, register_count=0, total_count=0),
+            warning_counts=Counts(single_field_count=0, multi_field_count=0, register_count=0, total_count=0),
+            findings=pd.DataFrame(),
+            is_valid=True,
+        )
+        mocker.patch.object(submission_processor, "validate_file", Mock(return_value=(results, 10)))
+        mocker.patch.object(submission_processor, "build_validation_results", Mock(return_value={}))
+        mocker.patch.object(submission_processor, "df_to_download", Mock(return_value=""))
+        mocker.patch.object(submission_processor, "upload_to_storage")
+
+        async with session_local.session_factory() as session:
+            session.add(
+                SubmissionDAO(
+                    id=1, filing=1, submitter_id=1, state=SubmissionState.SUBMISSION_UPLOADED, filename="submission.csv"
+                )
+            )
+            await session.commit()
+            submission = await session.get(SubmissionDAO, 1)
+
+        await submission_processor.validate_and_update_submission(
+            "2024", "123456790", submission, "upload/2024/123456790/1.csv"
+        )
+
+        async with session_local.session_factory() as session:
+            submission = await session.get(SubmissionDAO, 1)
+            assert submission.state == SubmissionState.VALIDATION_SUCCESSFUL
+            assert submission.total_records == 10
+        await engine.dispose()
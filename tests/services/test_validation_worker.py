@@ -0,0 +1,127 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import ANY, AsyncMock, MagicMock, Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from sbl_filing_api import validation_worker
+from sbl_filing_api.entities.models.dao import SubmissionDAO, ValidationJobDAO
+from sbl_filing_api.entities.models.model_enums import SubmissionState, ValidationJobState
+
+
+class TestValidationWorker:
+    @pytest.fixture
+    def job(self) -> ValidationJobDAO:
+        return ValidationJobDAO(
+            id=1,
+            submission=1,
+            lei="123456789TESTBANK123",
+            filing_period="2024",
+            file_path="upload/2024/123456789TESTBANK123/1.csv",
+            state=ValidationJobState.RUNNING,
+            attempts=1,
+            worker_id=validation_worker.worker_id,
+        )
+
+    @pytest.fixture
+    def submission(self, mocker: MockerFixture) -> SubmissionDAO:
+        submission = SubmissionDAO(id=1, filing=1, state=SubmissionState.SUBMISSION_UPLOADED, filename="submission.csv")
+        mocker.patch.object(validation_worker, "SessionLocal", return_value=MagicMock())
+        mocker.patch.object(validation_worker.repo, "get_submission", AsyncMock(return_value=submission))
+        mocker.patch("sbl_filing_api.services.multithread_handler.SessionLocal", return_value=MagicMock())
+        mocker.patch.object(
+            validation_worker.repo,
+            "get_submission_state",
+            AsyncMock(return_value=SubmissionState.VALIDATION_IN_PROGRESS),
+        )
+        mocker.patch.object(validation_worker.settings.validation_queue_config, "heartbeat_secs", 0.1)
+        return submission
+
+    async def test_run_job(self, mocker: MockerFixture, job: ValidationJobDAO, submission: SubmissionDAO):
+        handle_mock = mocker.patch.object(
+            validation_worker, "handle_submission", side_effect=lambda *args: time.sleep(0.35)
+        )
+        heartbeat_mock = mocker.patch.object(
+            validation_worker.job_repo, "heartbeat_validation_job", AsyncMock(return_value=True)
+        )
+        release_mock = mocker.patch.object(validation_worker.job_repo, "release_validation_job", AsyncMock())
+
+        with ThreadPoolExecutor() as executor:
+            await validation_worker.run_job(job, executor)
+
+        handle_mock.assert_called_once_with(
+            "2024",
+            "123456789TESTBANK123",
+            submission,
+            "upload/2024/123456789TESTBANK123/1.csv",
+            1,
+            validation_worker.worker_id,
+        )
+        assert heartbeat_mock.call_count >= 2
+        heartbeat_mock.assert_called_with(ANY, 1, validation_worker.worker_id)
+        release_mock.assert_called_once_with(ANY, 1, validation_worker.worker_id, ValidationJobState.COMPLETED)
+
+    async def test_run_job_lost_lease(self, mocker: MockerFixture, job: ValidationJobDAO, submission: SubmissionDAO):
+        mocker.patch.object(validation_worker, "handle_submission", side_effect=lambda *args: time.sleep(0.25))
+        mocker.patch.object(validation_worker.job_repo, "heartbeat_validation_job", AsyncMock(return_value=False))
+        release_mock = mocker.patch.object(validation_worker.job_repo, "release_validation_job", AsyncMock())
+
+        futures = []
+        run_in_executor = asyncio.get_running_loop().run_in_executor
+
+        def track_future(*args):
+            futures.append(run_in_executor(*args))
+            return futures[-1]
+
+        mocker.patch.object(asyncio.get_running_loop(), "run_in_executor", side_effect=track_future)
+
+        with ThreadPoolExecutor() as executor:
+            await validation_worker.run_job(job, executor)
+
+        assert futures[0].cancelled()
+        assert not release_mock.called
+
+    async def test_run_job_expired(self, mocker: MockerFixture, job: ValidationJobDAO, submission: SubmissionDAO):
+        mocker.patch.object(validation_worker.settings, "expired_submission_check_secs", 0.15)
+        mocker.patch.object(validation_worker, "handle_submission", side_effect=lambda *args: time.sleep(0.3))
+        mocker.patch.object(validation_worker.job_repo, "heartbeat_validation_job", AsyncMock(return_value=True))
+        release_mock = mocker.patch.object(validation_worker.job_repo, "release_validation_job", AsyncMock())
+        expire_mock = mocker.patch("sbl_filing_api.entities.repos.submission_repo.expire_submission")
+
+        with ThreadPoolExecutor() as executor:
+            await validation_worker.run_job(job, executor)
+
+        expire_mock.assert_called_once_with(1)
+        release_mock.assert_called_once_with(ANY, 1, validation_worker.worker_id, ValidationJobState.COMPLETED)
+
+    async def test_run_job_broken_pool(self, mocker: MockerFixture, job: ValidationJobDAO, submission: SubmissionDAO):
+        executor = Mock()
+        release_mock = mocker.patch.object(validation_worker.job_repo, "release_validation_job", AsyncMock())
+        future = asyncio.get_running_loop().create_future()
+        future.set_exception(BrokenProcessPool("Pool died."))
+        mocker.patch.object(asyncio.get_running_loop(), "run_in_executor", return_value=future)
+
+        with pytest.raises(BrokenProcessPool):
+            await validation_worker.run_job(job, executor)
+
+        release_mock.assert_called_once_with(ANY, 1, validation_worker.worker_id, ValidationJobState.QUEUED)
+
+    async def test_run_worker(self, mocker: MockerFixture, job: ValidationJobDAO, submission: SubmissionDAO):
+        mocker.patch.object(validation_worker.settings.validation_queue_config, "poll_secs", 0.05)
+        mocker.patch.object(validation_worker, "create_validation_executor", ThreadPoolExecutor)
+        stop_event = asyncio.Event()
+        claim_mock = mocker.patch.object(
+            validation_worker.job_repo, "claim_validation_job", AsyncMock(side_effect=[job, None, None, None, None])
+        )
+        run_job_mock = mocker.patch.object(
+            validation_worker, "run_job", AsyncMock(side_effect=lambda *args: stop_event.set())
+        )
+
+        await asyncio.wait_for(validation_worker.run_worker(stop_event), 5)
+
+        assert claim_mock.call_count >= 2
+        run_job_mock.assert_called_once()
+        assert run_job_mock.call_args.args[0] == job